@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""Benchmark the consistency checker against synthetic template catalogs."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from check_consistency_parser import build_context
+from check_consistency_profile import profile_rules
+from check_consistency_registry import validate_registry
+from check_consistency_rule_registry import REGISTERED_RULES
+from check_consistency_runner import run_checks
+from yaml_support import LOADER_NAME
+
+
+BASELINE_FORMAT_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000)
+# Differences below this many seconds are treated as timer noise when comparing baselines.
+DEFAULT_MIN_DELTA = 0.005
+# Rules passed to the CLI (--only) when measuring startup; a single-rule pre-commit style run.
+DEFAULT_STARTUP_RULES = "R001"
+RULE_MODULE_PREFIX = "check_consistency_rules_"
+APP_PLACEHOLDER = "__APP__"
+
+TEMPLATE_DOC = """apiVersion: app.sealos.io/v1
+kind: Template
+metadata:
+  name: __APP__
+spec:
+  title: __APP__
+  url: https://example.com/__APP__
+  gitRepo: https://github.com/example/__APP__
+  author: sealos
+  description: Synthetic benchmark application __APP__
+  readme: https://raw.githubusercontent.com/labring-actions/templates/kb-0.9/template/__APP__/README.md
+  icon: https://raw.githubusercontent.com/labring-actions/templates/kb-0.9/template/__APP__/logo.png
+  templateType: inline
+  locale: en
+  i18n:
+    zh:
+      description: 用于基准测试的合成应用。
+      readme: https://raw.githubusercontent.com/labring-actions/templates/kb-0.9/template/__APP__/README_zh.md
+  categories:
+  - tool
+  defaults:
+    app_host:
+      type: string
+      value: __APP__-${{ random(8) }}
+    app_name:
+      type: string
+      value: __APP__-${{ random(8) }}
+"""
+
+POSTGRES_DOCS = """apiVersion: v1
+kind: ServiceAccount
+metadata:
+  name: ${{ defaults.app_name }}-pg
+  labels:
+    sealos-db-provider-cr: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/instance: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/managed-by: kbcli
+---
+apiVersion: rbac.authorization.k8s.io/v1
+kind: Role
+metadata:
+  name: ${{ defaults.app_name }}-pg
+  labels:
+    sealos-db-provider-cr: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/instance: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/managed-by: kbcli
+rules:
+- apiGroups:
+  - '*'
+  resources:
+  - '*'
+  verbs:
+  - '*'
+---
+apiVersion: rbac.authorization.k8s.io/v1
+kind: RoleBinding
+metadata:
+  name: ${{ defaults.app_name }}-pg
+  labels:
+    sealos-db-provider-cr: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/instance: ${{ defaults.app_name }}-pg
+    app.kubernetes.io/managed-by: kbcli
+roleRef:
+  apiGroup: rbac.authorization.k8s.io
+  kind: Role
+  name: ${{ defaults.app_name }}-pg
+subjects:
+- kind: ServiceAccount
+  name: ${{ defaults.app_name }}-pg
+---
+apiVersion: apps.kubeblocks.io/v1alpha1
+kind: Cluster
+metadata:
+  name: ${{ defaults.app_name }}-pg
+  labels:
+    kb.io/database: postgresql-16.4.0
+    clusterdefinition.kubeblocks.io/name: postgresql
+    clusterversion.kubeblocks.io/name: postgresql-16.4.0
+spec:
+  affinity:
+    podAntiAffinity: Preferred
+    tenancy: SharedNode
+  clusterDefinitionRef: postgresql
+  clusterVersionRef: postgresql-16.4.0
+  terminationPolicy: Delete
+  componentSpecs:
+  - name: postgresql
+    componentDefRef: postgresql
+    disableExporter: true
+    enabledLogs:
+    - running
+    replicas: 1
+    serviceAccountName: ${{ defaults.app_name }}-pg
+    switchPolicy:
+      type: Noop
+    resources:
+      limits:
+        cpu: 500m
+        memory: 512Mi
+      requests:
+        cpu: 50m
+        memory: 51Mi
+    volumeClaimTemplates:
+    - name: data
+      spec:
+        accessModes:
+        - ReadWriteOnce
+        resources:
+          requests:
+            storage: 1Gi
+"""
+
+DEPLOYMENT_DOC = """apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: ${{ defaults.app_name }}
+  annotations:
+    originImageName: example/__APP__:v1.2.3
+    deploy.cloud.sealos.io/minReplicas: '1'
+    deploy.cloud.sealos.io/maxReplicas: '1'
+  labels:
+    cloud.sealos.io/app-deploy-manager: ${{ defaults.app_name }}
+    app: ${{ defaults.app_name }}
+spec:
+  replicas: 1
+  revisionHistoryLimit: 1
+  selector:
+    matchLabels:
+      app: ${{ defaults.app_name }}
+  template:
+    metadata:
+      labels:
+        app: ${{ defaults.app_name }}
+    spec:
+      automountServiceAccountToken: false
+      containers:
+      - name: ${{ defaults.app_name }}
+        image: example/__APP__:v1.2.3
+        imagePullPolicy: IfNotPresent
+        resources:
+          limits:
+            cpu: 200m
+            memory: 256Mi
+          requests:
+            cpu: 20m
+            memory: 25Mi
+        ports:
+        - containerPort: 8080
+        env:
+        - name: LOG_LEVEL
+          value: info
+"""
+
+STATEFULSET_DOC = """apiVersion: apps/v1
+kind: StatefulSet
+metadata:
+  name: ${{ defaults.app_name }}
+  annotations:
+    originImageName: example/__APP__:v2.0.1
+    deploy.cloud.sealos.io/minReplicas: '1'
+    deploy.cloud.sealos.io/maxReplicas: '1'
+  labels:
+    cloud.sealos.io/app-deploy-manager: ${{ defaults.app_name }}
+    app: ${{ defaults.app_name }}
+spec:
+  replicas: 1
+  revisionHistoryLimit: 1
+  selector:
+    matchLabels:
+      app: ${{ defaults.app_name }}
+  template:
+    metadata:
+      labels:
+        app: ${{ defaults.app_name }}
+    spec:
+      automountServiceAccountToken: false
+      containers:
+      - name: ${{ defaults.app_name }}
+        image: example/__APP__:v2.0.1
+        imagePullPolicy: IfNotPresent
+        resources:
+          limits:
+            cpu: 200m
+            memory: 256Mi
+          requests:
+            cpu: 20m
+            memory: 25Mi
+        ports:
+        - containerPort: 8080
+        env:
+        - name: DB_HOST
+          valueFrom:
+            secretKeyRef:
+              name: ${{ defaults.app_name }}-pg-conn-credential
+              key: host
+        - name: DB_PASSWORD
+          valueFrom:
+            secretKeyRef:
+              name: ${{ defaults.app_name }}-pg-conn-credential
+              key: password
+        volumeMounts:
+        - name: vn-data
+          mountPath: /data
+  serviceName: ${{ defaults.app_name }}
+  volumeClaimTemplates:
+  - metadata:
+      name: vn-data
+      annotations:
+        path: /data
+        value: '1'
+    spec:
+      accessModes:
+      - ReadWriteOnce
+      resources:
+        requests:
+          storage: 1Gi
+"""
+
+EXPOSURE_DOCS = """apiVersion: v1
+kind: Service
+metadata:
+  name: ${{ defaults.app_name }}
+  labels:
+    cloud.sealos.io/app-deploy-manager: ${{ defaults.app_name }}
+    app: ${{ defaults.app_name }}
+spec:
+  ports:
+  - name: tcp-8080
+    port: 8080
+    targetPort: 8080
+    protocol: TCP
+  selector:
+    app: ${{ defaults.app_name }}
+---
+apiVersion: networking.k8s.io/v1
+kind: Ingress
+metadata:
+  name: ${{ defaults.app_name }}
+  labels:
+    cloud.sealos.io/app-deploy-manager: ${{ defaults.app_name }}
+    cloud.sealos.io/app-deploy-manager-domain: ${{ defaults.app_host }}
+  annotations:
+    kubernetes.io/ingress.class: nginx
+    nginx.ingress.kubernetes.io/proxy-body-size: 32m
+    nginx.ingress.kubernetes.io/server-snippet: 'client_header_buffer_size 64k;
+
+      large_client_header_buffers 4 128k;'
+    nginx.ingress.kubernetes.io/ssl-redirect: 'true'
+    nginx.ingress.kubernetes.io/backend-protocol: HTTP
+    nginx.ingress.kubernetes.io/client-body-buffer-size: 64k
+    nginx.ingress.kubernetes.io/proxy-buffer-size: 64k
+    nginx.ingress.kubernetes.io/proxy-send-timeout: '300'
+    nginx.ingress.kubernetes.io/proxy-read-timeout: '300'
+    nginx.ingress.kubernetes.io/configuration-snippet: "if ($request_uri ~* \\\\.(js|css|gif|jpe?g|png))\\
+      \\ {\\n  expires 30d;\\n  add_header Cache-Control \\"public\\";\\n}"
+spec:
+  rules:
+  - host: ${{ defaults.app_host }}.${{ SEALOS_CLOUD_DOMAIN }}
+    http:
+      paths:
+      - pathType: Prefix
+        path: /
+        backend:
+          service:
+            name: ${{ defaults.app_name }}
+            port:
+              number: 8080
+  tls:
+  - hosts:
+    - ${{ defaults.app_host }}.${{ SEALOS_CLOUD_DOMAIN }}
+    secretName: ${{ SEALOS_CERT_SECRET_NAME }}
+---
+apiVersion: app.sealos.io/v1
+kind: App
+metadata:
+  name: ${{ defaults.app_name }}
+  labels:
+    cloud.sealos.io/app-deploy-manager: ${{ defaults.app_name }}
+spec:
+  data:
+    url: https://${{ defaults.app_host }}.${{ SEALOS_CLOUD_DOMAIN }}
+  displayType: normal
+  icon: https://raw.githubusercontent.com/labring-actions/templates/kb-0.9/template/__APP__/logo.png
+  name: __APP__
+  type: link
+"""
+
+# A Deployment that breaks image pinning and pull-policy rules, so violation
+# reporting (and LineLocator lookups) is part of every measurement.
+DRIFTED_DEPLOYMENT_DOC = DEPLOYMENT_DOC.replace("v1.2.3", "latest").replace("IfNotPresent", "Always")
+
+# Rotating mix of catalog shapes: stateless web apps, stateful apps backed by a
+# KubeBlocks postgres Cluster, apps with both a Deployment and a StatefulSet,
+# and a non-compliant app.
+CATALOG_SHAPES: Tuple[Tuple[str, ...], ...] = (
+    (TEMPLATE_DOC, DEPLOYMENT_DOC, EXPOSURE_DOCS),
+    (TEMPLATE_DOC, POSTGRES_DOCS, STATEFULSET_DOC, EXPOSURE_DOCS),
+    (TEMPLATE_DOC, POSTGRES_DOCS, DEPLOYMENT_DOC, STATEFULSET_DOC, EXPOSURE_DOCS),
+    (TEMPLATE_DOC, DRIFTED_DEPLOYMENT_DOC, EXPOSURE_DOCS),
+)
+
+
+def render_index_yaml(index: int) -> Tuple[str, str]:
+    app_name = f"bench-app-{index:05d}"
+    shape = CATALOG_SHAPES[index % len(CATALOG_SHAPES)]
+    text = "---\n".join(shape).replace(APP_PLACEHOLDER, app_name)
+    return app_name, text
+
+
+def generate_catalog(root: Path, size: int) -> Path:
+    """Write size synthetic template/<app>/index.yaml files under root and return the template dir."""
+    template_dir = root / "template"
+    for index in range(size):
+        app_name, text = render_index_yaml(index)
+        app_dir = template_dir / app_name
+        app_dir.mkdir(parents=True, exist_ok=True)
+        (app_dir / "index.yaml").write_text(text, encoding="utf-8")
+    return template_dir
+
+
+def best_of(repeat: int, action: Callable[[], Any]) -> float:
+    best: Optional[float] = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    assert best is not None
+    return best
+
+
+def benchmark_catalog(
+    skill_root: Path,
+    catalog_dir: Path,
+    repeat: int = 1,
+    parse_workers: Optional[int] = 1,
+) -> Dict[str, Any]:
+    """Time build_context, every registered rule and the whole run_checks for one catalog."""
+    skill_path = skill_root / "SKILL.md"
+    references_dir = skill_root / "references"
+    registry_path = references_dir / "rules-registry.yaml"
+    config = validate_registry(registry_path, REGISTERED_RULES.keys())
+    include_paths = [*config.include_paths, str(catalog_dir)]
+
+    def build() -> Any:
+        return build_context(skill_path, references_dir, include_paths, parse_workers=parse_workers)
+
+    build_seconds = best_of(repeat, build)
+    context, _ = build()
+    context.document_index  # noqa: B018
+
+    rule_seconds: Dict[str, float] = {}
+    for _ in range(max(1, repeat)):
+        _, timings = profile_rules(context, REGISTERED_RULES, list(config.ordered_rule_ids))
+        for item in timings:
+            previous = rule_seconds.get(item.rule_id)
+            rule_seconds[item.rule_id] = item.seconds if previous is None else min(previous, item.seconds)
+
+    run_seconds = best_of(
+        repeat,
+        lambda: run_checks(
+            skill_path=skill_path,
+            references_dir=references_dir,
+            registry_path=registry_path,
+            additional_include_paths=[str(catalog_dir)],
+            parse_workers=parse_workers,
+        ),
+    )
+    return {
+        "files": len(context.scanned_paths),
+        "documents": len(context.yaml_documents),
+        "build_context": build_seconds,
+        "run_checks": run_seconds,
+        "rules": dict(sorted(rule_seconds.items())),
+    }
+
+
+def peak_rss_kib() -> int:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def probe_peak_rss(skill_root: Path, catalog_dir: Path) -> int:
+    """Run one full run_checks in this process and return its peak RSS in KiB."""
+    references_dir = skill_root / "references"
+    run_checks(
+        skill_path=skill_root / "SKILL.md",
+        references_dir=references_dir,
+        registry_path=references_dir / "rules-registry.yaml",
+        additional_include_paths=[str(catalog_dir)],
+        parse_workers=1,
+    )
+    return peak_rss_kib()
+
+
+def measure_peak_rss(catalog_dir: Path) -> int:
+    """Peak RSS (KiB) of a fresh interpreter that checks catalog_dir once; isolates sizes from each other."""
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--rss-probe", str(catalog_dir)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ValueError(f"memory probe failed: {result.stderr.strip() or result.stdout.strip()}")
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per module from `python -X importtime` output, plus the top-level total.
+
+    The total is stored under "" and sums the cumulative time of top-level imports only, so
+    nested modules are not counted twice.
+    """
+    modules: Dict[str, int] = {"": 0}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative = int(parts[1])
+        name = parts[2].rstrip()
+        depth = len(name) - len(name.lstrip(" "))
+        modules[name.strip()] = cumulative
+        if depth == 1:
+            modules[""] += cumulative
+    return modules
+
+
+def measure_startup(skill_root: Path, rules: str = DEFAULT_STARTUP_RULES, repeat: int = 1) -> Dict[str, Any]:
+    """Wall time and import time of `check_consistency.py --only <rules>` in fresh interpreters."""
+    command = [sys.executable, "-X", "importtime", str(skill_root / "scripts" / "check_consistency.py"), "--only", rules]
+    best: Optional[Tuple[float, Dict[str, int]]] = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=skill_root, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if result.returncode not in (0, 1):
+            raise ValueError(f"startup probe failed: {result.stdout.strip() or result.stderr.strip()[-500:]}")
+        if best is None or elapsed < best[0]:
+            best = (elapsed, parse_importtime(result.stderr))
+    assert best is not None
+    wall, modules = best
+    return {
+        "rules": rules,
+        "wall": wall,
+        "imports": modules[""] / 1_000_000,
+        "modules": len(modules) - 1,
+        "rule_modules": sorted(name for name in modules if name.startswith(RULE_MODULE_PREFIX)),
+    }
+
+
+def run_benchmarks(
+    skill_root: Path,
+    sizes: Sequence[int],
+    repeat: int = 1,
+    parse_workers: Optional[int] = 1,
+    work_dir: Optional[Path] = None,
+    memory: bool = False,
+    startup_rules: Optional[str] = None,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(dir=work_dir) as temp_dir:
+        for size in sizes:
+            catalog_dir = generate_catalog(Path(temp_dir) / f"catalog-{size}", size)
+            results[str(size)] = benchmark_catalog(skill_root, catalog_dir, repeat=repeat, parse_workers=parse_workers)
+            if memory:
+                results[str(size)]["peak_rss_kib"] = measure_peak_rss(catalog_dir)
+    report: Dict[str, Any] = {
+        "format": BASELINE_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "yaml_loader": LOADER_NAME,
+        "results": results,
+    }
+    if startup_rules is not None:
+        report["startup"] = measure_startup(skill_root, startup_rules, repeat=repeat)
+    return report
+
+
+def iter_metrics(report: Mapping[str, Any]) -> List[Tuple[str, float]]:
+    metrics: List[Tuple[str, float]] = []
+    for size, entry in report.get("results", {}).items():
+        metrics.append((f"{size}/build_context", float(entry["build_context"])))
+        metrics.append((f"{size}/run_checks", float(entry["run_checks"])))
+        for rule_id, seconds in entry.get("rules", {}).items():
+            metrics.append((f"{size}/rule/{rule_id}", float(seconds)))
+    startup = report.get("startup")
+    if startup:
+        metrics.append(("startup/wall", float(startup["wall"])))
+        metrics.append(("startup/imports", float(startup["imports"])))
+    return metrics
+
+
+def compare_reports(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    tolerance: float,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> List[str]:
+    """Return one message per metric that is slower than baseline beyond tolerance."""
+    if baseline.get("format") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"unsupported baseline format: {baseline.get('format')}")
+    baseline_metrics = dict(iter_metrics(baseline))
+    regressions: List[str] = []
+    for name, seconds in iter_metrics(current):
+        previous = baseline_metrics.get(name)
+        if previous is None:
+            continue
+        if seconds - previous > min_delta and seconds > previous * (1 + tolerance):
+            ratio = seconds / previous if previous else float("inf")
+            regressions.append(f"{name}: {previous * 1000:.2f} ms -> {seconds * 1000:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def format_report(report: Mapping[str, Any], top_rules: int = 5) -> str:
+    lines = [f"python {report.get('python')} ({report.get('yaml_loader')} YAML loader)"]
+    for size, entry in report.get("results", {}).items():
+        lines.append(
+            f"catalog {size}: {entry['files']} files, {entry['documents']} documents, "
+            f"build_context {entry['build_context'] * 1000:.1f} ms, run_checks {entry['run_checks'] * 1000:.1f} ms"
+        )
+        if "peak_rss_kib" in entry:
+            lines.append(f"  peak RSS {entry['peak_rss_kib'] / 1024:.1f} MiB")
+        slowest = sorted(entry.get("rules", {}).items(), key=lambda item: (-item[1], item[0]))[:top_rules]
+        for rule_id, seconds in slowest:
+            lines.append(f"  {rule_id:<6} {seconds * 1000:>10.2f} ms")
+    startup = report.get("startup")
+    if startup:
+        lines.append(
+            f"startup (--only {startup['rules']}): wall {startup['wall'] * 1000:.1f} ms, "
+            f"imports {startup['imports'] * 1000:.1f} ms across {startup['modules']} modules, "
+            f"rule modules: {', '.join(startup['rule_modules']) or 'none'}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_sizes(value: str) -> List[int]:
+    sizes = [int(item) for item in value.split(",") if item.strip()]
+    if not sizes or any(size <= 0 for size in sizes):
+        raise ValueError("--sizes must list positive integers")
+    return sizes
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark check_consistency.py on synthetic template catalogs")
+    parser.add_argument(
+        "--sizes",
+        default=None,
+        help=(
+            "Comma-separated catalog sizes (number of index.yaml files) to generate "
+            f"(default: {','.join(str(size) for size in DEFAULT_SIZES)}, or none with --startup)"
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measurement; the fastest is kept")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for YAML parsing (0 = auto)")
+    parser.add_argument("--work-dir", default="", help="Directory for generated catalogs (default: system temp)")
+    parser.add_argument("--save-baseline", default="", help="Write results as a JSON baseline to this path")
+    parser.add_argument("--baseline", default="", help="Compare results against this JSON baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against --baseline as a fraction (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also record peak RSS of a fresh checker process per catalog size",
+    )
+    parser.add_argument(
+        "--startup",
+        nargs="?",
+        const=DEFAULT_STARTUP_RULES,
+        default=None,
+        metavar="RULES",
+        help=(
+            "Also time CLI startup: `python -X importtime check_consistency.py --only RULES` "
+            f"(default {DEFAULT_STARTUP_RULES}) in fresh interpreters"
+        ),
+    )
+    parser.add_argument("--rss-probe", default="", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    skill_root = Path(__file__).resolve().parent.parent
+    if args.rss_probe:
+        print(probe_peak_rss(skill_root, Path(args.rss_probe)))
+        return 0
+
+    try:
+        if args.sizes is not None:
+            sizes = parse_sizes(args.sizes)
+        else:
+            sizes = [] if args.startup else list(DEFAULT_SIZES)
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+        report = run_benchmarks(
+            skill_root,
+            sizes,
+            repeat=args.repeat,
+            parse_workers=args.jobs or None,
+            work_dir=Path(args.work_dir) if args.work_dir else None,
+            memory=args.memory,
+            startup_rules=args.startup,
+        )
+        regressions = compare_reports(baseline, report, args.tolerance) if baseline is not None else []
+    except (OSError, ValueError) as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    print(format_report(report), end="")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.save_baseline}")
+
+    if regressions:
+        print(f"Performance regressions against {args.baseline}:")
+        for item in regressions:
+            print(f"- {item}")
+        return 1
+    if baseline is not None:
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
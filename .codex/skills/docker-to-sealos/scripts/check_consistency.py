@@ -6,11 +6,17 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Dict, Optional, Sequence
 
+from check_consistency_cache import default_cache_dir, open_cache
+from check_consistency_engine import RULE_EXECUTORS, BudgetOutcome
+from check_consistency_models import DEFAULT_WATCH_INTERVAL, Violation
+from check_consistency_output import OUTPUT_FORMATS, format_text_line, write_github, write_json, write_sarif
 from check_consistency_parser import resolve_path
+from check_consistency_profile import ProfileReport, load_rule_costs
+from check_consistency_registry import validate_registry
 from check_consistency_rule_registry import REGISTERED_RULES
-from check_consistency_runner import run_checks
+from check_consistency_runner import iter_checks, run_checks
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -31,9 +37,195 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
             "Use this to validate generated manifests such as template/<app>/index.yaml"
         ),
     )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help=(
+            "Directory for the content-hash keyed parse cache; unchanged files are not re-parsed "
+            "(default: $DOCKER_TO_SEALOS_CACHE_DIR, set by quality_gate.py)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for YAML parsing (0 = auto: parallel only for large scans, 1 = serial)",
+    )
+    parser.add_argument(
+        "--changed-since",
+        default="",
+        help=(
+            "Git revision; only scan files changed since it (plus their template directory). "
+            "Changes to the rules registry or checker scripts fall back to a full scan"
+        ),
+    )
+    parser.add_argument(
+        "--rule-jobs",
+        type=int,
+        default=1,
+        help="Workers for rule evaluation (1 = serial); output order does not depend on this",
+    )
+    parser.add_argument(
+        "--rule-executor",
+        choices=sorted(RULE_EXECUTORS),
+        default="thread",
+        help="Pool used when --rule-jobs > 1; 'process' forks workers that share the parsed context",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-rule wall time, documents visited and violations, plus per-file parse time, to stderr",
+    )
+    parser.add_argument(
+        "--profile-json",
+        default="",
+        help="Write the profiling report as JSON to this path (implies profiling)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help=(
+            "Report format. json, sarif and github stream violations as each rule finishes "
+            "(rule order, not sorted); text prints one sorted list"
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error-severity violation; rules run cheapest first and later ones are skipped",
+    )
+    parser.add_argument(
+        "--max-violations",
+        type=int,
+        default=0,
+        help="Stop after this many violations (0 = no limit); rules run cheapest first",
+    )
+    parser.add_argument(
+        "--rule-costs",
+        default="",
+        help="--profile-json report whose per-rule seconds order rules for --fail-fast/--max-violations",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "Check every --artifacts entry as an independent template (a catalog directory such as "
+            "template/ expands to its template/<app> subdirectories) in --jobs worker processes, "
+            "loading the registry once, and print violations and timing per template"
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep parsed files in memory, poll scanned files for changes and print violation diffs "
+            "for the changed template directories until interrupted"
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help="Seconds between polls in --watch mode",
+    )
     return parser.parse_args(argv)
 
 
+def stream_report(output_format: str, check_options: Dict[str, Any]) -> int:
+    """Write violations to stdout in a machine-readable format as they are produced; return the count."""
+    cache = open_cache(check_options["cache_dir"])
+    config = validate_registry(check_options["registry_path"], REGISTERED_RULES.keys(), cache)
+    violations = iter_checks(**check_options, config=config)
+    base = Path.cwd()
+    if output_format == "json":
+        return write_json(violations, sys.stdout, base)
+    if output_format == "github":
+        return write_github(violations, sys.stdout, base)
+    descriptions = {rule_id: config.rules[rule_id].description for rule_id in config.ordered_rule_ids}
+    return write_sarif(violations, sys.stdout, base, descriptions)
+
+
+def write_profile(args: argparse.Namespace, profile: Optional[ProfileReport]) -> None:
+    if profile is None:
+        return
+    if args.profile:
+        sys.stderr.write(profile.format_table())
+    if args.profile_json:
+        Path(args.profile_json).write_text(profile.to_json(), encoding="utf-8")
+
+
+def print_text_report(
+    violations: Sequence[Violation],
+    only_rules: Sequence[str],
+    fail_fast: bool = False,
+    max_violations: int = 0,
+    stopped_early: bool = False,
+) -> int:
+    if violations:
+        print("Consistency check failed with the following issues:")
+        for item in violations:
+            print(format_text_line(item))
+        if stopped_early and fail_fast and any(item.severity == "error" for item in violations):
+            print("Stopped at the first error (--fail-fast); remaining rules were skipped.")
+        elif stopped_early and max_violations and len(violations) >= max_violations:
+            print(f"Stopped after {max_violations} violation(s) (--max-violations); remaining rules were skipped.")
+        return 1
+
+    total = len(only_rules) if only_rules else len(REGISTERED_RULES)
+    print(f"Consistency check passed ({total} rules).")
+    return 0
+
+
+def run_batch(check_options: Dict[str, Any]) -> int:
+    # Imported here (as is the watch module) so single runs skip loading it and the pool machinery behind it.
+    from check_consistency_batch import expand_template_roots, format_batch_report, run_checks_batch
+
+    try:
+        roots = expand_template_roots([Path(item) for item in check_options["additional_include_paths"] or []])
+        report = run_checks_batch(
+            skill_path=check_options["skill_path"],
+            references_dir=check_options["references_dir"],
+            registry_path=check_options["registry_path"],
+            artifact_roots=roots,
+            only_rules=check_options["only_rules"],
+            cache_dir=check_options["cache_dir"],
+            workers=check_options["parse_workers"],
+        )
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    sys.stdout.write(format_batch_report(report, Path.cwd()))
+    return 1 if report.violations() else 0
+
+
+def run_watch(args: argparse.Namespace, check_options: Dict[str, Any]) -> int:
+    from check_consistency_watch import WatchSession, watch
+
+    session = WatchSession(
+        skill_path=check_options["skill_path"],
+        references_dir=check_options["references_dir"],
+        registry_path=check_options["registry_path"],
+        only_rules=check_options["only_rules"],
+        additional_include_paths=check_options["additional_include_paths"],
+        parse_workers=check_options["parse_workers"],
+    )
+    try:
+        violations = session.start()
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    print_text_report(violations, check_options["only_rules"] or [])
+    print(f"[watch] polling every {args.watch_interval:g}s; press Ctrl-C to stop", flush=True)
+    try:
+        watch(session, sys.stdout, interval=args.watch_interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
 
@@ -53,30 +245,90 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print(f"ERROR: rules registry not found: {rules_file}")
         return 2
 
+    if args.jobs < 0:
+        print("ERROR: --jobs must be >= 0")
+        return 2
+    if args.rule_jobs < 1:
+        print("ERROR: --rule-jobs must be >= 1")
+        return 2
+    if args.watch and (args.format != "text" or args.changed_since or args.profile or args.profile_json):
+        print("ERROR: --watch only supports text output and cannot be combined with --changed-since or --profile")
+        return 2
+    if args.max_violations < 0:
+        print("ERROR: --max-violations must be >= 0")
+        return 2
+    budgeted = args.fail_fast or args.max_violations > 0
+    if budgeted and (args.watch or args.batch):
+        print("ERROR: --fail-fast and --max-violations cannot be combined with --watch or --batch")
+        return 2
+    if args.rule_costs and not budgeted:
+        print("ERROR: --rule-costs requires --fail-fast or --max-violations")
+        return 2
+    if args.batch and (
+        args.watch or args.format != "text" or args.changed_since or args.profile or args.profile_json
+    ):
+        print(
+            "ERROR: --batch only supports text output and cannot be combined with "
+            "--watch, --changed-since or --profile"
+        )
+        return 2
+    if args.batch and not args.artifacts.strip():
+        print("ERROR: --batch requires --artifacts")
+        return 2
+    if args.watch_interval <= 0:
+        print("ERROR: --watch-interval must be > 0")
+        return 2
+
     only_rules = [item.strip() for item in args.only.split(",") if item.strip()]
     additional_include_paths = [item.strip() for item in args.artifacts.split(",") if item.strip()]
-
+    cache_dir = resolve_path(args.cache_dir, skill_root) if args.cache_dir else default_cache_dir()
+    profile = ProfileReport() if args.profile or args.profile_json else None
+    outcome = BudgetOutcome()
     try:
-        violations = run_checks(
-            skill_path=skill_path,
-            references_dir=references_dir,
-            registry_path=rules_file,
-            only_rules=only_rules or None,
-            additional_include_paths=additional_include_paths or None,
-        )
+        rule_costs = load_rule_costs(resolve_path(args.rule_costs, Path.cwd())) if args.rule_costs else None
     except ValueError as exc:
         print(f"ERROR: {exc}")
         return 2
+    check_options = dict(
+        skill_path=skill_path,
+        references_dir=references_dir,
+        registry_path=rules_file,
+        only_rules=only_rules or None,
+        additional_include_paths=additional_include_paths or None,
+        cache_dir=cache_dir,
+        parse_workers=args.jobs or None,
+        changed_since=args.changed_since or None,
+        rule_workers=args.rule_jobs,
+        rule_executor=args.rule_executor,
+        profile=profile,
+        fail_fast=args.fail_fast,
+        max_violations=args.max_violations or None,
+        rule_costs=rule_costs,
+        outcome=outcome,
+    )
 
-    if violations:
-        print("Consistency check failed with the following issues:")
-        for item in violations:
-            print(f"- [{item.rule_id}/{item.severity}] {item.path}:{item.line}: {item.message}")
-        return 1
+    if args.watch:
+        return run_watch(args, check_options)
+    if args.batch:
+        return run_batch(check_options)
 
-    total = len(only_rules) if only_rules else len(REGISTERED_RULES)
-    print(f"Consistency check passed ({total} rules).")
-    return 0
+    if args.format != "text":
+        try:
+            count = stream_report(args.format, check_options)
+        except ValueError as exc:
+            print(f"ERROR: {exc}")
+            return 2
+        write_profile(args, profile)
+        return 1 if count else 0
+
+    try:
+        violations = run_checks(**check_options)
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+
+    write_profile(args, profile)
+    return print_text_report(violations, only_rules, args.fail_fast, args.max_violations, outcome.stopped_early)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Batch consistency checks over many independent template directories with one shared setup."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from check_consistency_cache import open_cache
+from check_consistency_engine import RuleEngine
+from check_consistency_models import Violation, violation_sort_key
+from check_consistency_output import display_path, format_text_line
+from check_consistency_parser import SUPPORTED_SCAN_SUFFIXES, build_context, resolve_path
+from check_consistency_registry import validate_registry
+from check_consistency_rule_registry import REGISTERED_RULES
+
+
+TEMPLATE_INDEX_NAMES = ("index.yaml", "index.yml")
+# Set only while a fork-based pool is alive; children inherit the job (registry, engine and
+# selected rules) through fork instead of reloading or pickling it.
+_FORKED_BATCH_JOB: Optional[Callable[[Path], "TemplateCheck"]] = None
+
+
+@dataclass(frozen=True)
+class TemplateCheck:
+    root: Path
+    violations: List[Violation]
+    parse_seconds: float
+    check_seconds: float
+
+    @property
+    def seconds(self) -> float:
+        return self.parse_seconds + self.check_seconds
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    """Per-template results in input order, plus the shared SKILL.md/references scan when requested."""
+
+    templates: List[TemplateCheck]
+    shared: Optional[TemplateCheck] = None
+
+    def violations(self) -> List[Violation]:
+        groups = [self.shared, *self.templates] if self.shared is not None else self.templates
+        return sorted((item for group in groups for item in group.violations), key=violation_sort_key)
+
+
+def _is_template_dir(path: Path) -> bool:
+    return any((path / name).is_file() for name in TEMPLATE_INDEX_NAMES)
+
+
+def expand_template_roots(paths: Sequence[Path]) -> List[Path]:
+    """Expand catalog directories (no index.yaml/index.yml of their own) into one root per template.
+
+    Each catalog entry becomes a root when it is a template/<app> directory or a supported scan
+    file (flat template/<app>.yaml, README.md, ...), so the batch covers what a full scan of the
+    catalog covers. Other files are skipped like a full scan skips them; a subdirectory without
+    an index file cannot be attributed to one template and raises ValueError.
+    """
+    roots: List[Path] = []
+    for path in paths:
+        if not path.is_dir() or _is_template_dir(path):
+            roots.append(path)
+            continue
+        for child in sorted(path.iterdir()):
+            if child.is_dir():
+                if not _is_template_dir(child):
+                    raise ValueError(
+                        f"cannot batch-check {child}: catalog subdirectories need an "
+                        f"{' or '.join(TEMPLATE_INDEX_NAMES)}"
+                    )
+                roots.append(child)
+            elif child.suffix.lower() in SUPPORTED_SCAN_SUFFIXES:
+                roots.append(child)
+    return list(dict.fromkeys(roots))
+
+
+def _run_forked_job(root: Path) -> "TemplateCheck":
+    assert _FORKED_BATCH_JOB is not None
+    return _FORKED_BATCH_JOB(root)
+
+
+def run_checks_batch(
+    skill_path: Path,
+    references_dir: Path,
+    registry_path: Path,
+    artifact_roots: Sequence[Path],
+    only_rules: Optional[Sequence[str]] = None,
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    include_shared: bool = True,
+) -> BatchReport:
+    """Check each artifact root on its own, loading the registry and resolving rules once.
+
+    Every root is scanned without SKILL.md and references, so its group only holds its own
+    violations; with include_shared those documents are checked once into BatchReport.shared.
+    Roots are checked in forked worker processes (workers=None uses every CPU); without fork
+    support, or with one worker, they run serially.
+    """
+    config = validate_registry(registry_path, REGISTERED_RULES.keys(), open_cache(cache_dir))
+    engine = RuleEngine(config=config, registered_rules=REGISTERED_RULES, skill_root=skill_path.parent)
+    selected_rules = engine.resolve_rules(only_rules)
+    roots = [resolve_path(str(root), skill_path.parent) for root in artifact_roots]
+    for root in roots:
+        if not root.exists():
+            raise ValueError(f"included path does not exist: {root}")
+
+    def check(root: Path, include_paths: Sequence[str]) -> TemplateCheck:
+        started = time.perf_counter()
+        context, parse_violations = build_context(
+            skill_path=skill_path,
+            references_dir=references_dir,
+            include_paths=include_paths,
+            cache_dir=cache_dir,
+            parse_workers=1,
+        )
+        parsed = time.perf_counter()
+        violations = engine.run(context=context, parse_violations=parse_violations, selected_rules=selected_rules)
+        return TemplateCheck(root, violations, parsed - started, time.perf_counter() - parsed)
+
+    def check_template(root: Path) -> TemplateCheck:
+        return check(root, [str(root)])
+
+    shared = None
+    if include_shared and config.include_paths:
+        shared = check(skill_path.parent, config.include_paths)
+    return BatchReport(templates=_map_templates(check_template, roots, workers), shared=shared)
+
+
+def _map_templates(
+    check_template: Callable[[Path], TemplateCheck],
+    roots: Sequence[Path],
+    workers: Optional[int],
+) -> List[TemplateCheck]:
+    workers = max(1, min(workers or os.cpu_count() or 1, len(roots)))
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        global _FORKED_BATCH_JOB
+        _FORKED_BATCH_JOB = check_template
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                return list(pool.map(_run_forked_job, roots))
+        except (OSError, BrokenProcessPool):
+            # Sandboxes without working multiprocessing still get a correct serial run.
+            pass
+        finally:
+            _FORKED_BATCH_JOB = None
+    return [check_template(root) for root in roots]
+
+
+def format_batch_report(report: BatchReport, base: Path) -> str:
+    """One summary line per group (violations and time), followed by that group's violations."""
+    groups = [report.shared, *report.templates] if report.shared is not None else report.templates
+    lines: List[str] = []
+    for group in groups:
+        label = "shared (SKILL.md, references)" if group is report.shared else display_path(group.root, base)
+        lines.append(
+            f"== {label}: {len(group.violations)} violation(s), "
+            f"parse {group.parse_seconds * 1000:.1f} ms, check {group.check_seconds * 1000:.1f} ms"
+        )
+        lines.extend(format_text_line(item) for item in group.violations)
+    failed = sum(1 for group in groups if group.violations)
+    total = sum(group.seconds for group in groups)
+    lines.append(f"{len(report.templates)} template(s) checked in {total:.2f}s of work, {failed} group(s) failed")
+    return "\n".join(lines) + "\n"
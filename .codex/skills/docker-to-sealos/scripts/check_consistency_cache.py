@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache for parsed scan inputs, shared by every quality gate step."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+import yaml
+
+from yaml_support import LOADER_NAME, safe_load
+
+
+CACHE_FORMAT_VERSION = 1
+# quality_gate.py exports this so every step (checks and test suites) reuses one cache.
+CACHE_DIR_ENV = "DOCKER_TO_SEALOS_CACHE_DIR"
+T = TypeVar("T")
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Cache directory from DOCKER_TO_SEALOS_CACHE_DIR, or None when unset."""
+    value = os.environ.get(CACHE_DIR_ENV, "").strip()
+    return Path(value) if value else None
+
+
+def content_hasher(namespace: str, salt: Sequence[str] = ()) -> Any:
+    """sha256 primed like content_key; feed it UTF-8 text chunks to key streamed content."""
+    digest = hashlib.sha256()
+    for part in (f"v{CACHE_FORMAT_VERSION}", namespace, *salt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest
+
+
+def content_key(namespace: str, text: str, salt: Sequence[str] = ()) -> str:
+    digest = content_hasher(namespace, salt)
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """Pickle store keyed by content hash; unreadable entries count as misses and are removed."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+
+    def load(self, key: str) -> Optional[Any]:
+        entry = self._entry_path(key)
+        try:
+            with entry.open("rb") as handle:
+                value = pickle.load(handle)
+        except Exception:
+            # A truncated or corrupted pickle can raise almost anything (UnicodeDecodeError,
+            # ValueError, OverflowError, MemoryError, ...); rebuild it instead of failing the check.
+            self.misses += 1
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+        self.hits += 1
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        entry = self._entry_path(key)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        except OSError:
+            # A read-only or full cache directory must never fail the check itself.
+            return
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_name, entry)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+
+
+def open_cache(cache_dir: Optional[Path]) -> Optional[ContentCache]:
+    return ContentCache(cache_dir) if cache_dir is not None else None
+
+
+def cached_artifact(
+    cache: Optional[ContentCache],
+    namespace: str,
+    text: str,
+    build: Callable[[str], T],
+    salt: Sequence[str] = (),
+) -> T:
+    """build(text), memoized in cache under (namespace, salt, content hash); cache=None just builds."""
+    if cache is None:
+        return build(text)
+    key = content_key(namespace, text, salt)
+    value = cache.load(key)
+    if value is None:
+        value = build(text)
+        cache.store(key, value)
+    return value
+
+
+def load_yaml_file(path: Path, cache: Optional[ContentCache] = None) -> Any:
+    """safe_load of a single-document YAML file (registry, must-map), shared through cache.
+
+    Keyed by PyYAML version and loader too, like the parse cache: their output may differ.
+    """
+    salt = (f"pyyaml-{yaml.__version__}", LOADER_NAME)
+    return cached_artifact(cache, "yaml-file", path.read_text(encoding="utf-8"), safe_load, salt)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Git-driven change detection for incremental consistency checks."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Collection, List, Sequence, Set
+
+from check_consistency_models import template_directory_of
+
+
+def _run_git(args: Sequence[str], cwd: Path) -> str:
+    command = ["git", *args]
+    try:
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    except OSError as exc:
+        raise ValueError(f"unable to run git for --changed-since: {exc}") from exc
+    if result.returncode != 0:
+        detail = result.stderr.strip() or result.stdout.strip() or "unknown error"
+        raise ValueError(f"git command failed ({' '.join(command)}): {detail}")
+    return result.stdout
+
+
+def list_changed_files(rev: str, cwd: Path) -> Set[Path]:
+    """Files changed in the working tree relative to rev, including untracked files."""
+    toplevel = Path(_run_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    _run_git(["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], cwd)
+
+    names: List[str] = []
+    names.extend(_run_git(["diff", "--name-only", "-z", rev, "--"], toplevel).split("\0"))
+    names.extend(_run_git(["ls-files", "--others", "--exclude-standard", "-z"], toplevel).split("\0"))
+    return {(toplevel / name).resolve() for name in names if name}
+
+
+def _context_group(path: Path) -> Path:
+    return template_directory_of(path) or path
+
+
+def requires_full_scan(changed_files: Collection[Path], full_scan_triggers: Collection[Path]) -> bool:
+    """Changes to checker inputs such as the rules registry invalidate every earlier result."""
+    triggers = {path.resolve() for path in full_scan_triggers}
+    return any(path.resolve() in triggers for path in changed_files)
+
+
+def select_changed_scan_paths(scan_paths: Sequence[Path], changed_files: Collection[Path]) -> List[Path]:
+    """Keep scan paths that changed, plus unchanged files sharing a template directory with a change.
+
+    Every rule that compares documents with each other (R013 folder name matching, R032
+    postgres init jobs, R034 postgres secret/cluster pairing) stays within one template
+    directory, so a change anywhere in that directory keeps the whole directory in scope
+    and the result matches the same directories in a full scan.
+    """
+    changed_groups = {_context_group(path.resolve()) for path in changed_files}
+    return [path for path in scan_paths if _context_group(path.resolve()) in changed_groups]
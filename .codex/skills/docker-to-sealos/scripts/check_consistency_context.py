@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Sequence, Tuple
+from typing import Collection, Dict, Optional, Sequence, Tuple
 
 from check_consistency_models import ScanContext, Violation
 from check_consistency_parser import build_context
@@ -16,10 +16,18 @@ class ContextBuilder:
     skill_path: Path
     references_dir: Path
     include_paths: Sequence[str]
+    cache_dir: Optional[Path] = None
+    parse_workers: Optional[int] = None
+    changed_files: Optional[Collection[Path]] = None
+    parse_timings: Optional[Dict[Path, float]] = None
 
     def build(self) -> Tuple[ScanContext, list[Violation]]:
         return build_context(
             skill_path=self.skill_path,
             references_dir=self.references_dir,
             include_paths=self.include_paths,
+            cache_dir=self.cache_dir,
+            parse_workers=self.parse_workers,
+            changed_files=self.changed_files,
+            parse_timings=self.parse_timings,
         )
@@ -4,11 +4,103 @@
 from __future__ import annotations
 
 import fnmatch
-from dataclasses import replace
+from collections import deque
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Mapping, Optional, Sequence
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from check_consistency_models import RegistryConfig, Rule, ScanContext, Violation
+from check_consistency_models import NodeHandler, RegistryConfig, Rule, ScanContext, Violation, violation_sort_key
+from check_consistency_profile import RuleTiming, profile_rules
+from check_consistency_visitor import run_node_handlers
+
+
+RULE_EXECUTORS = {"thread", "process"}
+# Set only while a fork-based pool is alive; children inherit the closure (and with it the
+# ScanContext and rule functions) through fork instead of pickling them.
+_FORKED_TASK_RUNNER: Optional[Callable[[Optional[str]], Dict[str, List[Violation]]]] = None
+
+
+def _run_forked_task(task: Optional[str]) -> Dict[str, List[Violation]]:
+    assert _FORKED_TASK_RUNNER is not None
+    return _FORKED_TASK_RUNNER(task)
+
+
+@dataclass
+class BudgetOutcome:
+    """Filled in by within_budget: whether it stopped while violations or rule tasks were still left."""
+
+    stopped_early: bool = False
+
+
+def within_budget(
+    violations: Iterator[Violation],
+    fail_fast: bool = False,
+    max_violations: Optional[int] = None,
+    outcome: Optional[BudgetOutcome] = None,
+) -> Iterator[Violation]:
+    """Pass violations through until the first error (fail_fast) or max_violations items.
+
+    Stopping closes the source, so rule tasks that have not started yet never run. A stop only
+    counts as early in outcome when the source still had work left; sources without a
+    has_pending() method are assumed to have had some.
+    """
+    count = 0
+    try:
+        if max_violations is not None and max_violations <= 0:
+            _record_stop(violations, outcome)
+            return
+        for item in violations:
+            yield item
+            count += 1
+            if (fail_fast and item.severity == "error") or (max_violations is not None and count >= max_violations):
+                _record_stop(violations, outcome)
+                return
+    finally:
+        close = getattr(violations, "close", None)
+        if close is not None:
+            close()
+
+
+def _record_stop(violations: Iterator[Violation], outcome: Optional[BudgetOutcome]) -> None:
+    if outcome is not None:
+        has_pending = getattr(violations, "has_pending", None)
+        outcome.stopped_early = has_pending() if has_pending is not None else True
+
+
+class _ScopedStream(Iterator[Violation]):
+    """Leading violations, then each task batch's scoped violations; knows whether any are left.
+
+    A batch is only pulled (and its task only waited for) once the buffer is empty, so
+    has_pending() never starts a rule task.
+    """
+
+    def __init__(
+        self,
+        leading: Sequence[Violation],
+        batches: Iterator[Dict[str, List[Violation]]],
+        batch_count: int,
+        scope: Callable[[Dict[str, List[Violation]]], List[Violation]],
+    ) -> None:
+        self._buffer = deque(leading)
+        self._batches = batches
+        self._remaining_batches = batch_count
+        self._scope = scope
+
+    def __next__(self) -> Violation:
+        while not self._buffer:
+            if self._remaining_batches == 0:
+                raise StopIteration
+            self._remaining_batches -= 1
+            self._buffer.extend(self._scope(next(self._batches)))
+        return self._buffer.popleft()
+
+    def has_pending(self) -> bool:
+        return bool(self._buffer) or self._remaining_batches > 0
+
+    def close(self) -> None:
+        close = getattr(self._batches, "close", None)
+        if close is not None:
+            close()
 
 
 class RuleEngine:
@@ -20,35 +112,233 @@ class RuleEngine:
         skill_root: Path,
     ) -> None:
         self.config = config
-        self.registered_rules: Dict[str, Rule] = dict(registered_rules)
+        # Kept as given: the default registry imports rule modules lazily, on first lookup.
+        self.registered_rules: Mapping[str, Rule] = registered_rules
         self.skill_root = skill_root
 
     def resolve_rules(self, only_rules: Optional[Sequence[str]]) -> list[str]:
         selected_rules = list(only_rules) if only_rules else list(self.config.ordered_rule_ids)
-        unknown = sorted(set(selected_rules) - set(self.registered_rules.keys()))
+        unknown = sorted(rule_id for rule_id in set(selected_rules) if rule_id not in self.registered_rules)
         if unknown:
             raise ValueError(f"unknown rule id(s): {', '.join(unknown)}")
         return selected_rules
 
+    def applicable_rules(self, context: ScanContext, selected_rules: Sequence[str]) -> List[str]:
+        """Selected rules whose declared inputs occur in context; the rest cannot report anything."""
+        index = context.document_index
+        kinds = index.by_kind.keys()
+        return [
+            rule_id
+            for rule_id in selected_rules
+            if self.config.rules[rule_id].inputs.is_affected_by(kinds, documents=bool(index.checked))
+        ]
+
+    def order_by_cost(
+        self,
+        context: ScanContext,
+        selected_rules: Sequence[str],
+        rule_costs: Optional[Mapping[str, float]] = None,
+    ) -> List[str]:
+        """Selected rules, cheapest first.
+
+        Rules with measured seconds in rule_costs (for example a --profile-json report) come
+        first, by time; the rest follow, estimated by how many documents their registry inputs
+        select in context. Ties keep the selected order.
+        """
+        index = context.document_index
+        costs = rule_costs or {}
+
+        def cost(rule_id: str) -> Tuple[int, float]:
+            if rule_id in costs:
+                return 0, costs[rule_id]
+            inputs = self.config.rules[rule_id].inputs
+            documents = len(index.checked) if inputs.reads_all_documents() else len(index.of_kinds(inputs.kinds))
+            return 1, documents + (len(context.scanned_paths) if inputs.file_texts else 0)
+
+        return sorted(selected_rules, key=cost)
+
     def run(
         self,
         *,
         context: ScanContext,
         parse_violations: Sequence[Violation],
         selected_rules: Sequence[str],
+        workers: int = 1,
+        executor: str = "thread",
+        timings: Optional[List[RuleTiming]] = None,
+        fail_fast: bool = False,
+        max_violations: Optional[int] = None,
+        rule_costs: Optional[Mapping[str, float]] = None,
+        outcome: Optional[BudgetOutcome] = None,
     ) -> list[Violation]:
-        violations: list[Violation] = list(parse_violations)
+        violations = list(
+            self.iter_violations(
+                context=context,
+                parse_violations=parse_violations,
+                selected_rules=selected_rules,
+                workers=workers,
+                executor=executor,
+                timings=timings,
+                fail_fast=fail_fast,
+                max_violations=max_violations,
+                rule_costs=rule_costs,
+                outcome=outcome,
+            )
+        )
+        violations.sort(key=violation_sort_key)
+        return violations
+
+    def iter_violations(
+        self,
+        *,
+        context: ScanContext,
+        parse_violations: Sequence[Violation],
+        selected_rules: Sequence[str],
+        workers: int = 1,
+        executor: str = "thread",
+        timings: Optional[List[RuleTiming]] = None,
+        fail_fast: bool = False,
+        max_violations: Optional[int] = None,
+        rule_costs: Optional[Mapping[str, float]] = None,
+        outcome: Optional[BudgetOutcome] = None,
+    ) -> Iterator[Violation]:
+        """Yield parse violations, then each rule task's scoped violations as soon as the task finishes.
+
+        The stream follows task order rather than run()'s (path, line) order; run() sorts it.
+        With fail_fast or max_violations, rules run cheapest first (see order_by_cost) and the
+        stream stops at the first error or after max_violations items; rules not yet started
+        are skipped, and outcome records whether anything actually was.
+        """
+        budgeted = fail_fast or max_violations is not None
+        if budgeted:
+            selected_rules = self.order_by_cost(context, selected_rules, rule_costs)
+        if timings is not None:
+            # Profiling runs rules one at a time so their timings do not overlap.
+            produced_by_rule, rule_timings = profile_rules(
+                context,
+                self.registered_rules,
+                selected_rules,
+                applicable=self.applicable_rules(context, selected_rules),
+            )
+            timings.extend(rule_timings)
+            batches: Iterator[Dict[str, List[Violation]]] = iter([produced_by_rule])
+            batch_count = 1
+        else:
+            visitor_handlers, tasks = self._plan_tasks(self.applicable_rules(context, selected_rules))
+            batches = self._iter_produced(context, visitor_handlers, tasks, workers=workers, executor=executor)
+            batch_count = len(tasks)
+        violations = _ScopedStream(
+            parse_violations,
+            batches,
+            batch_count,
+            lambda produced_by_rule: self._scoped(produced_by_rule, selected_rules),
+        )
+        if budgeted:
+            return within_budget(violations, fail_fast=fail_fast, max_violations=max_violations, outcome=outcome)
+        return violations
+
+    def _scoped(self, produced_by_rule: Dict[str, List[Violation]], selected_rules: Sequence[str]) -> List[Violation]:
+        scoped: List[Violation] = []
         for rule_id in selected_rules:
-            rule = self.registered_rules[rule_id]
+            if rule_id not in produced_by_rule:
+                continue
             default_meta = self.config.rules[rule_id]
-            for item in rule.check(context):
+            for item in produced_by_rule[rule_id]:
                 meta = self.config.rules.get(item.rule_id, default_meta)
-                if not self._in_rule_scope(item, meta.include_paths):
-                    continue
-                violations.append(replace(item, severity=meta.severity))
+                if self._in_rule_scope(item, meta.include_paths):
+                    scoped.append(replace(item, severity=meta.severity))
+        return scoped
 
-        violations.sort(key=lambda x: (str(x.path), x.line, x.rule_id, x.message))
-        return violations
+    def _plan_tasks(
+        self,
+        selected_rules: Sequence[str],
+    ) -> Tuple[Dict[str, Mapping[str, NodeHandler]], List[Optional[str]]]:
+        """Visitor handlers of the selected rules and the task list: None is the shared visitor walk.
+
+        Visitor rules share one task (a single walk), placed where the first of them is
+        selected; every legacy rule is its own task.
+        """
+        visitor_handlers = {
+            rule_id: self.registered_rules[rule_id].node_handlers
+            for rule_id in selected_rules
+            if self.registered_rules[rule_id].node_handlers
+        }
+        tasks: List[Optional[str]] = []
+        for rule_id in selected_rules:
+            if rule_id not in visitor_handlers:
+                tasks.append(rule_id)
+            elif None not in tasks:
+                tasks.append(None)
+        return visitor_handlers, tasks
+
+    def _iter_produced(
+        self,
+        context: ScanContext,
+        visitor_handlers: Mapping[str, Mapping[str, NodeHandler]],
+        tasks: Sequence[Optional[str]],
+        *,
+        workers: int,
+        executor: str,
+    ) -> Iterator[Dict[str, List[Violation]]]:
+        """Run the planned tasks, yielding each task's raw output keyed by rule id, in task order.
+
+        The executor is validated eagerly, before any task runs.
+        """
+        if executor not in RULE_EXECUTORS:
+            allowed = ", ".join(sorted(RULE_EXECUTORS))
+            raise ValueError(f"unsupported rule executor: {executor} (allowed: {allowed})")
+
+        def run_task(task: Optional[str]) -> Dict[str, List[Violation]]:
+            if task is None:
+                return run_node_handlers(context, visitor_handlers)
+            return {task: self.registered_rules[task].check(context)}
+
+        workers = max(1, min(workers, len(tasks)))
+        if workers == 1:
+            return (run_task(task) for task in tasks)
+        # Build shared lookups up front so workers (threads or forked children) reuse one copy.
+        context.document_index  # noqa: B018
+        # Pool modules are imported only here: serial runs (the CLI default) never need them.
+        import multiprocessing
+
+        if executor == "process" and "fork" in multiprocessing.get_all_start_methods():
+            return self._run_forked(tasks, run_task, workers)
+        return self._run_threaded(tasks, run_task, workers)
+
+    def _run_threaded(
+        self,
+        tasks: Sequence[Optional[str]],
+        run_task: Callable[[Optional[str]], Dict[str, List[Violation]]],
+        workers: int,
+    ) -> Iterator[Dict[str, List[Violation]]]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            yield from pool.map(run_task, tasks)
+        finally:
+            # An early stop (fail-fast, budget) drops tasks that have not started.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run_forked(
+        self,
+        tasks: Sequence[Optional[str]],
+        run_task: Callable[[Optional[str]], Dict[str, List[Violation]]],
+        workers: int,
+    ) -> Iterator[Dict[str, List[Violation]]]:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        global _FORKED_TASK_RUNNER
+        _FORKED_TASK_RUNNER = run_task
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+            try:
+                yield from pool.map(_run_forked_task, tasks)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            _FORKED_TASK_RUNNER = None
 
     def _in_rule_scope(self, violation: Violation, include_paths: Sequence[str]) -> bool:
         if not include_paths:
@@ -6,17 +6,28 @@ from __future__ import annotations
 import re
 from typing import Any, Iterator, Optional
 
-from check_consistency_models import STORAGE_UNIT_TO_BYTES
+from check_consistency_models import STORAGE_UNIT_TO_BYTES, NodePath
 
 
 def contains_key(node: Any, key: str) -> bool:
+    return find_key_path(node, key) is not None
+
+
+def find_key_path(node: Any, key: str, path: NodePath = ()) -> Optional[NodePath]:
+    """Node path of the first mapping entry named key, depth-first in document order."""
     if isinstance(node, dict):
         if key in node:
-            return True
-        return any(contains_key(value, key) for value in node.values())
-    if isinstance(node, list):
-        return any(contains_key(item, key) for item in node)
-    return False
+            return (*path, key)
+        for child_key, value in node.items():
+            found = find_key_path(value, key, (*path, child_key))
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for index, item in enumerate(node):
+            found = find_key_path(item, key, (*path, index))
+            if found is not None:
+                return found
+    return None
 
 
 def parse_storage_bytes(raw_value: str) -> Optional[int]:
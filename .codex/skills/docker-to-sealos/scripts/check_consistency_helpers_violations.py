@@ -5,10 +5,31 @@ from __future__ import annotations
 
 from typing import Any, Callable, List, Mapping, Optional
 
-from check_consistency_models import ScanContext, Violation, YamlDocument
-from check_consistency_parser import find_line
+from check_consistency_models import NodePath, ScanContext, Violation, YamlDocument
+from check_consistency_helpers_workload import has_managed_workload_marker, iter_app_workload_documents
 
-from check_consistency_helpers_workload import is_managed_app_workload_document
+
+def locate_doc_line(
+    doc: YamlDocument,
+    *,
+    node_path: Optional[NodePath] = None,
+    pattern: Optional[str] = None,
+    default_pattern: Optional[str] = None,
+) -> int:
+    """Resolve a violation line from the node path (or its nearest existing ancestor).
+
+    The regex patterns are only consulted for documents without a node line map.
+    """
+    if node_path is not None:
+        line = doc.line_locator.nearest_line(node_path)
+        if line is not None:
+            return line
+    patterns = [item for item in (pattern, default_pattern) if item]
+    found = doc.line_locator.find_many(patterns)
+    for item in patterns:
+        if found[item] is not None:
+            return found[item]
+    return doc.start_line
 
 
 def add_doc_violation(
@@ -16,12 +37,17 @@ def add_doc_violation(
     *,
     rule_id: str,
     doc: YamlDocument,
-    pattern: str,
     message: str,
+    pattern: Optional[str] = None,
     default_pattern: Optional[str] = None,
+    node_path: Optional[NodePath] = None,
 ) -> None:
-    default_line = find_line(doc, default_pattern) if default_pattern else None
-    line = find_line(doc, pattern, default=default_line)
+    line = locate_doc_line(
+        doc,
+        node_path=node_path,
+        pattern=pattern,
+        default_pattern=default_pattern,
+    )
     violations.append(
         Violation(
             rule_id=rule_id,
@@ -38,16 +64,13 @@ def check_managed_workload_setting(
     rule_id: str,
     value_extractor: Callable[[Mapping[str, Any]], Any],
     expected: Any,
-    value_pattern: str,
-    fallback_pattern: str,
+    node_path: NodePath,
     missing_message: str,
     mismatch_message: str,
 ) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not is_managed_app_workload_document(doc):
-            continue
-        if not isinstance(doc.data, dict):
+    for doc in iter_app_workload_documents(context):
+        if not has_managed_workload_marker(doc.data):
             continue
 
         value = value_extractor(doc.data)
@@ -58,8 +81,7 @@ def check_managed_workload_setting(
             violations,
             rule_id=rule_id,
             doc=doc,
-            pattern=value_pattern,
-            default_pattern=fallback_pattern,
+            node_path=node_path,
             message=mismatch_message if value is not None else missing_message,
         )
 
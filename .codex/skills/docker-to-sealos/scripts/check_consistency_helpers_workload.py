@@ -3,30 +3,71 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterator, Mapping, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from check_consistency_models import APP_WORKLOAD_KINDS, ScanContext, YamlDocument
+from check_consistency_models import APP_WORKLOAD_KINDS, NodePath, ScanContext, YamlDocument
 
 
+# Node path of the pod spec that get_template_spec returns.
+TEMPLATE_SPEC_PATH: NodePath = ("spec", "template", "spec")
+
 def iter_documents_by_kind(context: ScanContext, kind: str) -> Iterator[YamlDocument]:
-    for doc in context.yaml_documents:
-        if doc.skip_checks:
-            continue
-        if isinstance(doc.data, dict) and doc.data.get("kind") == kind:
+    yield from context.document_index.of_kind(kind)
+
+
+def iter_documents_by_kinds(context: ScanContext, kinds: Iterable[str]) -> Iterator[YamlDocument]:
+    yield from context.document_index.of_kinds(kinds)
+
+
+def iter_app_workload_documents(context: ScanContext) -> Iterator[YamlDocument]:
+    for doc in iter_documents_by_kinds(context, APP_WORKLOAD_KINDS):
+        if is_app_workload_document(doc):
             yield doc
 
 
+def iter_index_artifact_documents(context: ScanContext) -> Iterator[YamlDocument]:
+    """Documents from template/<app>/index.yaml style artifact files."""
+    for path, documents in context.document_index.by_path.items():
+        if path.name == "index.yaml":
+            yield from documents
+
+
+def iter_index_artifact_groups(context: ScanContext) -> Iterator[List[YamlDocument]]:
+    """index.yaml documents grouped per template/<app> directory (per file outside one), in scan order.
+
+    Rules that compare documents with each other use this so one template never sees another's
+    documents, which keeps --changed-since and --watch (both re-check whole template directories)
+    consistent with a full scan.
+    """
+    grouped = set()
+    for documents in context.document_index.by_template_dir.values():
+        group = [doc for doc in documents if doc.path.name == "index.yaml"]
+        grouped.update(id(doc) for doc in group)
+        if group:
+            yield group
+    for path, documents in context.document_index.by_path.items():
+        if path.name == "index.yaml" and not any(id(doc) in grouped for doc in documents):
+            yield list(documents)
+
+
 def iter_containers(node: Any) -> Iterator[dict]:
+    for _, container in iter_container_nodes(node):
+        yield container
+
+
+def iter_container_nodes(node: Any, path: NodePath = ()) -> Iterator[Tuple[NodePath, dict]]:
+    """Yield (node_path, container) for every containers/initContainers item, in iter_containers order."""
     if isinstance(node, dict):
         for child_key, child_value in node.items():
+            child_path = (*path, child_key)
             if child_key in {"containers", "initContainers"} and isinstance(child_value, list):
-                for item in child_value:
+                for index, item in enumerate(child_value):
                     if isinstance(item, dict):
-                        yield item
-            yield from iter_containers(child_value)
+                        yield (*child_path, index), item
+            yield from iter_container_nodes(child_value, child_path)
     elif isinstance(node, list):
-        for item in node:
-            yield from iter_containers(item)
+        for index, item in enumerate(node):
+            yield from iter_container_nodes(item, (*path, index))
 
 
 def iter_workload_env_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, str]]:
@@ -41,12 +82,20 @@ def iter_workload_env_secret_key_refs(data: Mapping[str, Any]) -> Iterator[Tuple
 
 
 def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
-    for container in iter_containers(data):
+    for _, source, secret_name, env_name, secret_key in iter_workload_secret_ref_nodes(data):
+        yield source, secret_name, env_name, secret_key
+
+
+def iter_workload_secret_ref_nodes(
+    data: Mapping[str, Any],
+) -> Iterator[Tuple[NodePath, str, str, Optional[str], Optional[str]]]:
+    """Like iter_workload_secret_refs, prefixed with the node path of each referenced secret name."""
+    for container_path, container in iter_container_nodes(data):
         env_list = container.get("env")
         if not isinstance(env_list, list):
             env_list = []
 
-        for env_item in env_list:
+        for index, env_item in enumerate(env_list):
             if not isinstance(env_item, dict):
                 continue
             env_name = env_item.get("name")
@@ -59,11 +108,12 @@ def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, st
             secret_name = secret_ref.get("name")
             secret_key = secret_ref.get("key")
             if isinstance(secret_name, str):
-                yield "env", secret_name, env_name, secret_key if isinstance(secret_key, str) else None
+                name_path = (*container_path, "env", index, "valueFrom", "secretKeyRef", "name")
+                yield name_path, "env", secret_name, env_name, secret_key if isinstance(secret_key, str) else None
 
         env_from_list = container.get("envFrom")
         if isinstance(env_from_list, list):
-            for env_from_item in env_from_list:
+            for index, env_from_item in enumerate(env_from_list):
                 if not isinstance(env_from_item, dict):
                     continue
                 secret_ref = env_from_item.get("secretRef")
@@ -71,7 +121,7 @@ def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, st
                     continue
                 secret_name = secret_ref.get("name")
                 if isinstance(secret_name, str):
-                    yield "envFrom", secret_name, None, None
+                    yield (*container_path, "envFrom", index, "secretRef", "name"), "envFrom", secret_name, None, None
 
     template_spec = get_template_spec(data)
     if not isinstance(template_spec, dict):
@@ -81,14 +131,15 @@ def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, st
     if not isinstance(volumes, list):
         return
 
-    for volume in volumes:
+    for volume_index, volume in enumerate(volumes):
         if not isinstance(volume, dict):
             continue
+        volume_path = (*TEMPLATE_SPEC_PATH, "volumes", volume_index)
         secret_spec = volume.get("secret")
         if isinstance(secret_spec, dict):
             secret_name = secret_spec.get("secretName")
             if isinstance(secret_name, str):
-                yield "volume", secret_name, None, None
+                yield (*volume_path, "secret", "secretName"), "volume", secret_name, None, None
 
         projected = volume.get("projected")
         if not isinstance(projected, dict):
@@ -96,7 +147,7 @@ def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, st
         sources = projected.get("sources")
         if not isinstance(sources, list):
             continue
-        for source in sources:
+        for source_index, source in enumerate(sources):
             if not isinstance(source, dict):
                 continue
             source_secret = source.get("secret")
@@ -104,7 +155,8 @@ def iter_workload_secret_refs(data: Mapping[str, Any]) -> Iterator[Tuple[str, st
                 continue
             secret_name = source_secret.get("name")
             if isinstance(secret_name, str):
-                yield "projected", secret_name, None, None
+                source_path = (*volume_path, "projected", "sources", source_index, "secret", "name")
+                yield source_path, "projected", secret_name, None, None
 
 
 def get_template_spec(data: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
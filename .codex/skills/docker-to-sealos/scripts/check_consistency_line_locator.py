@@ -1,16 +1,84 @@
 #!/usr/bin/env python3
-"""Line-location helper with lightweight key indexing."""
+"""Line-location helpers: node-path line maps with a regex fallback."""
 
 from __future__ import annotations
 
+import json
 import re
-from dataclasses import dataclass
-from typing import Dict, Optional, Sequence
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import yaml
 
 
 SIMPLE_KEY_LINE_PATTERN = re.compile(r"^\s*([A-Za-z0-9_.\-/]+)\s*:")
 SIMPLE_KEY_REGEX_PATTERN = re.compile(r"^\^\\s\*([A-Za-z0-9_.\\\-/]+)\\s\*:\$?$")
 ESCAPED_CHAR_PATTERN = re.compile(r"\\(.)")
+PLAIN_PATH_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_\-/$]+$")
+
+PathSegment = Union[str, int]
+
+
+def format_node_path(path: Sequence[PathSegment]) -> str:
+    """Render a data path as e.g. spec.template.spec.containers[1].image.
+
+    Keys that would be ambiguous in dotted form (such as annotation keys containing dots)
+    are rendered as JSON-quoted brackets: metadata.annotations["kubernetes.io/ingress.class"].
+    """
+    parts: List[str] = []
+    for segment in path:
+        if isinstance(segment, int) and not isinstance(segment, bool):
+            parts.append(f"[{segment}]")
+            continue
+        key = str(segment)
+        if PLAIN_PATH_KEY_PATTERN.match(key):
+            parts.append(f".{key}" if parts else key)
+        else:
+            parts.append(f"[{json.dumps(key, ensure_ascii=False)}]")
+    return "".join(parts)
+
+
+def build_node_line_map(root: Optional[yaml.Node], start_line: int) -> Dict[str, int]:
+    """Map every mapping key and sequence item in a composed document to its absolute line.
+
+    Mapping entries point at the key's line, sequence items at the item's first line. The
+    root document itself is stored under the empty path. Path keys are interned, so
+    documents of the same shape share one copy of each key string.
+    """
+    lines: Dict[str, int] = {}
+    if root is None:
+        return lines
+    lines[""] = start_line + root.start_mark.line
+    seen: set[int] = set()
+    stack: List[Tuple[yaml.Node, Tuple[PathSegment, ...]]] = [(root, ())]
+    while stack:
+        node, path = stack.pop()
+        if id(node) in seen:
+            # Aliased collections are mapped once, at their anchor.
+            continue
+        if isinstance(node, yaml.MappingNode):
+            seen.add(id(node))
+            for key_node, value_node in node.value:
+                if not isinstance(key_node, yaml.ScalarNode):
+                    continue
+                child = (*path, key_node.value)
+                lines[sys.intern(format_node_path(child))] = start_line + key_node.start_mark.line
+                stack.append((value_node, child))
+        elif isinstance(node, yaml.SequenceNode):
+            seen.add(id(node))
+            for index, item in enumerate(node.value):
+                child = (*path, index)
+                lines[sys.intern(format_node_path(child))] = start_line + item.start_mark.line
+                stack.append((item, child))
+    return lines
+
+
+@lru_cache(maxsize=None)
+def compile_line_pattern(pattern: str) -> re.Pattern[str]:
+    """Compiled form of a line pattern, shared by every locator in the process."""
+    return re.compile(pattern)
 
 
 def _unescape_regex_literal(value: str) -> str:
@@ -35,35 +103,110 @@ def _build_key_index(lines: Sequence[str], start_line: int) -> Dict[str, int]:
     return index
 
 
-@dataclass
+class SourceLines(Sequence[str]):
+    """Lines of a document source, split on first access.
+
+    Until a regex lookup needs them, the source string (shared with YamlDocument.source)
+    is the only copy kept.
+    """
+
+    __slots__ = ("source", "_lines")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._lines: Optional[Tuple[str, ...]] = None
+
+    def _split(self) -> Tuple[str, ...]:
+        if self._lines is None:
+            self._lines = tuple(self.source.splitlines())
+        return self._lines
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self._split()[index]
+
+    def __len__(self) -> int:
+        return len(self._split())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._split())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SourceLines):
+            return self.source == other.source
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self._split() == tuple(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SourceLines({self.source!r})"
+
+
+@dataclass(slots=True)
 class LineLocator:
     start_line: int
     lines: Sequence[str]
-
-    def __post_init__(self) -> None:
-        self._key_index = _build_key_index(self.lines, self.start_line)
-        self._pattern_cache: Dict[str, Optional[int]] = {}
+    node_lines: Mapping[str, int] = field(default_factory=dict)
+    # Built on first regex lookup; most documents are located through node_lines only.
+    _key_index: Optional[Dict[str, int]] = field(default=None, init=False, repr=False, compare=False)
+    _pattern_cache: Optional[Dict[str, Optional[int]]] = field(default=None, init=False, repr=False, compare=False)
 
     def find(self, pattern: str, default: Optional[int] = None) -> int:
-        if pattern in self._pattern_cache:
+        if self._pattern_cache is not None and pattern in self._pattern_cache:
             cached = self._pattern_cache[pattern]
             return cached if cached is not None else self._default(default)
 
-        key = _extract_simple_key(pattern)
-        if key is not None and key in self._key_index:
-            line = self._key_index[key]
-            self._pattern_cache[pattern] = line
-            return line
+        found = self.find_many((pattern,))[pattern]
+        return found if found is not None else self._default(default)
+
+    def find_many(self, patterns: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Resolve several patterns with at most one scan over the document lines.
+
+        Returns the first matching line per pattern, or None where nothing matched.
+        """
+        resolved: Dict[str, Optional[int]] = {}
+        pending: List[Tuple[str, re.Pattern[str]]] = []
+        if self._key_index is None:
+            self._key_index = _build_key_index(self.lines, self.start_line)
+            self._pattern_cache = {}
+        for pattern in dict.fromkeys(patterns):
+            if pattern in self._pattern_cache:
+                resolved[pattern] = self._pattern_cache[pattern]
+                continue
+            key = _extract_simple_key(pattern)
+            if key is not None and key in self._key_index:
+                resolved[pattern] = self._pattern_cache[pattern] = self._key_index[key]
+                continue
+            pending.append((pattern, compile_line_pattern(pattern)))
 
-        regex = re.compile(pattern)
         for offset, line in enumerate(self.lines):
-            if regex.search(line):
-                found = self.start_line + offset
-                self._pattern_cache[pattern] = found
-                return found
-
-        self._pattern_cache[pattern] = None
-        return self._default(default)
+            if not pending:
+                break
+            still_pending = []
+            for pattern, regex in pending:
+                if regex.search(line):
+                    resolved[pattern] = self._pattern_cache[pattern] = self.start_line + offset
+                else:
+                    still_pending.append((pattern, regex))
+            pending = still_pending
+
+        for pattern, _ in pending:
+            resolved[pattern] = self._pattern_cache[pattern] = None
+        return resolved
+
+    def line_of(self, path: Sequence[Any]) -> Optional[int]:
+        """Exact line of the node at a data path, or None when the path is not in the document."""
+        return self.node_lines.get(format_node_path(path))
+
+    def nearest_line(self, path: Sequence[Any]) -> Optional[int]:
+        """Line of the node at path, or of its deepest existing ancestor when it is missing.
+
+        Returns None only when no node map was recorded for the document.
+        """
+        for end in range(len(path), -1, -1):
+            line = self.node_lines.get(format_node_path(path[:end]))
+            if line is not None:
+                return line
+        return None
 
     def _default(self, default: Optional[int]) -> int:
         if default is not None:
@@ -3,17 +3,54 @@
 
 from __future__ import annotations
 
+import heapq
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Sequence
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 if TYPE_CHECKING:
     from check_consistency_line_locator import LineLocator
 
 
-LATEST_IMAGE_PATTERN = re.compile(r"\b(?:image|originImageName)\s*:\s*['\"]?[^#\s'\"]*:latest\b")
-TEMPLATE_NAME_PATTERN = re.compile(r"^[a-z0-9](?:[-a-z0-9]*[a-z0-9])?$")
+class LazyPattern:
+    """Regex compiled on first use; search, fullmatch, sub, ... forward to the compiled pattern.
+
+    Module-level rule patterns use this so importing a rule module does not compile them.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name in ("pattern", "flags", "_compiled"):
+            raise AttributeError(name)
+        compiled = self.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = self._compiled = re.compile(self.pattern, self.flags)
+        value = getattr(compiled, name)
+        # Cache the bound method on the instance so later calls skip __getattr__.
+        setattr(self, name, value)
+        return value
+
+
+LATEST_IMAGE_PATTERN = LazyPattern(r"\b(?:image|originImageName)\s*:\s*['\"]?[^#\s'\"]*:latest\b")
+TEMPLATE_NAME_PATTERN = LazyPattern(r"^[a-z0-9](?:[-a-z0-9]*[a-z0-9])?$")
 NEGATIVE_MARKERS = ("错误示例", "wrong example", "❌", "invalid example")
 WORKLOAD_KINDS = {"Deployment", "StatefulSet", "DaemonSet", "Job", "CronJob"}
 APP_WORKLOAD_KINDS = {"Deployment", "StatefulSet", "DaemonSet"}
@@ -47,9 +84,10 @@ STORAGE_UNIT_TO_BYTES = {
 }
 DEFAULT_SEVERITY = "error"
 ALLOWED_SEVERITIES = {"error", "warning"}
+DEFAULT_WATCH_INTERVAL = 0.5  # seconds between --watch polls
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class YamlBlock:
     path: Path
     start_line: int
@@ -57,7 +95,7 @@ class YamlBlock:
     skip_checks: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class YamlDocument:
     path: Path
     start_line: int
@@ -67,7 +105,7 @@ class YamlDocument:
     line_locator: "LineLocator"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Violation:
     rule_id: str
     path: Path
@@ -76,13 +114,55 @@ class Violation:
     severity: str = DEFAULT_SEVERITY
 
 
+def violation_sort_key(violation: Violation) -> Tuple[str, int, str, str]:
+    """Report order for violations: by file, then line, rule id and message."""
+    return (str(violation.path), violation.line, violation.rule_id, violation.message)
+
+
 CheckFunction = Callable[["ScanContext"], List[Violation]]
+NodePath = Tuple[Union[str, int], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class NodeVisit:
+    doc: YamlDocument
+    node: Any
+    path: NodePath
+
+
+NodeHandler = Callable[[NodeVisit], Iterable[Violation]]
 
 
 @dataclass(frozen=True)
 class Rule:
     rule_id: str
     check: CheckFunction
+    # Visitor-style rules map node kinds (see check_consistency_visitor.NODE_KINDS) to
+    # handlers; RuleEngine dispatches them from one shared walk per document.
+    node_handlers: Mapping[str, NodeHandler] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class RuleInputs:
+    """What a rule reads: document kinds (empty means every document) and raw file_texts."""
+
+    kinds: Tuple[str, ...] = ()
+    file_texts: bool = False
+
+    def reads_all_documents(self) -> bool:
+        return not self.kinds
+
+    def is_affected_by(self, kinds: AbstractSet[str], documents: bool = True, texts: bool = True) -> bool:
+        """Whether the rule's output can depend on the given input.
+
+        kinds are the document kinds present (or changed); documents says whether any document,
+        with or without a kind, is; texts says whether file texts are.
+        """
+        if self.file_texts and texts:
+            return True
+        if self.reads_all_documents():
+            return documents
+        return not kinds.isdisjoint(self.kinds)
 
 
 @dataclass(frozen=True)
@@ -91,6 +171,7 @@ class RegistryRuleConfig:
     description: str
     severity: str
     include_paths: Sequence[str]
+    inputs: RuleInputs = RuleInputs()
 
 
 @dataclass(frozen=True)
@@ -100,14 +181,86 @@ class RegistryConfig:
     ordered_rule_ids: List[str]
 
 
+def template_directory_of(path: Path) -> Optional[Path]:
+    """Return template/<app> for artifact paths, the unit that cross-document rules compare within.
+
+    The catalog is the last `template` directory on the path, so a checkout that itself sits
+    under a directory named template still groups by app; flat template/<app>.yaml files have none.
+    """
+    directories = path.parts[:-1]
+    if "template" not in directories:
+        return None
+    index = len(directories) - 1 - directories[::-1].index("template")
+    if index + 1 >= len(directories):
+        return None
+    return Path(*directories[: index + 2])
+
+
+@dataclass(frozen=True)
+class DocumentIndex:
+    """Lookup tables over non-skipped documents; every table keeps scan order."""
+
+    checked: Tuple[YamlDocument, ...]
+    by_kind: Mapping[str, Tuple[YamlDocument, ...]]
+    by_path: Mapping[Path, Tuple[YamlDocument, ...]]
+    by_template_dir: Mapping[Path, Tuple[YamlDocument, ...]]
+    positions: Mapping[int, int]
+
+    @classmethod
+    def build(cls, documents: Iterable[YamlDocument]) -> "DocumentIndex":
+        checked: List[YamlDocument] = []
+        by_kind: Dict[str, List[YamlDocument]] = {}
+        by_path: Dict[Path, List[YamlDocument]] = {}
+        by_template_dir: Dict[Path, List[YamlDocument]] = {}
+        template_dirs: Dict[Path, Optional[Path]] = {}
+        positions: Dict[int, int] = {}
+
+        for doc in documents:
+            if doc.skip_checks:
+                continue
+            positions[id(doc)] = len(checked)
+            checked.append(doc)
+            by_path.setdefault(doc.path, []).append(doc)
+            if doc.path not in template_dirs:
+                template_dirs[doc.path] = template_directory_of(doc.path.resolve())
+            template_dir = template_dirs[doc.path]
+            if template_dir is not None:
+                by_template_dir.setdefault(template_dir, []).append(doc)
+            kind = doc.data.get("kind") if isinstance(doc.data, dict) else None
+            if isinstance(kind, str):
+                by_kind.setdefault(kind, []).append(doc)
+
+        return cls(
+            checked=tuple(checked),
+            by_kind={key: tuple(value) for key, value in by_kind.items()},
+            by_path={key: tuple(value) for key, value in by_path.items()},
+            by_template_dir={key: tuple(value) for key, value in by_template_dir.items()},
+            positions=positions,
+        )
+
+    def of_kind(self, kind: str) -> Tuple[YamlDocument, ...]:
+        return self.by_kind.get(kind, ())
+
+    def of_kinds(self, kinds: Iterable[str]) -> List[YamlDocument]:
+        groups = [self.by_kind[kind] for kind in set(kinds) if kind in self.by_kind]
+        if len(groups) == 1:
+            return list(groups[0])
+        return list(heapq.merge(*groups, key=lambda doc: self.positions[id(doc)]))
+
+
 @dataclass(frozen=True)
 class ScanContext:
     skill_path: Path
     references_dir: Path
     scanned_paths: List[Path]
-    file_texts: Dict[Path, str]
+    file_texts: Mapping[Path, str]
     yaml_documents: List[YamlDocument]
 
+    @cached_property
+    def document_index(self) -> DocumentIndex:
+        """Built on first use so contexts that no rule inspects never pay for it."""
+        return DocumentIndex.build(self.yaml_documents)
+
     @property
     def markdown_paths(self) -> List[Path]:
         """Backward-compatible alias for pre-refactor callers."""
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Streaming report writers (text, JSON, SARIF, GitHub annotations) for consistency checks."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, TextIO
+
+from check_consistency_models import Violation
+
+
+OUTPUT_FORMATS = ("text", "json", "sarif", "github")
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_TOOL_NAME = "docker-to-sealos-check-consistency"
+# R000 is reported by the parser, not by a registry rule.
+PARSE_RULE_ID = "R000"
+PARSE_RULE_DESCRIPTION = "YAML snippets and artifacts must parse."
+SARIF_RESULTS_PLACEHOLDER = '"results": []'
+
+
+def display_path(path: Path, base: Path) -> str:
+    """Path relative to base when it lies below it (as CI annotators expect), else as given."""
+    try:
+        return path.resolve().relative_to(base.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def format_violation(violation: Violation) -> str:
+    return f"[{violation.rule_id}/{violation.severity}] {violation.path}:{violation.line}: {violation.message}"
+
+
+def format_text_line(violation: Violation) -> str:
+    return f"- {format_violation(violation)}"
+
+
+def violation_record(violation: Violation, base: Path) -> Dict[str, Any]:
+    return {
+        "rule_id": violation.rule_id,
+        "severity": violation.severity,
+        "path": display_path(violation.path, base),
+        "line": violation.line,
+        "message": violation.message,
+    }
+
+
+def write_json(violations: Iterable[Violation], stream: TextIO, base: Path) -> int:
+    """Write a JSON array, one violation per line, as violations arrive; return the count."""
+    count = 0
+    stream.write("[")
+    for violation in violations:
+        stream.write(",\n  " if count else "\n  ")
+        stream.write(json.dumps(violation_record(violation, base), ensure_ascii=False))
+        stream.flush()
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
+def _sarif_result(violation: Violation, base: Path, rule_index: Mapping[str, int]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "ruleId": violation.rule_id,
+        "level": "warning" if violation.severity == "warning" else "error",
+        "message": {"text": violation.message},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": display_path(violation.path, base)},
+                    "region": {"startLine": max(1, violation.line)},
+                }
+            }
+        ],
+    }
+    if violation.rule_id in rule_index:
+        result["ruleIndex"] = rule_index[violation.rule_id]
+    return result
+
+
+def write_sarif(
+    violations: Iterable[Violation],
+    stream: TextIO,
+    base: Path,
+    rule_descriptions: Mapping[str, str],
+) -> int:
+    """Write a SARIF 2.1.0 log whose results array is streamed; return the result count."""
+    descriptions = {PARSE_RULE_ID: PARSE_RULE_DESCRIPTION, **rule_descriptions}
+    rule_ids = list(descriptions)
+    rule_index = {rule_id: index for index, rule_id in enumerate(rule_ids)}
+    log = {
+        "$schema": SARIF_SCHEMA,
+        "version": SARIF_VERSION,
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": SARIF_TOOL_NAME,
+                        "rules": [
+                            {"id": rule_id, "shortDescription": {"text": descriptions[rule_id]}}
+                            for rule_id in rule_ids
+                        ],
+                    }
+                },
+                "results": [],
+            }
+        ],
+    }
+    head, tail = json.dumps(log, ensure_ascii=False).rsplit(SARIF_RESULTS_PLACEHOLDER, 1)
+
+    count = 0
+    stream.write(head)
+    stream.write('"results": [')
+    for violation in violations:
+        if count:
+            stream.write(",")
+        stream.write("\n")
+        stream.write(json.dumps(_sarif_result(violation, base, rule_index), ensure_ascii=False))
+        stream.flush()
+        count += 1
+    stream.write("\n]" if count else "]")
+    stream.write(tail)
+    stream.write("\n")
+    return count
+
+
+def _escape_github_data(text: str) -> str:
+    return text.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _escape_github_property(text: str) -> str:
+    return _escape_github_data(text).replace(":", "%3A").replace(",", "%2C")
+
+
+def write_github(violations: Iterable[Violation], stream: TextIO, base: Path) -> int:
+    """Write GitHub Actions workflow commands (::error/::warning), one per violation; return the count."""
+    count = 0
+    for violation in violations:
+        level = "warning" if violation.severity == "warning" else "error"
+        properties = ",".join(
+            [
+                f"file={_escape_github_property(display_path(violation.path, base))}",
+                f"line={violation.line}",
+                f"title={_escape_github_property(violation.rule_id)}",
+            ]
+        )
+        stream.write(f"::{level} {properties}::{_escape_github_data(violation.message)}\n")
+        stream.flush()
+        count += 1
+    return count
@@ -3,17 +3,30 @@
 
 from __future__ import annotations
 
+import mmap
+import os
 import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Collection, Deque, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
 
 import yaml
 
-from check_consistency_line_locator import LineLocator
-from check_consistency_models import NEGATIVE_MARKERS, ScanContext, Violation, YamlBlock, YamlDocument
+from check_consistency_cache import content_hasher, content_key, open_cache
+from check_consistency_changes import select_changed_scan_paths
+from check_consistency_line_locator import LineLocator, SourceLines, build_node_line_map
+from check_consistency_models import NEGATIVE_MARKERS, NodePath, ScanContext, Violation, YamlBlock, YamlDocument
+from yaml_support import LOADER_NAME, safe_load_with_node
 
 
 SUPPORTED_SCAN_SUFFIXES = {".md", ".yaml", ".yml"}
+# Bump whenever parse output changes so stale cache entries are never reused.
+PARSER_VERSION = 2
+# Below this many files to parse, process start-up costs more than it saves.
+PARALLEL_PARSE_MIN_FILES = 32
+READ_CHUNK_SIZE = 1 << 20
 
 
 def iter_markdown_files(root: Path) -> Iterable[Path]:
@@ -38,14 +51,58 @@ def iter_supported_files(root: Path) -> Iterable[Path]:
         yield path
 
 
+def read_text_mapped(path: Path) -> str:
+    """Read a UTF-8 file through mmap, normalising newlines like Path.read_text()."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                text = str(view, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class MappedFileTexts(Mapping[Path, str]):
+    """Read-only path -> text view over scanned files.
+
+    A file is read on its first lookup and its text cached for the life of the view (one
+    ScanContext), so every rule sees the same text and only files some rule asks for are held.
+    """
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self._paths: Tuple[Path, ...] = tuple(dict.fromkeys(paths))
+        self._members: FrozenSet[Path] = frozenset(self._paths)
+        self._texts: Dict[Path, str] = {}
+
+    def __getitem__(self, path: Path) -> str:
+        text = self._texts.get(path)
+        if text is None:
+            if path not in self._members:
+                raise KeyError(path)
+            text = self._texts[path] = read_text_mapped(path)
+        return text
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._members
+
+
 def has_negative_markers(text: str) -> bool:
     lowered = text.lower()
     return any(marker in lowered for marker in NEGATIVE_MARKERS)
 
 
-def extract_yaml_blocks(path: Path, text: str) -> List[YamlBlock]:
-    lines = text.splitlines()
-    blocks: List[YamlBlock] = []
+def iter_yaml_blocks(path: Path, lines: Iterable[str]) -> Iterator[YamlBlock]:
+    """Yield fenced yaml/yml blocks from Markdown lines (without terminators) as they are read."""
+    # The fence line and the three lines above it decide whether a block is a negative example.
+    window: Deque[str] = deque(maxlen=4)
 
     in_block = False
     block_start = 0
@@ -53,6 +110,7 @@ def extract_yaml_blocks(path: Path, text: str) -> List[YamlBlock]:
     block_skip_checks = False
 
     for index, line in enumerate(lines, start=1):
+        window.append(line)
         stripped = line.strip()
 
         if not in_block:
@@ -62,17 +120,14 @@ def extract_yaml_blocks(path: Path, text: str) -> List[YamlBlock]:
                     in_block = True
                     block_start = index + 1
                     collected = []
-                    context_lines = lines[max(0, index - 4): index]
-                    block_skip_checks = has_negative_markers("\n".join(context_lines))
+                    block_skip_checks = has_negative_markers("\n".join(window))
             continue
 
         if stripped.startswith("```"):
             source = "\n".join(collected).strip("\n")
             if source:
                 skip_checks = block_skip_checks or has_negative_markers(source)
-                blocks.append(
-                    YamlBlock(path=path, start_line=block_start, source=source, skip_checks=skip_checks)
-                )
+                yield YamlBlock(path=path, start_line=block_start, source=source, skip_checks=skip_checks)
             in_block = False
             block_start = 0
             collected = []
@@ -81,7 +136,21 @@ def extract_yaml_blocks(path: Path, text: str) -> List[YamlBlock]:
 
         collected.append(line)
 
-    return blocks
+
+def extract_yaml_blocks(path: Path, text: str) -> List[YamlBlock]:
+    return list(iter_yaml_blocks(path, text.splitlines()))
+
+
+def iter_file_lines(handle: TextIO, digest: Optional[Any] = None) -> Iterator[str]:
+    """Yield lines split exactly like str.splitlines() on the whole text, one read line at a time.
+
+    When digest is given, the text read so far is fed to it so the file can be content-keyed
+    without holding it in memory.
+    """
+    for raw in handle:
+        if digest is not None:
+            digest.update(raw.encode("utf-8"))
+        yield from raw.splitlines()
 
 
 def split_yaml_documents(block: YamlBlock) -> List[Tuple[int, str]]:
@@ -122,55 +191,167 @@ def should_ignore_yaml_parse_error(doc_text: str) -> bool:
     return any(line.startswith(template_prefix) for line in lines for template_prefix in template_control_prefixes)
 
 
+@dataclass(frozen=True)
+class ParsedDocumentPayload:
+    start_line: int
+    source: str
+    data: Any
+    skip_checks: bool
+    # Data path (see format_node_path) -> absolute line, from the composed node tree.
+    node_lines: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FileParseResult:
+    """Path-independent parse output of one scanned file, suitable for caching."""
+
+    documents: Tuple[ParsedDocumentPayload, ...]
+    violations: Tuple[Tuple[str, int, str], ...]
+
+
+def _parse_block(block: YamlBlock) -> Tuple[List[ParsedDocumentPayload], List[Tuple[str, int, str]]]:
+    documents: List[ParsedDocumentPayload] = []
+    violations: List[Tuple[str, int, str]] = []
+
+    for start_line, doc_text in split_yaml_documents(block):
+        try:
+            parsed, node = safe_load_with_node(doc_text)
+        except yaml.YAMLError as exc:
+            if block.skip_checks or should_ignore_yaml_parse_error(doc_text):
+                continue
+            line = start_line
+            mark = getattr(exc, "problem_mark", None)
+            if mark is not None:
+                line += int(mark.line)
+            violations.append(("R000", line, f"invalid YAML snippet: {exc.__class__.__name__}"))
+            continue
+
+        if parsed is None:
+            continue
+
+        documents.append(
+            ParsedDocumentPayload(
+                start_line=start_line,
+                source=doc_text,
+                data=parsed,
+                skip_checks=block.skip_checks,
+                node_lines=build_node_line_map(node, start_line),
+            )
+        )
+
+    return documents, violations
+
+
+def _materialize_document(path: Path, payload: ParsedDocumentPayload) -> YamlDocument:
+    return YamlDocument(
+        path=path,
+        start_line=payload.start_line,
+        source=payload.source,
+        data=payload.data,
+        skip_checks=payload.skip_checks,
+        line_locator=LineLocator(
+            start_line=payload.start_line,
+            lines=SourceLines(payload.source),
+            node_lines=payload.node_lines,
+        ),
+    )
+
+
 def parse_yaml_documents(blocks: Sequence[YamlBlock]) -> Tuple[List[YamlDocument], List[Violation]]:
     documents: List[YamlDocument] = []
     violations: List[Violation] = []
 
     for block in blocks:
-        for start_line, doc_text in split_yaml_documents(block):
-            try:
-                parsed = yaml.safe_load(doc_text)
-            except yaml.YAMLError as exc:
-                if block.skip_checks or should_ignore_yaml_parse_error(doc_text):
-                    continue
-                line = start_line
-                mark = getattr(exc, "problem_mark", None)
-                if mark is not None:
-                    line += int(mark.line)
-                violations.append(
-                    Violation(
-                        rule_id="R000",
-                        path=block.path,
-                        line=line,
-                        message=f"invalid YAML snippet: {exc.__class__.__name__}",
-                    )
-                )
-                continue
+        block_documents, block_violations = _parse_block(block)
+        documents.extend(_materialize_document(block.path, payload) for payload in block_documents)
+        violations.extend(
+            Violation(rule_id=rule_id, path=block.path, line=line, message=message)
+            for rule_id, line, message in block_violations
+        )
 
-            if parsed is None:
-                continue
+    return documents, violations
+
+
+def extract_file_blocks(path: Path, text: str) -> List[YamlBlock]:
+    if path.suffix.lower() == ".md":
+        return extract_yaml_blocks(path, text)
+    return [YamlBlock(path=path, start_line=1, source=text, skip_checks=False)]
+
+
+def _parse_blocks(blocks: Iterable[YamlBlock]) -> FileParseResult:
+    documents: List[ParsedDocumentPayload] = []
+    violations: List[Tuple[str, int, str]] = []
+    for block in blocks:
+        block_documents, block_violations = _parse_block(block)
+        documents.extend(block_documents)
+        violations.extend(block_violations)
+    return FileParseResult(documents=tuple(documents), violations=tuple(violations))
+
+
+def parse_file(path: Path, text: str) -> FileParseResult:
+    return _parse_blocks(extract_file_blocks(path, text))
+
+
+def parse_path(path: Path) -> Tuple[FileParseResult, str]:
+    """Read and parse one file, returning the result with its parse cache key.
+
+    Markdown is streamed line by line so only the YAML blocks are held in memory. The key is
+    computed from the same read, so a file edited mid-scan can never be cached under stale content.
+    """
+    digest = parse_cache_hasher(path)
+    if path.suffix.lower() == ".md":
+        with path.open(encoding="utf-8") as handle:
+            result = _parse_blocks(iter_yaml_blocks(path, iter_file_lines(handle, digest)))
+    else:
+        text = path.read_text(encoding="utf-8")
+        digest.update(text.encode("utf-8"))
+        result = _parse_blocks(extract_file_blocks(path, text))
+    return result, digest.hexdigest()
 
-            documents.append(
-                YamlDocument(
-                    path=block.path,
-                    start_line=start_line,
-                    source=doc_text,
-                    data=parsed,
-                    skip_checks=block.skip_checks,
-                    line_locator=LineLocator(
-                        start_line=start_line,
-                        lines=tuple(doc_text.splitlines()),
-                    ),
-                )
-            )
 
+def materialize_parse_result(path: Path, result: FileParseResult) -> Tuple[List[YamlDocument], List[Violation]]:
+    documents = [_materialize_document(path, payload) for payload in result.documents]
+    violations = [
+        Violation(rule_id=rule_id, path=path, line=line, message=message)
+        for rule_id, line, message in result.violations
+    ]
     return documents, violations
 
 
+def _parse_cache_salt(path: Path) -> Tuple[str, ...]:
+    file_kind = "markdown" if path.suffix.lower() == ".md" else "yaml"
+    return (file_kind, f"parser-{PARSER_VERSION}", f"pyyaml-{yaml.__version__}", LOADER_NAME)
+
+
+def parse_cache_key(path: Path, text: str) -> str:
+    return content_key("parse", text, salt=_parse_cache_salt(path))
+
+
+def parse_cache_hasher(path: Path) -> Any:
+    return content_hasher("parse", salt=_parse_cache_salt(path))
+
+
+def file_parse_cache_key(path: Path) -> str:
+    """parse_cache_key for a file on disk, hashed in chunks instead of read whole."""
+    digest = parse_cache_hasher(path)
+    with path.open(encoding="utf-8") as handle:
+        for chunk in iter(lambda: handle.read(READ_CHUNK_SIZE), ""):
+            digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
 def find_line(doc: YamlDocument, pattern: str, default: Optional[int] = None) -> int:
     return doc.line_locator.find(pattern, default=default)
 
 
+def find_node_line(doc: YamlDocument, node_path: NodePath, default: Optional[int] = None) -> int:
+    """Line of the node at node_path, or of its nearest existing ancestor."""
+    line = doc.line_locator.nearest_line(node_path)
+    if line is not None:
+        return line
+    return default if default is not None else doc.start_line
+
+
 def resolve_path(value: str, base: Path) -> Path:
     path = Path(value)
     if path.is_absolute():
@@ -205,32 +386,112 @@ def build_scan_paths(skill_path: Path, references_dir: Path, include_paths: Sequ
     return unique
 
 
-def build_context(skill_path: Path, references_dir: Path, include_paths: Sequence[str]) -> Tuple[ScanContext, List[Violation]]:
+def resolve_parse_workers(parse_workers: Optional[int], pending_files: int) -> int:
+    if pending_files <= 1:
+        return 1
+    if parse_workers is None:
+        if pending_files < PARALLEL_PARSE_MIN_FILES:
+            return 1
+        parse_workers = os.cpu_count() or 1
+    return max(1, min(parse_workers, pending_files))
+
+
+def _timed_parse_path(path: Path) -> Tuple[FileParseResult, str, float]:
+    started = time.perf_counter()
+    result, key = parse_path(path)
+    return result, key, time.perf_counter() - started
+
+
+def parse_paths(
+    paths: Sequence[Path],
+    parse_workers: Optional[int] = None,
+    timings: Optional[List[float]] = None,
+) -> List[Tuple[FileParseResult, str]]:
+    """Parse files in input order, fanning out to a process pool when worthwhile.
+
+    Returns (result, parse cache key) pairs. When timings is given it receives each
+    file's parse time in seconds, in input order.
+    """
+    workers = resolve_parse_workers(parse_workers, len(paths))
+    timed: Optional[List[Tuple[FileParseResult, str, float]]] = None
+    if workers > 1:
+        # Imported here so serial parses (small scans, --jobs 1) skip loading the pool machinery.
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        chunksize = max(1, len(paths) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                timed = list(executor.map(_timed_parse_path, paths, chunksize=chunksize))
+        except (OSError, BrokenProcessPool):
+            # Sandboxes without working multiprocessing still get a correct serial parse.
+            timed = None
+    if timed is None:
+        timed = [_timed_parse_path(path) for path in paths]
+    if timings is not None:
+        timings.extend(seconds for _, _, seconds in timed)
+    return [(result, key) for result, key, _ in timed]
+
+
+def build_context(
+    skill_path: Path,
+    references_dir: Path,
+    include_paths: Sequence[str],
+    cache_dir: Optional[Path] = None,
+    parse_workers: Optional[int] = None,
+    changed_files: Optional[Collection[Path]] = None,
+    parse_timings: Optional[Dict[Path, float]] = None,
+) -> Tuple[ScanContext, List[Violation]]:
+    """Read, parse and materialize every scan path into a ScanContext.
+
+    File texts are not kept: ScanContext.file_texts reads each one back on first use. When
+    parse_timings is given it receives per-file seconds spent hashing, loading from cache
+    or parsing, and materializing documents.
+    """
     scan_paths = build_scan_paths(skill_path, references_dir, include_paths)
-    file_texts: Dict[Path, str] = {}
-    blocks: List[YamlBlock] = []
+    if changed_files is not None:
+        scan_paths = select_changed_scan_paths(scan_paths, changed_files)
+    cache = open_cache(cache_dir)
+    results: Dict[Path, FileParseResult] = {}
+    pending: List[Path] = []
 
+    elapsed: Dict[Path, float] = {}
     for path in scan_paths:
-        text = path.read_text(encoding="utf-8")
-        file_texts[path] = text
-        if path.suffix.lower() == ".md":
-            blocks.extend(extract_yaml_blocks(path, text))
-            continue
-        blocks.append(
-            YamlBlock(
-                path=path,
-                start_line=1,
-                source=text,
-                skip_checks=False,
-            )
-        )
+        started = time.perf_counter()
+        if cache is not None:
+            cached = cache.load(file_parse_cache_key(path))
+            if isinstance(cached, FileParseResult):
+                results[path] = cached
+                elapsed[path] = time.perf_counter() - started
+                continue
+        pending.append(path)
+        elapsed[path] = time.perf_counter() - started
+
+    parse_seconds: List[float] = []
+    parsed = parse_paths(pending, parse_workers=parse_workers, timings=parse_seconds)
+    for path, (result, key), seconds in zip(pending, parsed, parse_seconds):
+        results[path] = result
+        elapsed[path] += seconds
+        if cache is not None:
+            cache.store(key, result)
+
+    yaml_documents: List[YamlDocument] = []
+    parse_violations: List[Violation] = []
+    for path in scan_paths:
+        started = time.perf_counter()
+        documents, violations = materialize_parse_result(path, results[path])
+        yaml_documents.extend(documents)
+        parse_violations.extend(violations)
+        elapsed[path] += time.perf_counter() - started
+
+    if parse_timings is not None:
+        parse_timings.update(elapsed)
 
-    yaml_documents, parse_violations = parse_yaml_documents(blocks)
     context = ScanContext(
         skill_path=skill_path,
         references_dir=references_dir,
         scanned_paths=scan_paths,
-        file_texts=file_texts,
+        file_texts=MappedFileTexts(scan_paths),
         yaml_documents=yaml_documents,
     )
     return context, parse_violations
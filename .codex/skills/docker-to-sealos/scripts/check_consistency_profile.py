@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Per-rule and per-file profiling for consistency checks."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from check_consistency_models import DocumentIndex, Rule, ScanContext, Violation, YamlDocument
+
+
+@dataclass(frozen=True)
+class RuleTiming:
+    rule_id: str
+    seconds: float
+    documents_visited: int
+    violations: int
+    skipped: bool = False  # not run: none of the rule's registry inputs occur in the scan
+
+
+@dataclass(frozen=True)
+class FileTiming:
+    path: str
+    seconds: float
+
+
+@dataclass
+class ProfileReport:
+    """Filled in by run_checks(profile=...); rules and files are kept in execution order."""
+
+    rules: List[RuleTiming] = field(default_factory=list)
+    files: List[FileTiming] = field(default_factory=list)
+
+    def sorted_rules(self) -> List[RuleTiming]:
+        return sorted(self.rules, key=lambda item: (-item.seconds, item.rule_id))
+
+    def sorted_files(self) -> List[FileTiming]:
+        return sorted(self.files, key=lambda item: (-item.seconds, item.path))
+
+    def to_json(self) -> str:
+        payload = {
+            "rules": [asdict(item) for item in self.sorted_rules()],
+            "files": [asdict(item) for item in self.sorted_files()],
+            "totals": {
+                "rule_seconds": sum(item.seconds for item in self.rules),
+                "parse_seconds": sum(item.seconds for item in self.files),
+                "files": len(self.files),
+            },
+        }
+        return json.dumps(payload, indent=2) + "\n"
+
+    def format_table(self, max_files: int = 10) -> str:
+        lines = [f"{'rule':<8} {'ms':>10} {'docs':>8} {'violations':>10}"]
+        for item in self.sorted_rules():
+            if item.skipped:
+                lines.append(f"{item.rule_id:<8} {'skipped':>10} {'-':>8} {'-':>10}")
+                continue
+            lines.append(
+                f"{item.rule_id:<8} {item.seconds * 1000:>10.2f} {item.documents_visited:>8} {item.violations:>10}"
+            )
+        lines.append(f"{'total':<8} {sum(item.seconds for item in self.rules) * 1000:>10.2f}")
+        lines.append("")
+        lines.append(f"parse: {len(self.files)} file(s), {sum(item.seconds for item in self.files) * 1000:.2f} ms")
+        for item in self.sorted_files()[:max_files]:
+            lines.append(f"  {item.seconds * 1000:>10.2f} ms  {item.path}")
+        return "\n".join(lines) + "\n"
+
+
+class _VisitCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+
+class _CountingDocuments(list):
+    """List of documents that counts every document handed out during iteration."""
+
+    def __init__(self, documents: Iterable[YamlDocument], counter: _VisitCounter) -> None:
+        super().__init__(documents)
+        self._counter = counter
+
+    def __iter__(self) -> Iterator[YamlDocument]:
+        for doc in super().__iter__():
+            self._counter.count += 1
+            yield doc
+
+
+class _CountingTuple(tuple):
+    def __new__(cls, documents: Iterable[YamlDocument], counter: _VisitCounter) -> "_CountingTuple":
+        instance = super().__new__(cls, documents)
+        instance._counter = counter
+        return instance
+
+    def __iter__(self) -> Iterator[YamlDocument]:
+        for doc in super().__iter__():
+            self._counter.count += 1
+            yield doc
+
+
+def _counting_groups(
+    groups: Mapping[object, Tuple[YamlDocument, ...]],
+    counter: _VisitCounter,
+) -> Dict[object, Tuple[YamlDocument, ...]]:
+    return {key: _CountingTuple(value, counter) for key, value in groups.items()}
+
+
+def counting_context(context: ScanContext, counter: _VisitCounter) -> ScanContext:
+    """Copy of context whose document lists count visits; parsed documents are shared, not copied."""
+    index = context.document_index
+    counted = replace(context, yaml_documents=_CountingDocuments(context.yaml_documents, counter))
+    # document_index is a cached_property; seed it so rules iterate counting groups.
+    counted.__dict__["document_index"] = DocumentIndex(
+        checked=_CountingTuple(index.checked, counter),
+        by_kind=_counting_groups(index.by_kind, counter),
+        by_path=_counting_groups(index.by_path, counter),
+        by_template_dir=_counting_groups(index.by_template_dir, counter),
+        positions=index.positions,
+    )
+    return counted
+
+
+def profile_rules(
+    context: ScanContext,
+    rules: Mapping[str, Rule],
+    selected_rules: Sequence[str],
+    applicable: Optional[Collection[str]] = None,
+) -> Tuple[Dict[str, List[Violation]], List[RuleTiming]]:
+    """Run each selected rule on its own, serially, recording time, visits and output size.
+
+    Visitor rules run standalone here rather than sharing one walk, so their timings
+    reflect each rule's own cost. When applicable is given (RuleEngine.applicable_rules),
+    the other selected rules are not run and are recorded as skipped.
+    """
+    counter = _VisitCounter()
+    counted = counting_context(context, counter)
+    produced: Dict[str, List[Violation]] = {}
+    timings: List[RuleTiming] = []
+    for rule_id in selected_rules:
+        if applicable is not None and rule_id not in applicable:
+            timings.append(RuleTiming(rule_id, 0.0, 0, 0, skipped=True))
+            continue
+        counter.count = 0
+        started = time.perf_counter()
+        violations = list(rules[rule_id].check(counted))
+        seconds = time.perf_counter() - started
+        produced[rule_id] = violations
+        timings.append(RuleTiming(rule_id, seconds, counter.count, len(violations)))
+    return produced, timings
+
+
+def load_rule_costs(path: Path) -> Dict[str, float]:
+    """Per-rule seconds from a ProfileReport.to_json() file (--profile-json output); skipped rules have none."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ValueError(f"cannot read rule costs from {path}: {exc}") from exc
+    rules = payload.get("rules") if isinstance(payload, dict) else None
+    if not isinstance(rules, list):
+        raise ValueError(f"invalid rule costs file (expected a --profile-json report): {path}")
+    costs: Dict[str, float] = {}
+    for item in rules:
+        rule_id = item.get("rule_id") if isinstance(item, dict) else None
+        seconds = item.get("seconds") if isinstance(item, dict) else None
+        if not isinstance(rule_id, str) or not isinstance(seconds, (int, float)):
+            raise ValueError(f"invalid rule timing in {path}: {item!r}")
+        if not item.get("skipped", False):
+            costs[rule_id] = float(seconds)
+    return costs
+
+
+def file_timings(parse_timings: Mapping[Path, float]) -> List[FileTiming]:
+    return [FileTiming(str(path), seconds) for path, seconds in parse_timings.items()]
@@ -4,11 +4,16 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
-import yaml
-
-from check_consistency_models import ALLOWED_SEVERITIES, DEFAULT_SEVERITY, RegistryConfig, RegistryRuleConfig
+from check_consistency_cache import ContentCache, load_yaml_file
+from check_consistency_models import (
+    ALLOWED_SEVERITIES,
+    DEFAULT_SEVERITY,
+    RegistryConfig,
+    RegistryRuleConfig,
+    RuleInputs,
+)
 
 
 def _parse_global_include_paths(data: Mapping[str, Any]) -> List[str]:
@@ -37,6 +42,24 @@ def _parse_rule_scope(rule_entry: Mapping[str, Any]) -> List[str]:
     return include_paths
 
 
+def _parse_rule_inputs(rule_entry: Mapping[str, Any]) -> RuleInputs:
+    inputs = rule_entry.get("inputs")
+    if inputs is None:
+        return RuleInputs()
+    if not isinstance(inputs, dict):
+        raise ValueError(f"rule inputs must be an object: {rule_entry!r}")
+    unknown = sorted(set(inputs) - {"kinds", "file_texts"})
+    if unknown:
+        raise ValueError(f"unknown rule inputs field(s) {', '.join(unknown)}: {rule_entry!r}")
+    kinds = inputs.get("kinds", [])
+    if not isinstance(kinds, list) or not all(isinstance(x, str) and x for x in kinds):
+        raise ValueError(f"rule inputs.kinds must be a list of kind names: {rule_entry!r}")
+    file_texts = inputs.get("file_texts", False)
+    if not isinstance(file_texts, bool):
+        raise ValueError(f"rule inputs.file_texts must be a boolean: {rule_entry!r}")
+    return RuleInputs(kinds=tuple(dict.fromkeys(kinds)), file_texts=file_texts)
+
+
 def _parse_rule_config(item: Mapping[str, Any]) -> RegistryRuleConfig:
     rule_id = item.get("id")
     description = item.get("description")
@@ -53,11 +76,12 @@ def _parse_rule_config(item: Mapping[str, Any]) -> RegistryRuleConfig:
         description=description,
         severity=severity,
         include_paths=_parse_rule_scope(item),
+        inputs=_parse_rule_inputs(item),
     )
 
 
-def load_registry_config(registry_path: Path) -> RegistryConfig:
-    data = yaml.safe_load(registry_path.read_text(encoding="utf-8"))
+def load_registry_config(registry_path: Path, cache: Optional[ContentCache] = None) -> RegistryConfig:
+    data = load_yaml_file(registry_path, cache)
     if not isinstance(data, dict):
         raise ValueError(f"invalid rules registry format: {registry_path}")
 
@@ -83,8 +107,12 @@ def load_registry_config(registry_path: Path) -> RegistryConfig:
     )
 
 
-def validate_registry(registry_path: Path, implemented_rule_ids: Iterable[str]) -> RegistryConfig:
-    config = load_registry_config(registry_path)
+def validate_registry(
+    registry_path: Path,
+    implemented_rule_ids: Iterable[str],
+    cache: Optional[ContentCache] = None,
+) -> RegistryConfig:
+    config = load_registry_config(registry_path, cache)
     registry_ids = set(config.ordered_rule_ids)
     implemented_ids = set(implemented_rule_ids)
 
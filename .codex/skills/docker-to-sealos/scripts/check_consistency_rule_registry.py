@@ -3,26 +3,91 @@
 
 from __future__ import annotations
 
-from typing import Dict, Mapping
+import importlib.util
+import re
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
 
 from check_consistency_models import Rule
-from check_consistency_rules_app import APP_RULES
-from check_consistency_rules_security import SECURITY_RULES
-from check_consistency_rules_storage import STORAGE_RULES
 
 
-def _merge_rule_sets(*rule_sets: Mapping[str, Rule]) -> Dict[str, Rule]:
-    merged: Dict[str, Rule] = {}
-    for rule_set in rule_sets:
-        for rule_id, rule in rule_set.items():
-            if rule_id in merged:
-                raise ValueError(f"duplicate rule id: {rule_id}")
-            merged[rule_id] = rule
-    return merged
+# (module, rule-set attribute) per rule module. The rule ids come from the modules themselves.
+RULE_MODULES: Sequence[Tuple[str, str]] = (
+    ("check_consistency_rules_app", "APP_RULES"),
+    ("check_consistency_rules_storage", "STORAGE_RULES"),
+    ("check_consistency_rules_security", "SECURITY_RULES"),
+)
+RULE_SET_KEY_RE = re.compile(r'^\s+"(R\d+)":', re.MULTILINE)
 
 
-REGISTERED_RULES: Dict[str, Rule] = _merge_rule_sets(
-    APP_RULES,
-    STORAGE_RULES,
-    SECURITY_RULES,
-)
+def scan_rule_ids(module_name: str, attribute: str) -> Tuple[str, ...]:
+    """Rule ids keyed in the module's `attribute = {...}` literal, read from source without importing it.
+
+    Reading the source is far cheaper than importing (or ast-parsing) a rule module, so the
+    registry can answer keys() and route lookups up front; modules without readable source
+    are imported instead.
+    """
+    spec = importlib.util.find_spec(module_name)
+    source = spec.loader.get_source(module_name) if spec is not None and spec.loader is not None else None
+    if source is None:
+        return tuple(getattr(__import__(module_name, fromlist=[attribute]), attribute))
+    block = re.search(rf"^{re.escape(attribute)}\b[^\n]*=\s*\{{\n(.*?)^\}}", source, re.MULTILINE | re.DOTALL)
+    if block is None:
+        raise ValueError(f"{module_name} does not define {attribute} as a dict literal")
+    return tuple(RULE_SET_KEY_RE.findall(block.group(1)))
+
+
+class LazyRuleRegistry(Mapping[str, Rule]):
+    """Rule id -> Rule mapping that imports a rule module the first time one of its ids is looked up."""
+
+    def __init__(self, modules: Sequence[Tuple[str, str]]) -> None:
+        self._modules = tuple(modules)
+        self._module_of: Dict[str, int] = {}
+        self._rule_ids: List[Tuple[str, ...]] = []
+        for position, (module_name, attribute) in enumerate(self._modules):
+            rule_ids = scan_rule_ids(module_name, attribute)
+            self._rule_ids.append(rule_ids)
+            for rule_id in rule_ids:
+                if rule_id in self._module_of:
+                    raise ValueError(f"duplicate rule id: {rule_id}")
+                self._module_of[rule_id] = position
+        self._loaded: List[bool] = [False] * len(self._modules)
+        self._rules: Dict[str, Rule] = {}
+
+    def __getitem__(self, rule_id: str) -> Rule:
+        rule = self._rules.get(rule_id)
+        if rule is None:
+            if rule_id not in self._module_of:
+                raise KeyError(rule_id)
+            self._load(self._module_of[rule_id])
+            rule = self._rules[rule_id]
+        return rule
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._module_of)
+
+    def __len__(self) -> int:
+        return len(self._module_of)
+
+    def __contains__(self, rule_id: object) -> bool:
+        return rule_id in self._module_of
+
+    def loaded_modules(self) -> list[str]:
+        return [name for (name, _), loaded in zip(self._modules, self._loaded) if loaded]
+
+    def _load(self, position: int) -> None:
+        module_name, attribute = self._modules[position]
+        # -X importtime only times imports that go through the C import machinery (__import__);
+        # importlib.import_module loads through importlib._bootstrap and, on CPython 3.11, is not
+        # listed, which would hide the rule module from benchmark_check_consistency.py --startup.
+        rule_set: Mapping[str, Rule] = getattr(__import__(module_name, fromlist=[attribute]), attribute)
+        scanned = self._rule_ids[position]
+        if set(rule_set) != set(scanned):
+            raise ValueError(
+                f"{module_name}.{attribute} defines {', '.join(rule_set)} "
+                f"but its source lists {', '.join(scanned)}"
+            )
+        self._rules.update(rule_set)
+        self._loaded[position] = True
+
+
+REGISTERED_RULES = LazyRuleRegistry(RULE_MODULES)
@@ -5,20 +5,34 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
-
-from check_consistency_models import LATEST_IMAGE_PATTERN, TEMPLATE_NAME_PATTERN, Rule, ScanContext, Violation
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from check_consistency_models import (
+    LATEST_IMAGE_PATTERN,
+    TEMPLATE_NAME_PATTERN,
+    LazyPattern,
+    NodePath,
+    Rule,
+    ScanContext,
+    Violation,
+    YamlDocument,
+)
 from check_consistency_helpers_violations import (
     add_doc_violation,
     check_managed_workload_setting,
 )
 from check_consistency_helpers_workload import (
+    TEMPLATE_SPEC_PATH,
     get_template_spec,
     has_managed_workload_marker,
     is_app_workload_document,
+    iter_container_nodes,
     iter_containers,
+    iter_app_workload_documents,
     iter_documents_by_kind,
-    iter_workload_secret_refs,
+    iter_index_artifact_documents,
+    iter_index_artifact_groups,
+    iter_workload_secret_ref_nodes,
 )
 
 
@@ -36,9 +50,9 @@ TEMPLATE_REQUIRED_SPEC_FIELDS = {
     "categories": list,
 }
 FLOATING_TAG_ALIASES = {"latest", "stable", "main", "master", "edge", "nightly", "dev"}
-FLOATING_NUMERIC_TAG_RE = re.compile(r"^v?\d+(?:\.\d+)?$")
-COMPOSE_VAR_IN_IMAGE_RE = re.compile(r"\$(?:\{[^}]+\}|[A-Za-z_][A-Za-z0-9_]*)")
-ZH_CHAR_RE = re.compile(r"[\u3400-\u4DBF\u4E00-\u9FFF]")
+FLOATING_NUMERIC_TAG_RE = LazyPattern(r"^v?\d+(?:\.\d+)?$")
+COMPOSE_VAR_IN_IMAGE_RE = LazyPattern(r"\$(?:\{[^}]+\}|[A-Za-z_][A-Za-z0-9_]*)")
+ZH_CHAR_RE = LazyPattern(r"[\u3400-\u4DBF\u4E00-\u9FFF]")
 ALLOWED_TEMPLATE_CATEGORIES = {
     "tool",
     "ai",
@@ -78,7 +92,7 @@ CRONJOB_REQUIRED_LABELS: Dict[str, str] = {
     "cronjob-launchpad-name": "",
     "cronjob-type": "image",
 }
-POSTGRES_URL_DATABASE_RE = re.compile(r"postgres(?:ql)?://[^/\s]+/([^?\s'\";]+)", re.IGNORECASE)
+POSTGRES_URL_DATABASE_RE = LazyPattern(r"postgres(?:ql)?://[^/\s]+/([^?\s'\";]+)", re.IGNORECASE)
 DEFAULT_POSTGRES_DATABASE_NAMES = {"postgres", "template0", "template1"}
 OFFICIAL_HEALTH_HTTP_EXPECTATIONS: Dict[str, Dict[str, str]] = {
     "goauthentik/server": {
@@ -124,9 +138,7 @@ def _extract_template_directory_name(path: Path) -> str:
 
 def check_no_latest_tags(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks:
-            continue
+    for doc in context.document_index.checked:
         for line_no, line in enumerate(doc.source.splitlines(), start=doc.start_line):
             if LATEST_IMAGE_PATTERN.search(line):
                 violations.append(
@@ -158,44 +170,44 @@ def _is_floating_tag(tag: str) -> bool:
     return FLOATING_NUMERIC_TAG_RE.fullmatch(normalized) is not None
 
 
+def _iter_workload_image_values(data: Dict[str, Any]) -> List[Tuple[NodePath, str]]:
+    """originImageName and container images of a workload, each with its node path."""
+    values: List[Tuple[NodePath, str]] = []
+    metadata = data.get("metadata")
+    annotations = metadata.get("annotations") if isinstance(metadata, dict) else None
+    origin_image = annotations.get("originImageName") if isinstance(annotations, dict) else None
+    if isinstance(origin_image, str) and origin_image.strip():
+        values.append((("metadata", "annotations", "originImageName"), origin_image.strip()))
+
+    template_spec = get_template_spec(data)
+    containers = template_spec.get("containers") if isinstance(template_spec, dict) else None
+    if isinstance(containers, list):
+        for index, container in enumerate(containers):
+            if not isinstance(container, dict):
+                continue
+            image = container.get("image")
+            if isinstance(image, str) and image.strip():
+                values.append(((*TEMPLATE_SPEC_PATH, "containers", index, "image"), image.strip()))
+    return values
+
+
 def check_no_floating_image_tags(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         if not has_managed_workload_marker(doc.data):
             continue
 
-        metadata = doc.data.get("metadata")
-        annotations = metadata.get("annotations") if isinstance(metadata, dict) else None
-        origin_image = annotations.get("originImageName") if isinstance(annotations, dict) else None
-        values: List[tuple[str, str]] = []
-        if isinstance(origin_image, str) and origin_image.strip():
-            values.append(("originImageName", origin_image.strip()))
+        values = _iter_workload_image_values(doc.data)
 
-        template_spec = get_template_spec(doc.data)
-        containers = template_spec.get("containers") if isinstance(template_spec, dict) else None
-        if isinstance(containers, list):
-            for container in containers:
-                if not isinstance(container, dict):
-                    continue
-                image = container.get("image")
-                if isinstance(image, str) and image.strip():
-                    values.append(("image", image.strip()))
-
-        for field_name, image_value in values:
+        for node_path, image_value in values:
             tag = _extract_image_tag(image_value)
             if tag is None or not _is_floating_tag(tag):
                 continue
-            pattern = r"originImageName" if field_name == "originImageName" else r"^\s*image\s*:"
             add_doc_violation(
                 violations,
                 rule_id="R016",
                 doc=doc,
-                pattern=pattern,
-                default_pattern=r"^\s*metadata\s*:" if field_name == "originImageName" else r"^\s*containers\s*:",
+                node_path=node_path,
                 message=(
                     f"floating image tag '{tag}' is not allowed; "
                     "use an explicit version tag (e.g. v2.2.0) or digest"
@@ -207,41 +219,20 @@ def check_no_floating_image_tags(context: ScanContext) -> List[Violation]:
 
 def check_no_compose_image_variables(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         if not has_managed_workload_marker(doc.data):
             continue
 
-        metadata = doc.data.get("metadata")
-        annotations = metadata.get("annotations") if isinstance(metadata, dict) else None
-        origin_image = annotations.get("originImageName") if isinstance(annotations, dict) else None
-        values: List[tuple[str, str]] = []
-        if isinstance(origin_image, str) and origin_image.strip():
-            values.append(("originImageName", origin_image.strip()))
+        values = _iter_workload_image_values(doc.data)
 
-        template_spec = get_template_spec(doc.data)
-        containers = template_spec.get("containers") if isinstance(template_spec, dict) else None
-        if isinstance(containers, list):
-            for container in containers:
-                if not isinstance(container, dict):
-                    continue
-                image = container.get("image")
-                if isinstance(image, str) and image.strip():
-                    values.append(("image", image.strip()))
-
-        for field_name, image_value in values:
+        for node_path, image_value in values:
             if COMPOSE_VAR_IN_IMAGE_RE.search(image_value) is None:
                 continue
-            pattern = r"originImageName" if field_name == "originImageName" else r"^\s*image\s*:"
             add_doc_violation(
                 violations,
                 rule_id="R018",
                 doc=doc,
-                pattern=pattern,
-                default_pattern=r"^\s*metadata\s*:" if field_name == "originImageName" else r"^\s*containers\s*:",
+                node_path=node_path,
                 message=(
                     "image references must be concrete and must not contain Compose-style variables; "
                     "resolve to explicit tag or digest before emitting template artifacts"
@@ -259,8 +250,7 @@ def check_app_no_spec_template(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R002",
                 doc=doc,
-                pattern=r"^\s*template\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", "template"),
                 message="App resource must not use spec.template",
             )
     return violations
@@ -277,8 +267,7 @@ def check_app_has_spec_data_url(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R003",
                 doc=doc,
-                pattern=r"^\s*data\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", "data"),
                 message="App resource must define spec.data.url",
             )
     return violations
@@ -295,7 +284,7 @@ def check_template_name_is_hardcoded_lowercase(context: ScanContext) -> List[Vio
                 violations,
                 rule_id="R004",
                 doc=doc,
-                pattern=r"^\s*metadata\s*:",
+                node_path=("metadata",),
                 message="Template metadata.name must be a hardcoded lowercase string",
             )
             continue
@@ -305,7 +294,7 @@ def check_template_name_is_hardcoded_lowercase(context: ScanContext) -> List[Vio
                 violations,
                 rule_id="R004",
                 doc=doc,
-                pattern=r"^\s*name\s*:",
+                node_path=("metadata", "name"),
                 message="Template metadata.name must be hardcoded lowercase and must not use variables",
             )
 
@@ -321,7 +310,7 @@ def check_template_required_metadata_fields(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R012",
                 doc=doc,
-                pattern=r"^\s*spec\s*:",
+                node_path=("spec",),
                 message="Template must define spec with required metadata fields",
             )
             continue
@@ -333,8 +322,7 @@ def check_template_required_metadata_fields(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R012",
                 doc=doc,
-                pattern=rf"^\s*{re.escape(field)}\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", field),
                 message=f"Template spec.{field} must be defined and non-empty",
             )
     return violations
@@ -359,8 +347,7 @@ def check_template_folder_matches_name(context: ScanContext) -> List[Violation]:
             violations,
             rule_id="R013",
             doc=doc,
-            pattern=r"^\s*name\s*:",
-            default_pattern=r"^\s*metadata\s*:",
+            node_path=("metadata", "name"),
             message=f"Template folder name '{expected_name}' must match metadata.name '{actual_name}'",
         )
     return violations
@@ -385,8 +372,7 @@ def check_template_icon_paths(context: ScanContext) -> List[Violation]:
                     violations,
                     rule_id="R014",
                     doc=doc,
-                    pattern=r"^\s*icon\s*:",
-                    default_pattern=r"^\s*spec\s*:",
+                    node_path=("spec", "icon"),
                     message="Template spec.icon must point to raw.githubusercontent.com/.../kb-0.9/template/<app-name>/logo.<ext>",
                 )
     return violations
@@ -410,8 +396,7 @@ def check_template_readme_paths(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R025",
                 doc=doc,
-                pattern=r"^\s*readme\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", "readme"),
                 message=f"Template spec.readme must be '{expected_readme}'",
             )
 
@@ -423,8 +408,7 @@ def check_template_readme_paths(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R025",
                 doc=doc,
-                pattern=r"^\s*i18n\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", "i18n"),
                 message=f"Template spec.i18n.zh.readme must be '{expected_zh_readme}'",
             )
 
@@ -446,8 +430,7 @@ def check_template_i18n_zh_description_chinese(context: ScanContext) -> List[Vio
             violations,
             rule_id="R021",
             doc=doc,
-            pattern=r"^\s*i18n\s*:",
-            default_pattern=r"^\s*spec\s*:",
+            node_path=("spec", "i18n"),
             message="Template spec.i18n.zh.description must be provided in Simplified Chinese",
         )
     return violations
@@ -468,8 +451,7 @@ def check_template_i18n_zh_title_absent(context: ScanContext) -> List[Violation]
             violations,
             rule_id="R022",
             doc=doc,
-            pattern=r"^\s*i18n\s*:",
-            default_pattern=r"^\s*spec\s*:",
+            node_path=("spec", "i18n"),
             message="Template spec.i18n.zh.title should be omitted when it is identical to spec.title",
         )
     return violations
@@ -483,15 +465,14 @@ def check_template_categories_allowed(context: ScanContext) -> List[Violation]:
         categories = spec.get("categories") if isinstance(spec, dict) else None
         if not isinstance(categories, list):
             continue
-        for item in categories:
+        for index, item in enumerate(categories):
             if isinstance(item, str) and item in ALLOWED_TEMPLATE_CATEGORIES:
                 continue
             add_doc_violation(
                 violations,
                 rule_id="R023",
                 doc=doc,
-                pattern=r"^\s*categories\s*:",
-                default_pattern=r"^\s*spec\s*:",
+                node_path=("spec", "categories", index),
                 message=f"Template spec.categories entries must be from allowlist: {allowed}",
             )
             break
@@ -502,11 +483,7 @@ def check_deploy_manager_label_match_name(context: ScanContext) -> List[Violatio
     violations: List[Violation] = []
     label_key = "cloud.sealos.io/app-deploy-manager"
 
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         metadata = doc.data.get("metadata")
         if not isinstance(metadata, dict):
             continue
@@ -521,8 +498,7 @@ def check_deploy_manager_label_match_name(context: ScanContext) -> List[Violatio
                 violations,
                 rule_id="R008",
                 doc=doc,
-                pattern=r"^\s*labels\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels"),
                 message=f"{label_key} label is required and must exactly match metadata.name",
             )
             continue
@@ -531,7 +507,7 @@ def check_deploy_manager_label_match_name(context: ScanContext) -> List[Violatio
                 violations,
                 rule_id="R008",
                 doc=doc,
-                pattern=re.escape(label_key),
+                node_path=("metadata", "labels", label_key),
                 message=f"{label_key} must exactly match metadata.name",
             )
 
@@ -542,11 +518,7 @@ def check_app_label_match_name(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
     label_key = "app"
 
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         if not has_managed_workload_marker(doc.data):
             continue
 
@@ -564,8 +536,7 @@ def check_app_label_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R027",
                 doc=doc,
-                pattern=r"^\s*app\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels", label_key),
                 message="metadata.labels.app is required and must exactly match metadata.name for managed app workloads",
             )
             continue
@@ -574,8 +545,7 @@ def check_app_label_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R027",
                 doc=doc,
-                pattern=r"^\s*app\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels", label_key),
                 message="metadata.labels.app must exactly match metadata.name for managed app workloads",
             )
 
@@ -585,11 +555,7 @@ def check_app_label_match_name(context: ScanContext) -> List[Violation]:
 def check_container_names_match_workload_name(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
 
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         if not has_managed_workload_marker(doc.data):
             continue
 
@@ -605,7 +571,7 @@ def check_container_names_match_workload_name(context: ScanContext) -> List[Viol
         if not isinstance(containers, list):
             continue
 
-        for container in containers:
+        for index, container in enumerate(containers):
             if not isinstance(container, dict):
                 continue
             container_name = container.get("name")
@@ -613,13 +579,11 @@ def check_container_names_match_workload_name(context: ScanContext) -> List[Viol
                 continue
 
             if isinstance(container_name, str) and container_name.strip():
-                pattern = rf"^\s*-\s*name\s*:\s*{re.escape(container_name.strip())}\s*$"
                 message = (
                     f"container name '{container_name.strip()}' must exactly match metadata.name "
                     f"'{workload_name}' for managed app workloads"
                 )
             else:
-                pattern = r"^\s*-\s*name\s*:"
                 message = (
                     "container name is required and must exactly match metadata.name "
                     "for managed app workloads"
@@ -629,8 +593,7 @@ def check_container_names_match_workload_name(context: ScanContext) -> List[Viol
                 violations,
                 rule_id="R028",
                 doc=doc,
-                pattern=pattern,
-                default_pattern=r"^\s*containers\s*:",
+                node_path=(*TEMPLATE_SPEC_PATH, "containers", index, "name"),
                 message=message,
             )
 
@@ -639,13 +602,9 @@ def check_container_names_match_workload_name(context: ScanContext) -> List[Viol
 
 def check_origin_image_name_matches_container(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
+    for doc in iter_app_workload_documents(context):
         if doc.path.suffix.lower() not in TEMPLATE_ARTIFACT_SUFFIXES:
             continue
-        if not is_app_workload_document(doc):
-            continue
         if not has_managed_workload_marker(doc.data):
             continue
 
@@ -664,8 +623,7 @@ def check_origin_image_name_matches_container(context: ScanContext) -> List[Viol
                 violations,
                 rule_id="R015",
                 doc=doc,
-                pattern=r"originImageName",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "annotations", "originImageName"),
                 message="managed app workloads must define metadata.annotations.originImageName",
             )
             continue
@@ -674,8 +632,7 @@ def check_origin_image_name_matches_container(context: ScanContext) -> List[Viol
                 violations,
                 rule_id="R015",
                 doc=doc,
-                pattern=r"originImageName",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "annotations", "originImageName"),
                 message="metadata.annotations.originImageName must match a container image in the workload",
             )
     return violations
@@ -692,24 +649,17 @@ def check_service_ports_have_names(context: ScanContext) -> List[Violation]:
         ports = spec.get("ports") if isinstance(spec, dict) else None
         if not isinstance(ports, list):
             continue
-        for entry in ports:
+        for index, entry in enumerate(ports):
             if not isinstance(entry, dict):
                 continue
-            port_value = entry.get("port")
             name = entry.get("name")
             if isinstance(name, str) and name.strip():
                 continue
-            pattern = (
-                rf"^\s*port\s*:\s*{re.escape(str(port_value))}\s*$"
-                if port_value is not None
-                else r"^\s*ports\s*:"
-            )
             add_doc_violation(
                 violations,
                 rule_id="R020",
                 doc=doc,
-                pattern=pattern,
-                default_pattern=r"^\s*ports\s*:",
+                node_path=("spec", "ports", index),
                 message="Service spec.ports entries must define a non-empty name",
             )
     return violations
@@ -744,8 +694,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=r"^\s*name\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "name"),
                 message="Service metadata.name is required and must match spec.selector.app",
             )
             continue
@@ -756,8 +705,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=r"^\s*name\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "name"),
                 message="Service metadata.name must match spec.selector.app",
             )
 
@@ -766,8 +714,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=r"^\s*labels\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels"),
                 message="Service metadata.labels.app is required and must match metadata.name/spec.selector.app",
             )
         elif app_label.strip() != metadata_name:
@@ -775,8 +722,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=r"^\s*app\s*:",
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", "app"),
                 message="Service metadata.labels.app must match metadata.name/spec.selector.app",
             )
 
@@ -785,8 +731,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message=(
                     "Service metadata.labels.cloud.sealos.io/app-deploy-manager is required "
                     "and must match metadata.name/spec.selector.app"
@@ -797,8 +742,7 @@ def check_service_labels_match_selector_app(context: ScanContext) -> List[Violat
                 violations,
                 rule_id="R029",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message="Service metadata.labels.cloud.sealos.io/app-deploy-manager must match metadata.name/spec.selector.app",
             )
 
@@ -831,8 +775,7 @@ def check_configmap_labels_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R030",
                 doc=doc,
-                pattern=r"^\s*labels\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels"),
                 message="ConfigMap metadata.labels.app is required and must match metadata.name",
             )
         elif app_label.strip() != metadata_name:
@@ -840,8 +783,7 @@ def check_configmap_labels_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R030",
                 doc=doc,
-                pattern=r"^\s*app\s*:",
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", "app"),
                 message="ConfigMap metadata.labels.app must match metadata.name",
             )
 
@@ -850,8 +792,7 @@ def check_configmap_labels_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R030",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message="ConfigMap metadata.labels.cloud.sealos.io/app-deploy-manager is required and must match metadata.name",
             )
         elif cloud_label.strip() != metadata_name:
@@ -859,30 +800,30 @@ def check_configmap_labels_match_name(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R030",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message="ConfigMap metadata.labels.cloud.sealos.io/app-deploy-manager must match metadata.name",
             )
 
     return violations
 
 
-def _iter_ingress_backend_service_names(data: Dict[str, Any]) -> Iterable[str]:
+def _iter_ingress_backend_service_names(data: Dict[str, Any]) -> Iterable[Tuple[NodePath, str]]:
     spec = data.get("spec")
     rules = spec.get("rules") if isinstance(spec, dict) else None
     if not isinstance(rules, list):
         return
-    for rule in rules:
+    for rule_index, rule in enumerate(rules):
         http = rule.get("http") if isinstance(rule, dict) else None
         paths = http.get("paths") if isinstance(http, dict) else None
         if not isinstance(paths, list):
             continue
-        for path in paths:
+        for path_index, path in enumerate(paths):
             backend = path.get("backend") if isinstance(path, dict) else None
             service = backend.get("service") if isinstance(backend, dict) else None
             service_name = service.get("name") if isinstance(service, dict) else None
             if isinstance(service_name, str) and service_name.strip():
-                yield service_name.strip()
+                node_path = ("spec", "rules", rule_index, "http", "paths", path_index, "backend", "service", "name")
+                yield node_path, service_name.strip()
 
 
 def check_ingress_name_matches_backends(context: ScanContext) -> List[Violation]:
@@ -909,8 +850,7 @@ def check_ingress_name_matches_backends(context: ScanContext) -> List[Violation]
                 violations,
                 rule_id="R031",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message="Ingress metadata.labels.cloud.sealos.io/app-deploy-manager is required and must match metadata.name",
             )
         elif cloud_label.strip() != metadata_name:
@@ -918,20 +858,18 @@ def check_ingress_name_matches_backends(context: ScanContext) -> List[Violation]
                 violations,
                 rule_id="R031",
                 doc=doc,
-                pattern=re.escape(cloud_label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", cloud_label_key),
                 message="Ingress metadata.labels.cloud.sealos.io/app-deploy-manager must match metadata.name",
             )
 
-        for backend_name in _iter_ingress_backend_service_names(doc.data):
+        for node_path, backend_name in _iter_ingress_backend_service_names(doc.data):
             if backend_name == metadata_name:
                 continue
             add_doc_violation(
                 violations,
                 rule_id="R031",
                 doc=doc,
-                pattern=r"^\s*name\s*:",
-                default_pattern=r"^\s*service\s*:",
+                node_path=node_path,
                 message="Ingress backend service.name must match Ingress metadata.name",
             )
             break
@@ -964,8 +902,7 @@ def check_http_ingress_annotations(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R026",
                 doc=doc,
-                pattern=r"^\s*annotations\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "annotations"),
                 message="Ingress metadata.annotations must define the required HTTP annotation set",
             )
             continue
@@ -985,17 +922,12 @@ def check_http_ingress_annotations(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R026",
                 doc=doc,
-                pattern=re.escape(key),
-                default_pattern=r"^\s*annotations\s*:",
+                node_path=("metadata", "annotations", key),
                 message=f"Ingress annotation '{key}' must match the required HTTP default",
             )
     return violations
 
 
-def _is_template_artifact_document(doc) -> bool:
-    return doc.path.suffix.lower() in TEMPLATE_ARTIFACT_SUFFIXES and doc.path.name == "index.yaml"
-
-
 def _extract_postgres_database_names_from_value(raw_value: str) -> List[str]:
     names: List[str] = []
     for match in POSTGRES_URL_DATABASE_RE.finditer(raw_value):
@@ -1063,10 +995,22 @@ def _collect_postgres_expected_conn_secrets(artifact_docs) -> Dict[Path, set[str
     return expected_by_path
 
 
+def _find_env_path(data: Any, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[NodePath]:
+    """Node path of the first container env item (in iter_containers order) matching predicate."""
+    for container_path, container in iter_container_nodes(data):
+        env_list = container.get("env")
+        if not isinstance(env_list, list):
+            continue
+        for index, item in enumerate(env_list):
+            if isinstance(item, dict) and predicate(item):
+                return (*container_path, "env", index)
+    return None
+
+
 def check_postgres_secret_refs_match_cluster_name(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
 
-    artifact_docs = [doc for doc in context.yaml_documents if _is_template_artifact_document(doc)]
+    artifact_docs = list(iter_index_artifact_documents(context))
     if not artifact_docs:
         return violations
 
@@ -1082,7 +1026,7 @@ def check_postgres_secret_refs_match_cluster_name(context: ScanContext) -> List[
         if not expected:
             continue
 
-        for _, secret_name, _, secret_key in iter_workload_secret_refs(doc.data):
+        for ref_path, _, secret_name, _, secret_key in iter_workload_secret_ref_nodes(doc.data):
             if not isinstance(secret_name, str) or not secret_name.endswith("-pg-conn-credential"):
                 continue
             if secret_name in expected:
@@ -1100,8 +1044,7 @@ def check_postgres_secret_refs_match_cluster_name(context: ScanContext) -> List[
                 violations,
                 rule_id="R034",
                 doc=doc,
-                pattern=rf"^\s*name\s*:\s*{re.escape(secret_name)}\s*$",
-                default_pattern=r"^\s*env\s*:",
+                node_path=ref_path,
                 message=(
                     f"PostgreSQL secret reference '{secret_name}' must match the "
                     f"Cluster metadata.name-derived secret ({expected_list})"
@@ -1134,6 +1077,16 @@ def _extract_job_script(doc) -> str:
     return "\n".join(script_parts)
 
 
+def _first_container_command_path(data: Any) -> NodePath:
+    template_spec = get_template_spec(data) if isinstance(data, dict) else None
+    containers = template_spec.get("containers") if isinstance(template_spec, dict) else None
+    if isinstance(containers, list):
+        for index, container in enumerate(containers):
+            if isinstance(container, dict) and "command" in container:
+                return (*TEMPLATE_SPEC_PATH, "containers", index, "command")
+    return (*TEMPLATE_SPEC_PATH, "containers")
+
+
 def _script_targets_database(script: str, database_name: str) -> bool:
     escaped = re.escape(database_name)
     patterns = [
@@ -1157,13 +1110,18 @@ def _is_robust_pg_init_script(script: str) -> bool:
 
 def check_postgres_custom_db_init_job(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
+    for artifact_docs in iter_index_artifact_groups(context):
+        _check_postgres_custom_db_init_job_in_template(artifact_docs, violations)
+    return violations
 
-    artifact_docs = [doc for doc in context.yaml_documents if _is_template_artifact_document(doc)]
-    if not artifact_docs:
-        return violations
 
+def _check_postgres_custom_db_init_job_in_template(
+    artifact_docs: List[YamlDocument],
+    violations: List[Violation],
+) -> None:
+    """R032 within one template: its workloads' databases need a pg-init Job from the same template."""
     if not any(_is_postgres_cluster_document(doc) for doc in artifact_docs):
-        return violations
+        return
 
     required_databases: set[str] = set()
     workload_docs = [
@@ -1175,7 +1133,7 @@ def check_postgres_custom_db_init_job(context: ScanContext) -> List[Violation]:
         required_databases.update(_extract_required_postgres_databases(doc))
 
     if not required_databases:
-        return violations
+        return
 
     job_docs = [doc for doc in artifact_docs if isinstance(doc.data, dict) and doc.data.get("kind") == "Job"]
     pg_init_jobs = []
@@ -1194,12 +1152,16 @@ def check_postgres_custom_db_init_job(context: ScanContext) -> List[Violation]:
 
         if matching_job is None:
             target_doc = workload_docs[0] if workload_docs else artifact_docs[0]
+            env_path = _find_env_path(
+                target_doc.data,
+                lambda item: isinstance(item.get("value"), str)
+                and POSTGRES_URL_DATABASE_RE.search(item["value"]) is not None,
+            )
             add_doc_violation(
                 violations,
                 rule_id="R032",
                 doc=target_doc,
-                pattern=r"postgres(?:ql)?://",
-                default_pattern=r"^\s*env\s*:",
+                node_path=(*env_path, "value") if env_path else (*TEMPLATE_SPEC_PATH, "containers"),
                 message=(
                     f"non-default PostgreSQL database '{database_name}' requires a "
                     "${{ defaults.app_name }}-pg-init Job in template artifacts"
@@ -1214,16 +1176,13 @@ def check_postgres_custom_db_init_job(context: ScanContext) -> List[Violation]:
             violations,
             rule_id="R032",
             doc=job_doc,
-            pattern=r"^\s*command\s*:",
-            default_pattern=r"^\s*containers\s*:",
+            node_path=_first_container_command_path(job_doc.data),
             message=(
                 "pg-init Job for non-default PostgreSQL databases must include readiness wait "
                 "(for example pg_isready) and idempotent create logic (exists check before create)"
             ),
         )
 
-    return violations
-
 
 def _is_worker_args(args: Any) -> bool:
     if not isinstance(args, list) or not args:
@@ -1259,11 +1218,7 @@ def _probe_has_exec_command(probe: Any, expected_fragment: str) -> bool:
 
 def check_official_health_probes(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if not is_app_workload_document(doc):
-            continue
+    for doc in iter_app_workload_documents(context):
         if not has_managed_workload_marker(doc.data):
             continue
 
@@ -1290,8 +1245,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                     violations,
                     rule_id="R024",
                     doc=doc,
-                    pattern=r"^\s*livenessProbe\s*:",
-                    default_pattern=r"^\s*containers\s*:",
+                    node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "livenessProbe"),
                     message=(
                         "workloads with official health checks must define livenessProbe; "
                         "expected exec command containing 'ak healthcheck'"
@@ -1302,8 +1256,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                     violations,
                     rule_id="R024",
                     doc=doc,
-                    pattern=r"^\s*readinessProbe\s*:",
-                    default_pattern=r"^\s*containers\s*:",
+                    node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "readinessProbe"),
                     message=(
                         "workloads with official health checks must define readinessProbe; "
                         "expected exec command containing 'ak healthcheck'"
@@ -1314,8 +1267,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                     violations,
                     rule_id="R024",
                     doc=doc,
-                    pattern=r"^\s*startupProbe\s*:",
-                    default_pattern=r"^\s*containers\s*:",
+                    node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "startupProbe"),
                     message=(
                         "workloads with slow startup and official health checks must define startupProbe; "
                         "expected exec command containing 'ak healthcheck'"
@@ -1336,8 +1288,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R024",
                 doc=doc,
-                pattern=r"^\s*livenessProbe\s*:",
-                default_pattern=r"^\s*containers\s*:",
+                node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "livenessProbe"),
                 message=(
                     "workloads with official health checks must define livenessProbe "
                     "with the official endpoint path"
@@ -1348,8 +1299,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R024",
                 doc=doc,
-                pattern=r"^\s*readinessProbe\s*:",
-                default_pattern=r"^\s*containers\s*:",
+                node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "readinessProbe"),
                 message=(
                     "workloads with official health checks must define readinessProbe "
                     "with the official endpoint path"
@@ -1360,8 +1310,7 @@ def check_official_health_probes(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R024",
                 doc=doc,
-                pattern=r"^\s*startupProbe\s*:",
-                default_pattern=r"^\s*containers\s*:",
+                node_path=(*TEMPLATE_SPEC_PATH, "containers", 0, "startupProbe"),
                 message=(
                     "workloads with slow startup and official health checks must define startupProbe "
                     "with the official endpoint path"
@@ -1387,8 +1336,7 @@ def check_cronjob_required_labels(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R033",
                 doc=doc,
-                pattern=r"^\s*labels\s*:",
-                default_pattern=r"^\s*metadata\s*:",
+                node_path=("metadata", "labels"),
                 message=(
                     "CronJob metadata.labels must define cloud.sealos.io/cronjob, "
                     "cronjob-launchpad-name, and cronjob-type"
@@ -1402,8 +1350,7 @@ def check_cronjob_required_labels(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R033",
                 doc=doc,
-                pattern=re.escape(CRONJOB_LABEL_KEY),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", CRONJOB_LABEL_KEY),
                 message=(
                     "CronJob label cloud.sealos.io/cronjob must exist and exactly match metadata.name"
                 ),
@@ -1416,8 +1363,7 @@ def check_cronjob_required_labels(context: ScanContext) -> List[Violation]:
                 violations,
                 rule_id="R033",
                 doc=doc,
-                pattern=re.escape(label_key),
-                default_pattern=r"^\s*labels\s*:",
+                node_path=("metadata", "labels", label_key),
                 message=(
                     f"CronJob label {label_key} must exist and be set to "
                     f"{expected_value!r}"
@@ -1435,8 +1381,7 @@ def check_revision_history_limit(context: ScanContext) -> List[Violation]:
         if isinstance(data.get("spec"), dict)
         else None,
         expected=1,
-        value_pattern=r"^\s*revisionHistoryLimit\s*:",
-        fallback_pattern=r"^\s*spec\s*:",
+        node_path=("spec", "revisionHistoryLimit"),
         missing_message="managed app workloads must explicitly set revisionHistoryLimit: 1",
         mismatch_message="revisionHistoryLimit must be set to 1 for managed app workloads",
     )
@@ -1455,8 +1400,7 @@ def check_automount_service_account_token(context: ScanContext) -> List[Violatio
         rule_id="R010",
         value_extractor=_extract_automount_service_account_token,
         expected=False,
-        value_pattern=r"^\s*automountServiceAccountToken\s*:",
-        fallback_pattern=r"^\s*template\s*:",
+        node_path=(*TEMPLATE_SPEC_PATH, "automountServiceAccountToken"),
         missing_message="managed app workloads must explicitly set automountServiceAccountToken: false",
         mismatch_message="automountServiceAccountToken must be false for managed app workloads",
     )
@@ -6,18 +6,31 @@ from __future__ import annotations
 import re
 from typing import Dict, List, Optional, Set
 
-from check_consistency_models import DB_SECRET_SUFFIXES, Rule, ScanContext, Violation, WORKLOAD_KINDS
-from check_consistency_helpers_workload import iter_containers, iter_workload_secret_refs
-from check_consistency_parser import find_line
+from check_consistency_models import (
+    DB_SECRET_SUFFIXES,
+    WORKLOAD_KINDS,
+    LazyPattern,
+    NodeVisit,
+    Rule,
+    ScanContext,
+    Violation,
+)
+from check_consistency_helpers_workload import (
+    iter_documents_by_kind,
+    iter_documents_by_kinds,
+    iter_workload_secret_ref_nodes,
+)
+from check_consistency_parser import find_node_line
+from check_consistency_visitor import visitor_rule
 
 
 APP_NAME_PLACEHOLDER = r"\$\{\{\s*defaults\.app_name\s*\}\}"
 SERVICE_ACCOUNT_PLACEHOLDER = r"\$\{\{\s*SEALOS_SERVICE_ACCOUNT\s*\}\}"
-APPROVED_DB_SECRET_PATTERN = re.compile(
+APPROVED_DB_SECRET_PATTERN = LazyPattern(
     rf"^{APP_NAME_PLACEHOLDER}(?:{'|'.join(re.escape(suffix) for suffix in DB_SECRET_SUFFIXES)})$"
 )
 OBJECT_STORAGE_BASE_SECRET_NAME = "object-storage-key"
-OBJECT_STORAGE_BUCKET_SECRET_PATTERN = re.compile(
+OBJECT_STORAGE_BUCKET_SECRET_PATTERN = LazyPattern(
     rf"^object-storage-key-{SERVICE_ACCOUNT_PLACEHOLDER}-{APP_NAME_PLACEHOLDER}$"
 )
 OBJECT_STORAGE_BASE_ENV_NAMES: Set[str] = {
@@ -48,12 +61,12 @@ NON_DB_CONNECTION_ENV_EXACT: Set[str] = {
     "PGRST_OPENAPI_SERVER_PROXY_URI",
     "PG_META_PORT",
 }
-ENV_VALUE_REF_RE = re.compile(r"\$\(([A-Za-z_][A-Za-z0-9_]*)\)")
+ENV_VALUE_REF_RE = LazyPattern(r"\$\(([A-Za-z_][A-Za-z0-9_]*)\)")
 DB_COMPOSABLE_KEYS: Set[str] = {"endpoint", "host", "port", "username", "password"}
-REDIS_SERVICE_HOST_TEMPLATE_PATTERN = re.compile(
+REDIS_SERVICE_HOST_TEMPLATE_PATTERN = LazyPattern(
     rf"^{APP_NAME_PLACEHOLDER}-redis-redis(?:-redis)?\.\$\{{\{{\s*SEALOS_NAMESPACE\s*\}}\}}\.svc(?:\.cluster\.local)?$"
 )
-REDIS_SERVICE_HOST_RUNTIME_PATTERN = re.compile(
+REDIS_SERVICE_HOST_RUNTIME_PATTERN = LazyPattern(
     r"^[a-z0-9](?:[-a-z0-9]*redis[-a-z0-9]*)\.[a-z0-9](?:[-a-z0-9]*[a-z0-9])?\.svc(?:\.cluster\.local)?$"
 )
 
@@ -287,32 +300,16 @@ def is_allowed_redis_service_env(
     return False
 
 
-def _find_secret_ref_line(doc, source: str, secret_name: str, env_name: Optional[str]) -> int:
-    if source == "env" and isinstance(env_name, str):
-        return find_line(doc, rf"^\s*-\s*name\s*:\s*{re.escape(env_name)}\s*$")
-    if source == "volume":
-        return find_line(doc, rf"^\s*secretName\s*:\s*{re.escape(secret_name)}\s*$")
-    return find_line(doc, rf"^\s*name\s*:\s*{re.escape(secret_name)}\s*$")
-
-
 def _collect_reserved_db_secret_overrides(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        if doc.data.get("kind") != "Secret":
-            continue
+    for doc in iter_documents_by_kind(context, "Secret"):
 
         metadata = doc.data.get("metadata")
         secret_name = metadata.get("name") if isinstance(metadata, dict) else None
         if not isinstance(secret_name, str) or not is_approved_db_secret_name(secret_name):
             continue
 
-        line = find_line(
-            doc,
-            rf"^\s*name\s*:\s*{re.escape(secret_name)}\s*$",
-            default=find_line(doc, r"^\s*metadata\s*:"),
-        )
+        line = find_node_line(doc, ("metadata", "name"))
         violations.append(
             Violation(
                 rule_id="R007",
@@ -330,20 +327,15 @@ def _collect_reserved_db_secret_overrides(context: ScanContext) -> List[Violatio
 def check_business_env_secret_policy(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = _collect_reserved_db_secret_overrides(context)
 
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
-        kind = doc.data.get("kind")
-        if kind not in WORKLOAD_KINDS:
-            continue
+    for doc in iter_documents_by_kinds(context, WORKLOAD_KINDS):
 
-        for source, secret_name, env_name, _ in iter_workload_secret_refs(doc.data):
+        for ref_path, source, secret_name, env_name, _ in iter_workload_secret_ref_nodes(doc.data):
             if is_approved_db_secret_name(secret_name) or is_approved_object_storage_secret_ref(
                 source, secret_name, env_name
             ):
                 continue
 
-            line = _find_secret_ref_line(doc, source, secret_name, env_name)
+            line = find_node_line(doc, ref_path)
             violations.append(
                 Violation(
                     rule_id="R007",
@@ -359,85 +351,80 @@ def check_business_env_secret_policy(context: ScanContext) -> List[Violation]:
     return violations
 
 
-def check_db_connection_env_secret_requirements(context: ScanContext) -> List[Violation]:
-    violations: List[Violation] = []
+def visit_container_db_connection_env(visit: NodeVisit) -> List[Violation]:
+    """R017 for one workload container; sibling env items decide whether plain values are allowed."""
+    doc = visit.doc
+    if not isinstance(doc.data, dict) or doc.data.get("kind") not in WORKLOAD_KINDS:
+        return []
+    env_list = visit.node.get("env")
+    if not isinstance(env_list, list):
+        return []
 
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
+    env_items_by_name: Dict[str, Dict[str, object]] = {}
+    for env_item in env_list:
+        if not isinstance(env_item, dict):
             continue
-        if doc.data.get("kind") not in WORKLOAD_KINDS:
+        env_name = env_item.get("name")
+        if isinstance(env_name, str) and env_name not in env_items_by_name:
+            env_items_by_name[env_name] = env_item
+
+    violations: List[Violation] = []
+    for index, env_item in enumerate(env_list):
+        if not isinstance(env_item, dict):
             continue
+        env_name = env_item.get("name")
+        if not isinstance(env_name, str):
+            continue
+        env_path = (*visit.path, "env", index)
 
-        for container in iter_containers(doc.data):
-            env_list = container.get("env")
-            if not isinstance(env_list, list):
+        expected_key = infer_db_connection_field(env_name)
+        if expected_key is None:
+            continue
+
+        secret_ref = extract_secret_ref(env_item)
+        if secret_ref is None:
+            if is_allowed_redis_service_env(env_name, expected_key, env_item, env_items_by_name):
+                continue
+            if expected_key == "endpoint" and is_composed_db_endpoint_from_secret(env_item, env_items_by_name):
                 continue
+            line = find_node_line(doc, env_path)
+            violations.append(
+                Violation(
+                    rule_id="R017",
+                    path=doc.path,
+                    line=line,
+                    message=(
+                        "database connection env fields (endpoint/host/port/username/password) "
+                        "must use valueFrom.secretKeyRef"
+                    ),
+                )
+            )
+            continue
+
+        secret_name = secret_ref["name"]
+        if not is_approved_db_secret_name(secret_name):
+            # Let R007 report unapproved/invalid secret references.
+            continue
 
-            env_items_by_name: Dict[str, Dict[str, object]] = {}
-            for env_item in env_list:
-                if not isinstance(env_item, dict):
-                    continue
-                env_name = env_item.get("name")
-                if isinstance(env_name, str) and env_name not in env_items_by_name:
-                    env_items_by_name[env_name] = env_item
-
-            for env_item in env_list:
-                if not isinstance(env_item, dict):
-                    continue
-                env_name = env_item.get("name")
-                if not isinstance(env_name, str):
-                    continue
-
-                expected_key = infer_db_connection_field(env_name)
-                if expected_key is None:
-                    continue
-
-                secret_ref = extract_secret_ref(env_item)
-                if secret_ref is None:
-                    if is_allowed_redis_service_env(env_name, expected_key, env_item, env_items_by_name):
-                        continue
-                    if expected_key == "endpoint" and is_composed_db_endpoint_from_secret(
-                        env_item, env_items_by_name
-                    ):
-                        continue
-                    line = find_line(doc, rf"^\s*-\s*name\s*:\s*{re.escape(env_name)}\s*$")
-                    violations.append(
-                        Violation(
-                            rule_id="R017",
-                            path=doc.path,
-                            line=line,
-                            message=(
-                                "database connection env fields (endpoint/host/port/username/password) "
-                                "must use valueFrom.secretKeyRef"
-                            ),
-                        )
-                    )
-                    continue
-
-                secret_name = secret_ref["name"]
-                if not is_approved_db_secret_name(secret_name):
-                    # Let R007 report unapproved/invalid secret references.
-                    continue
-
-                secret_key = secret_ref["key"]
-                if secret_key != expected_key:
-                    line = find_line(doc, rf"^\s*-\s*name\s*:\s*{re.escape(env_name)}\s*$")
-                    violations.append(
-                        Violation(
-                            rule_id="R017",
-                            path=doc.path,
-                            line=line,
-                            message=(
-                                f"database env '{env_name}' must use secret key '{expected_key}' "
-                                "from an approved database secret"
-                            ),
-                        )
-                    )
+        secret_key = secret_ref["key"]
+        if secret_key != expected_key:
+            line = find_node_line(doc, env_path)
+            violations.append(
+                Violation(
+                    rule_id="R017",
+                    path=doc.path,
+                    line=line,
+                    message=(
+                        f"database env '{env_name}' must use secret key '{expected_key}' "
+                        "from an approved database secret"
+                    ),
+                )
+            )
 
     return violations
 
 
 SECURITY_RULES: Dict[str, Rule] = {
     "R007": Rule("R007", check_business_env_secret_policy),
-    "R017": Rule("R017", check_db_connection_env_secret_requirements),
+    "R017": visitor_rule("R017", {"container": visit_container_db_connection_env}),
 }
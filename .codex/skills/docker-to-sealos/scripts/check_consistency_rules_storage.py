@@ -3,124 +3,97 @@
 
 from __future__ import annotations
 
-import re
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 from check_consistency_models import (
     DB_COMPONENT_RESOURCE_LIMITS,
     DB_COMPONENT_RESOURCE_REQUESTS,
     MAX_PVC_STORAGE_BYTES,
+    NodeVisit,
     Rule,
     ScanContext,
     Violation,
 )
-from check_consistency_parser import find_line
+from check_consistency_parser import find_node_line
 from check_consistency_helpers_violations import add_doc_violation
 from check_consistency_helpers_storage import (
-    contains_key,
+    find_key_path,
     has_variable_expression,
-    iter_pvc_storage_values,
     parse_storage_bytes,
 )
-from check_consistency_helpers_workload import iter_containers
+from check_consistency_helpers_workload import iter_documents_by_kind
+from check_consistency_visitor import visitor_rule
 
 
 def check_no_emptydir(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks:
-            continue
-        if contains_key(doc.data, "emptyDir"):
+    for doc in context.document_index.checked:
+        empty_dir_path = find_key_path(doc.data, "emptyDir")
+        if empty_dir_path is not None:
             add_doc_violation(
                 violations,
                 rule_id="R005",
                 doc=doc,
-                pattern=r"^\s*emptyDir\s*:",
+                node_path=empty_dir_path,
                 message="emptyDir is not allowed; use persistent storage",
             )
     return violations
 
 
-def check_image_pull_policy(context: ScanContext) -> List[Violation]:
-    violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks:
-            continue
-        for container in iter_containers(doc.data):
-            image = container.get("image")
-            if not isinstance(image, str) or not image.strip():
-                continue
-            pull_policy = container.get("imagePullPolicy")
-            if pull_policy != "IfNotPresent":
-                line = find_line(doc, r"^\s*imagePullPolicy\s*:", default=find_line(doc, r"^\s*image\s*:"))
-                message = (
-                    "container imagePullPolicy must be IfNotPresent"
-                    if pull_policy is not None
-                    else "container must explicitly set imagePullPolicy: IfNotPresent"
-                )
-                violations.append(Violation(rule_id="R006", path=doc.path, line=line, message=message))
-    return violations
+def visit_container_image_pull_policy(visit: NodeVisit) -> List[Violation]:
+    container = visit.node
+    image = container.get("image")
+    if not isinstance(image, str) or not image.strip():
+        return []
+    pull_policy = container.get("imagePullPolicy")
+    if pull_policy == "IfNotPresent":
+        return []
 
+    doc = visit.doc
+    line = find_node_line(doc, (*visit.path, "imagePullPolicy" if pull_policy is not None else "image"))
+    message = (
+        "container imagePullPolicy must be IfNotPresent"
+        if pull_policy is not None
+        else "container must explicitly set imagePullPolicy: IfNotPresent"
+    )
+    return [Violation(rule_id="R006", path=doc.path, line=line, message=message)]
 
-def check_pvc_storage_limit(context: ScanContext) -> List[Violation]:
-    violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks:
-            continue
 
-        for raw_storage in iter_pvc_storage_values(doc.data):
-            storage_text = str(raw_storage).strip()
-            line = find_line(
-                doc,
-                rf"^\s*storage\s*:\s*['\"]?{re.escape(storage_text)}['\"]?\s*$",
-                default=find_line(doc, r"^\s*storage\s*:"),
-            )
+def _extract_pvc_storage(spec: Dict[str, Any]) -> Optional[str]:
+    resources = spec.get("resources")
+    requests = resources.get("requests") if isinstance(resources, dict) else None
+    storage = requests.get("storage") if isinstance(requests, dict) else None
+    return str(storage) if storage is not None else None
 
-            if has_variable_expression(storage_text):
-                violations.append(
-                    Violation(
-                        rule_id="R011",
-                        path=doc.path,
-                        line=line,
-                        message="PVC storage must be a concrete quantity (variables are not allowed)",
-                    )
-                )
-                continue
 
-            storage_bytes = parse_storage_bytes(storage_text)
-            if storage_bytes is None:
-                violations.append(
-                    Violation(
-                        rule_id="R011",
-                        path=doc.path,
-                        line=line,
-                        message=f"unable to parse PVC storage quantity: {storage_text!r}",
-                    )
-                )
-                continue
+def visit_pvc_storage_limit(visit: NodeVisit) -> List[Violation]:
+    raw_storage = _extract_pvc_storage(visit.node)
+    if raw_storage is None:
+        return []
 
-            if storage_bytes > MAX_PVC_STORAGE_BYTES:
-                violations.append(
-                    Violation(
-                        rule_id="R011",
-                        path=doc.path,
-                        line=line,
-                        message="PVC storage request must be <= 1Gi",
-                    )
-                )
+    doc = visit.doc
+    storage_text = raw_storage.strip()
+    line = find_node_line(doc, (*visit.path, "resources", "requests", "storage"))
 
-    return violations
+    if has_variable_expression(storage_text):
+        message = "PVC storage must be a concrete quantity (variables are not allowed)"
+    else:
+        storage_bytes = parse_storage_bytes(storage_text)
+        if storage_bytes is None:
+            message = f"unable to parse PVC storage quantity: {storage_text!r}"
+        elif storage_bytes > MAX_PVC_STORAGE_BYTES:
+            message = "PVC storage request must be <= 1Gi"
+        else:
+            return []
+
+    return [Violation(rule_id="R011", path=doc.path, line=line, message=message)]
 
 
 def check_database_cluster_component_resources(context: ScanContext) -> List[Violation]:
     violations: List[Violation] = []
-    for doc in context.yaml_documents:
-        if doc.skip_checks or not isinstance(doc.data, dict):
-            continue
+    for doc in iter_documents_by_kind(context, "Cluster"):
         if doc.path.name != "index.yaml":
             continue
-        if doc.data.get("kind") != "Cluster":
-            continue
 
         metadata = doc.data.get("metadata")
         labels = metadata.get("labels") if isinstance(metadata, dict) else None
@@ -133,17 +106,14 @@ def check_database_cluster_component_resources(context: ScanContext) -> List[Vio
         if not isinstance(component_specs, list):
             continue
 
-        for component in component_specs:
+        for index, component in enumerate(component_specs):
             if not isinstance(component, dict):
                 continue
             component_name = str(component.get("name", "<unknown>"))
+            component_path = ("spec", "componentSpecs", index)
             resources = component.get("resources")
             if not isinstance(resources, dict):
-                line = find_line(
-                    doc,
-                    rf"^\s*name\s*:\s*{re.escape(component_name)}\s*$",
-                    default=find_line(doc, r"^\s*componentSpecs\s*:"),
-                )
+                line = find_node_line(doc, component_path)
                 violations.append(
                     Violation(
                         rule_id="R019",
@@ -161,11 +131,7 @@ def check_database_cluster_component_resources(context: ScanContext) -> List[Vio
             for section_name, expected_values in expected_sections:
                 section = resources.get(section_name)
                 if not isinstance(section, dict):
-                    line = find_line(
-                        doc,
-                        rf"^\s*name\s*:\s*{re.escape(component_name)}\s*$",
-                        default=find_line(doc, r"^\s*resources\s*:"),
-                    )
+                    line = find_node_line(doc, (*component_path, "resources", section_name))
                     violations.append(
                         Violation(
                             rule_id="R019",
@@ -180,15 +146,7 @@ def check_database_cluster_component_resources(context: ScanContext) -> List[Vio
                     actual = section.get(key)
                     if actual == expected:
                         continue
-                    line = find_line(
-                        doc,
-                        rf"^\s*{re.escape(key)}\s*:\s*['\"]?{re.escape(str(actual))}['\"]?\s*$",
-                        default=find_line(
-                            doc,
-                            rf"^\s*name\s*:\s*{re.escape(component_name)}\s*$",
-                            default=find_line(doc, r"^\s*resources\s*:"),
-                        ),
-                    )
+                    line = find_node_line(doc, (*component_path, "resources", section_name, key))
                     violations.append(
                         Violation(
                             rule_id="R019",
@@ -206,7 +164,7 @@ def check_database_cluster_component_resources(context: ScanContext) -> List[Vio
 
 STORAGE_RULES: Dict[str, Rule] = {
     "R005": Rule("R005", check_no_emptydir),
-    "R006": Rule("R006", check_image_pull_policy),
-    "R011": Rule("R011", check_pvc_storage_limit),
+    "R006": visitor_rule("R006", {"container": visit_container_image_pull_policy}),
+    "R011": visitor_rule("R011", {"pvc_spec": visit_pvc_storage_limit}),
     "R019": Rule("R019", check_database_cluster_component_resources),
 }
@@ -4,32 +4,112 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set
 
+from check_consistency_cache import open_cache
+from check_consistency_changes import list_changed_files, requires_full_scan
 from check_consistency_context import ContextBuilder
-from check_consistency_engine import RuleEngine
-from check_consistency_models import Violation
+from check_consistency_engine import BudgetOutcome, RuleEngine
+from check_consistency_models import RegistryConfig, Violation, violation_sort_key
+from check_consistency_profile import ProfileReport, file_timings
 from check_consistency_registry import validate_registry
 from check_consistency_rule_registry import REGISTERED_RULES
 
 
+def resolve_changed_files(changed_since: Optional[str], skill_path: Path, registry_path: Path) -> Optional[Set[Path]]:
+    if not changed_since:
+        return None
+    changed_files = list_changed_files(changed_since, skill_path.parent)
+    full_scan_triggers = [registry_path, *Path(__file__).resolve().parent.glob("check_consistency*.py")]
+    if requires_full_scan(changed_files, full_scan_triggers):
+        return None
+    return changed_files
+
+
 def run_checks(
     skill_path: Path,
     references_dir: Path,
     registry_path: Path,
     only_rules: Optional[Sequence[str]] = None,
     additional_include_paths: Optional[Sequence[str]] = None,
+    cache_dir: Optional[Path] = None,
+    parse_workers: Optional[int] = None,
+    changed_since: Optional[str] = None,
+    rule_workers: int = 1,
+    rule_executor: str = "thread",
+    profile: Optional[ProfileReport] = None,
+    fail_fast: bool = False,
+    max_violations: Optional[int] = None,
+    rule_costs: Optional[Mapping[str, float]] = None,
+    outcome: Optional[BudgetOutcome] = None,
 ) -> List[Violation]:
-    config = validate_registry(registry_path, REGISTERED_RULES.keys())
+    violations = list(
+        iter_checks(
+            skill_path=skill_path,
+            references_dir=references_dir,
+            registry_path=registry_path,
+            only_rules=only_rules,
+            additional_include_paths=additional_include_paths,
+            cache_dir=cache_dir,
+            parse_workers=parse_workers,
+            changed_since=changed_since,
+            rule_workers=rule_workers,
+            rule_executor=rule_executor,
+            profile=profile,
+            fail_fast=fail_fast,
+            max_violations=max_violations,
+            rule_costs=rule_costs,
+            outcome=outcome,
+        )
+    )
+    violations.sort(key=violation_sort_key)
+    return violations
+
+
+def iter_checks(
+    skill_path: Path,
+    references_dir: Path,
+    registry_path: Path,
+    only_rules: Optional[Sequence[str]] = None,
+    additional_include_paths: Optional[Sequence[str]] = None,
+    cache_dir: Optional[Path] = None,
+    parse_workers: Optional[int] = None,
+    changed_since: Optional[str] = None,
+    rule_workers: int = 1,
+    rule_executor: str = "thread",
+    profile: Optional[ProfileReport] = None,
+    fail_fast: bool = False,
+    max_violations: Optional[int] = None,
+    rule_costs: Optional[Mapping[str, float]] = None,
+    config: Optional[RegistryConfig] = None,
+    outcome: Optional[BudgetOutcome] = None,
+) -> Iterator[Violation]:
+    """Like run_checks, but yield violations as each rule finishes instead of one sorted list.
+
+    Registry, scan and parse errors are raised before the iterator is returned. fail_fast and
+    max_violations stop early and run rules cheapest first (rule_costs: measured seconds per rule);
+    outcome.stopped_early tells whether that skipped any rule or violation.
+    config is the registry_path config when the caller has already validated it.
+    """
+    if config is None:
+        config = validate_registry(registry_path, REGISTERED_RULES.keys(), open_cache(cache_dir))
     include_paths = list(config.include_paths)
     if additional_include_paths:
         include_paths.extend(additional_include_paths)
+    changed_files = resolve_changed_files(changed_since, skill_path, registry_path)
+    parse_timings: Optional[Dict[Path, float]] = {} if profile is not None else None
     builder = ContextBuilder(
         skill_path=skill_path,
         references_dir=references_dir,
         include_paths=include_paths,
+        cache_dir=cache_dir,
+        parse_workers=parse_workers,
+        changed_files=changed_files,
+        parse_timings=parse_timings,
     )
     context, parse_violations = builder.build()
+    if profile is not None:
+        profile.files.extend(file_timings(parse_timings))
 
     engine = RuleEngine(
         config=config,
@@ -37,8 +117,15 @@ def run_checks(
         skill_root=skill_path.parent,
     )
     selected_rules = engine.resolve_rules(only_rules)
-    return engine.run(
+    return engine.iter_violations(
         context=context,
         parse_violations=parse_violations,
         selected_rules=selected_rules,
+        workers=rule_workers,
+        executor=rule_executor,
+        timings=profile.rules if profile is not None else None,
+        fail_fast=fail_fast,
+        max_violations=max_violations,
+        rule_costs=rule_costs,
+        outcome=outcome,
     )
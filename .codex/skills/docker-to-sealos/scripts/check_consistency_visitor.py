@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Single-pass document walker that dispatches typed nodes to visitor-style rules."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+from check_consistency_models import NodeHandler, NodePath, NodeVisit, Rule, ScanContext, Violation
+
+
+CONTAINER_LIST_KEYS = {"containers", "initContainers"}
+NODE_KINDS = {
+    # Items of containers/initContainers lists, in iter_containers order.
+    "container",
+    # spec of a PersistentVolumeClaim or of a volumeClaimTemplates item, in iter_pvc_storage_values order.
+    "pvc_spec",
+}
+
+
+def iter_document_nodes(data: Any) -> Iterator[Tuple[str, Any, NodePath]]:
+    """Walk a parsed document once and yield (node_kind, node, path) for every typed node."""
+    yield from _walk(data, (), in_claim_templates=False)
+
+
+def _walk(node: Any, path: NodePath, in_claim_templates: bool) -> Iterator[Tuple[str, Any, NodePath]]:
+    if isinstance(node, dict):
+        if not in_claim_templates and node.get("kind") == "PersistentVolumeClaim":
+            spec = node.get("spec")
+            if isinstance(spec, dict):
+                yield "pvc_spec", spec, (*path, "spec")
+
+        for key, value in node.items():
+            child_path = (*path, key)
+            if isinstance(value, list):
+                if key in CONTAINER_LIST_KEYS:
+                    for index, item in enumerate(value):
+                        if isinstance(item, dict):
+                            yield "container", item, (*child_path, index)
+                elif key == "volumeClaimTemplates" and not in_claim_templates:
+                    for index, item in enumerate(value):
+                        spec = item.get("spec") if isinstance(item, dict) else None
+                        if isinstance(spec, dict):
+                            yield "pvc_spec", spec, (*child_path, index, "spec")
+                    yield from _walk(value, child_path, in_claim_templates=True)
+                    continue
+            yield from _walk(value, child_path, in_claim_templates)
+    elif isinstance(node, list):
+        for index, item in enumerate(node):
+            yield from _walk(item, (*path, index), in_claim_templates)
+
+
+def run_node_handlers(
+    context: ScanContext,
+    handlers_by_rule: Mapping[str, Mapping[str, NodeHandler]],
+) -> Dict[str, List[Violation]]:
+    """Walk every checked document once and collect violations per visitor rule."""
+    dispatch: Dict[str, List[Tuple[str, NodeHandler]]] = {}
+    for rule_id, handlers in handlers_by_rule.items():
+        for node_kind, handler in handlers.items():
+            if node_kind not in NODE_KINDS:
+                raise ValueError(f"unknown node kind for {rule_id}: {node_kind}")
+            dispatch.setdefault(node_kind, []).append((rule_id, handler))
+
+    results: Dict[str, List[Violation]] = {rule_id: [] for rule_id in handlers_by_rule}
+    if not dispatch:
+        return results
+
+    for doc in context.document_index.checked:
+        for node_kind, node, path in iter_document_nodes(doc.data):
+            interested = dispatch.get(node_kind)
+            if not interested:
+                continue
+            visit = NodeVisit(doc=doc, node=node, path=path)
+            for rule_id, handler in interested:
+                results[rule_id].extend(handler(visit))
+    return results
+
+
+def visitor_rule(rule_id: str, node_handlers: Mapping[str, NodeHandler]) -> Rule:
+    """Build a Rule whose check() still works standalone for legacy callers."""
+
+    def check(context: ScanContext) -> List[Violation]:
+        return run_node_handlers(context, {rule_id: node_handlers})[rule_id]
+
+    return Rule(rule_id, check, node_handlers=dict(node_handlers))
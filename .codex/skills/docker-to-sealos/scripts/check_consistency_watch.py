@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""Polling watch mode that keeps parsed documents resident and re-checks only changed files."""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, TextIO, Tuple
+
+from check_consistency_changes import select_changed_scan_paths
+from check_consistency_engine import RuleEngine
+from check_consistency_models import DEFAULT_WATCH_INTERVAL, ScanContext, Violation, YamlDocument, violation_sort_key
+from check_consistency_output import format_violation
+from check_consistency_parser import (
+    MappedFileTexts,
+    FileParseResult,
+    build_scan_paths,
+    file_parse_cache_key,
+    materialize_parse_result,
+    parse_paths,
+)
+from check_consistency_registry import validate_registry
+from check_consistency_rule_registry import REGISTERED_RULES
+
+
+FileStamp = Tuple[int, int]
+
+
+def file_stamp(path: Path) -> Optional[FileStamp]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class _ResidentFile:
+    stamp: Optional[FileStamp]
+    key: str
+    documents: List[YamlDocument]
+    parse_violations: List[Violation]
+
+
+@dataclass(frozen=True)
+class WatchUpdate:
+    changed_paths: List[Path]
+    checked_paths: List[Path]
+    checked_rules: List[str]
+    added: List[Violation]
+    resolved: List[Violation]
+    total: int
+    seconds: float
+
+
+@dataclass
+class WatchSession:
+    """Resident scan state: parsed files, the registry and the last violations per path.
+
+    refresh() polls file stamps, re-parses files whose content hash changed, and re-runs the
+    selected rules over the changed files' template directories only, the same unit that
+    --changed-since relies on; this matches a full scan because no rule compares documents across
+    template directories. Of those rules only the ones whose registry inputs cover a kind
+    found in the changed files (before or after the edit) run; the others keep their last results.
+    """
+
+    skill_path: Path
+    references_dir: Path
+    registry_path: Path
+    only_rules: Optional[Sequence[str]] = None
+    additional_include_paths: Optional[Sequence[str]] = None
+    parse_workers: Optional[int] = None
+    _files: Dict[Path, _ResidentFile] = field(default_factory=dict, init=False, repr=False)
+    _violations: Dict[Path, List[Violation]] = field(default_factory=dict, init=False, repr=False)
+    _scan_paths: List[Path] = field(default_factory=list, init=False, repr=False)
+    _registry_stamp: Optional[FileStamp] = field(default=None, init=False, repr=False)
+
+    def start(self) -> List[Violation]:
+        """Parse and check everything once; return the sorted violations."""
+        self._load_registry()
+        scan_paths = self._build_scan_paths()
+        _, vanished = self._parse(scan_paths)
+        self._scan_paths = [path for path in scan_paths if path not in vanished]
+        self._check(self._scan_paths, self._selected_rules)
+        return self.violations()
+
+    def violations(self) -> List[Violation]:
+        return sorted((item for items in self._violations.values() for item in items), key=violation_sort_key)
+
+    def refresh(self) -> Optional[WatchUpdate]:
+        """Re-check whatever changed since the last call; None when nothing changed."""
+        started = time.perf_counter()
+        registry_changed = file_stamp(self.registry_path) != self._registry_stamp
+        if registry_changed:
+            self._load_registry()
+
+        scan_paths = self._build_scan_paths()
+        stale = [path for path in scan_paths if self._is_stale(path)]
+        old_documents = {path: self._files[path].documents for path in stale if path in self._files}
+        changed, vanished = self._parse(stale)
+        # Files deleted or renamed after the scan count as removed until a later poll finds them again.
+        scan_paths = [path for path in scan_paths if path not in vanished]
+        current_paths = set(scan_paths)
+        removed = [path for path in self._scan_paths if path not in current_paths]
+        old_documents.update((path, self._files[path].documents) for path in removed if path in self._files)
+        previous = {item for path in removed for item in self._violations.get(path, [])}
+        for path in removed:
+            self._files.pop(path, None)
+            self._violations.pop(path, None)
+        self._scan_paths = scan_paths
+
+        touched = [doc for path in changed for doc in self._files[path].documents]
+        changed.extend(removed)
+        touched.extend(doc for path in changed for doc in old_documents.get(path, []))
+        if registry_changed:
+            checked = list(scan_paths)
+            rules = list(self._selected_rules)
+        elif changed:
+            checked = select_changed_scan_paths(scan_paths, changed)
+            rules = self._affected_rules(touched)
+        else:
+            return None
+
+        previous.update(item for path in checked for item in self._violations.get(path, []))
+        self._check(checked, rules)
+        current = {item for path in checked for item in self._violations.get(path, [])}
+        return WatchUpdate(
+            changed_paths=[self.registry_path] if registry_changed else changed,
+            checked_paths=checked,
+            checked_rules=rules,
+            added=sorted(current - previous, key=violation_sort_key),
+            resolved=sorted(previous - current, key=violation_sort_key),
+            total=sum(len(items) for items in self._violations.values()),
+            seconds=time.perf_counter() - started,
+        )
+
+    def _load_registry(self) -> None:
+        self._registry_stamp = file_stamp(self.registry_path)
+        self._config = validate_registry(self.registry_path, REGISTERED_RULES.keys())
+        self._engine = RuleEngine(
+            config=self._config,
+            registered_rules=REGISTERED_RULES,
+            skill_root=self.skill_path.parent,
+        )
+        self._selected_rules = self._engine.resolve_rules(self.only_rules)
+
+    def _build_scan_paths(self) -> List[Path]:
+        include_paths = [*self._config.include_paths, *(self.additional_include_paths or [])]
+        return build_scan_paths(self.skill_path, self.references_dir, include_paths)
+
+    def _affected_rules(self, documents: Sequence[YamlDocument]) -> List[str]:
+        """Selected rules that read any of documents' kinds; documents cover both old and new content.
+
+        Kinds are taken per changed file, not per changed document: an edit shifts the lines of
+        every later document in the file, so their rules must re-run too.
+        """
+        kinds = {doc.data.get("kind") for doc in documents if isinstance(doc.data, dict)}
+        kinds.discard(None)
+        return [
+            rule_id
+            for rule_id in self._selected_rules
+            if self._config.rules[rule_id].inputs.is_affected_by(kinds, documents=bool(documents))
+        ]
+
+    def _is_stale(self, path: Path) -> bool:
+        resident = self._files.get(path)
+        return resident is None or resident.stamp != file_stamp(path)
+
+    def _parse(self, paths: Sequence[Path]) -> Tuple[List[Path], Set[Path]]:
+        """Re-parse paths whose content changed; return them and the paths that could not be read.
+
+        Touched-but-equal files only get a new stamp. A file deleted or renamed since the scan
+        fails to open; it is reported as vanished and its resident entry is left to the caller.
+        """
+        pending: List[Path] = []
+        vanished: Set[Path] = set()
+        for path in paths:
+            resident = self._files.get(path)
+            if resident is not None:
+                try:
+                    key = file_parse_cache_key(path)
+                except OSError:
+                    vanished.add(path)
+                    continue
+                if resident.key == key:
+                    resident.stamp = file_stamp(path)
+                    continue
+            pending.append(path)
+
+        stamps = {path: file_stamp(path) for path in pending}
+        parsed = self._parse_readable(pending)
+        vanished.update(path for path in pending if path not in parsed)
+        for path, (result, key) in parsed.items():
+            documents, violations = materialize_parse_result(path, result)
+            self._files[path] = _ResidentFile(stamps[path], key, documents, violations)
+        return list(parsed), vanished
+
+    def _parse_readable(self, paths: Sequence[Path]) -> Dict[Path, Tuple[FileParseResult, str]]:
+        """parse_paths over paths, retrying one by one to skip files that vanish mid-parse."""
+        try:
+            return dict(zip(paths, parse_paths(paths, parse_workers=self.parse_workers)))
+        except OSError:
+            pass
+        parsed: Dict[Path, Tuple[FileParseResult, str]] = {}
+        for path in paths:
+            try:
+                (parsed[path],) = parse_paths([path], parse_workers=1)
+            except OSError:
+                continue
+        return parsed
+
+    def _check(self, paths: Sequence[Path], rules: Sequence[str]) -> None:
+        """Re-run rules (and re-collect parse violations) over paths; other rules' results stay."""
+        members: Set[Path] = set(paths)
+        ordered = [path for path in self._scan_paths if path in members]
+        context = ScanContext(
+            skill_path=self.skill_path,
+            references_dir=self.references_dir,
+            scanned_paths=ordered,
+            file_texts=MappedFileTexts(ordered),
+            yaml_documents=[doc for path in ordered for doc in self._files[path].documents],
+        )
+        parse_violations = [item for path in ordered for item in self._files[path].parse_violations]
+        violations = self._engine.run(
+            context=context,
+            parse_violations=parse_violations,
+            selected_rules=rules,
+        )
+        kept = set(self._selected_rules) - set(rules)
+        for path in ordered:
+            self._violations[path] = [item for item in self._violations.get(path, []) if item.rule_id in kept]
+        for item in violations:
+            self._violations.setdefault(item.path, []).append(item)
+
+
+def format_watch_update(update: WatchUpdate) -> str:
+    lines = [
+        f"[watch] {len(update.changed_paths)} changed, {len(update.checked_paths)} file(s) re-checked "
+        f"with {len(update.checked_rules)} rule(s) in {update.seconds * 1000:.0f} ms: "
+        f"+{len(update.added)} -{len(update.resolved)} "
+        f"({update.total} total)"
+    ]
+    lines.extend(f"+ {format_violation(item)}" for item in update.added)
+    lines.extend(f"- {format_violation(item)}" for item in update.resolved)
+    return "\n".join(lines) + "\n"
+
+
+def watch(
+    session: WatchSession,
+    stream: TextIO,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll session every interval seconds and print each incremental diff until interrupted.
+
+    Errors (for example an unreadable or deleted registry) are printed once and polling continues.
+    """
+    polls = 0
+    last_error: Optional[str] = None
+    while max_polls is None or polls < max_polls:
+        sleep(interval)
+        polls += 1
+        try:
+            update = session.refresh()
+        except (OSError, ValueError) as exc:
+            if str(exc) != last_error:
+                stream.write(f"ERROR: {exc}\n")
+                stream.flush()
+            last_error = str(exc)
+            continue
+        last_error = None
+        if update is not None:
+            stream.write(format_watch_update(update))
+            stream.flush()
@@ -7,9 +7,9 @@ import argparse
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Mapping, Sequence, Set, Tuple
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
 
-import yaml
+from check_consistency_cache import ContentCache, cached_artifact, default_cache_dir, load_yaml_file, open_cache
 
 
 MUST_SECTION_START = "## MUST Rules (Condensed)"
@@ -42,8 +42,8 @@ def extract_must_bullets(skill_text: str) -> List[str]:
     return bullets
 
 
-def load_rule_ids(rules_file: Path) -> Set[str]:
-    data = yaml.safe_load(rules_file.read_text(encoding="utf-8"))
+def load_rule_ids(rules_file: Path, cache: Optional[ContentCache] = None) -> Set[str]:
+    data = load_yaml_file(rules_file, cache)
     if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
         raise ValueError(f"invalid rules registry format: {rules_file}")
 
@@ -55,8 +55,8 @@ def load_rule_ids(rules_file: Path) -> Set[str]:
     return ids
 
 
-def load_must_mapping(mapping_file: Path) -> Dict[str, Mapping[str, str]]:
-    data = yaml.safe_load(mapping_file.read_text(encoding="utf-8"))
+def load_must_mapping(mapping_file: Path, cache: Optional[ContentCache] = None) -> Dict[str, Mapping[str, str]]:
+    data = load_yaml_file(mapping_file, cache)
     if not isinstance(data, dict) or not isinstance(data.get("must_rules"), list):
         raise ValueError(f"invalid must-rules mapping format: {mapping_file}")
 
@@ -95,13 +95,18 @@ def load_must_mapping(mapping_file: Path) -> Dict[str, Mapping[str, str]]:
     return entries
 
 
-def validate_must_coverage(skill_file: Path, mapping_file: Path, rules_file: Path) -> List[str]:
+def validate_must_coverage(
+    skill_file: Path,
+    mapping_file: Path,
+    rules_file: Path,
+    cache: Optional[ContentCache] = None,
+) -> List[str]:
     errors: List[str] = []
 
-    bullets = extract_must_bullets(skill_file.read_text(encoding="utf-8"))
+    bullets = cached_artifact(cache, "must-bullets", skill_file.read_text(encoding="utf-8"), extract_must_bullets)
     bullet_keys = [normalize_line(item) for item in bullets]
-    mapping = load_must_mapping(mapping_file)
-    rule_ids = load_rule_ids(rules_file)
+    mapping = load_must_mapping(mapping_file, cache)
+    rule_ids = load_rule_ids(rules_file, cache)
 
     missing = [item for item in bullet_keys if item not in mapping]
     extras = [item for item in mapping.keys() if item not in set(bullet_keys)]
@@ -137,6 +142,11 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default="references/rules-registry.yaml",
         help="Path to machine-readable rules registry",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Content-hash keyed cache shared with check_consistency.py (default: $DOCKER_TO_SEALOS_CACHE_DIR)",
+    )
     return parser.parse_args(argv)
 
 
@@ -153,6 +163,7 @@ def main(argv: Sequence[str] | None = None) -> int:
     skill_root = skill_file.parent
     mapping_file = resolve_path(args.mapping, skill_root)
     rules_file = resolve_path(args.rules_file, skill_root)
+    cache_dir = resolve_path(args.cache_dir, skill_root) if args.cache_dir else default_cache_dir()
 
     for required in (skill_file, mapping_file, rules_file):
         if not required.exists():
@@ -160,7 +171,7 @@ def main(argv: Sequence[str] | None = None) -> int:
             return 2
 
     try:
-        errors = validate_must_coverage(skill_file, mapping_file, rules_file)
+        errors = validate_must_coverage(skill_file, mapping_file, rules_file, open_cache(cache_dir))
     except ValueError as exc:
         print(f"ERROR: {exc}")
         return 2
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import argparse
+import json
 import math
 import os
 import re
@@ -11,14 +12,28 @@ import shlex
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 import yaml
 
 from path_converter import path_to_vn_name
+from registry_client import (  # noqa: F401 - require_crane_binary/run_crane_command are re-exported
+    REGISTRY_CLIENT_NAMES,
+    CraneRegistryClient,
+    OfflineRegistryClient,
+    RegistryClient,
+    create_registry_client,
+    require_crane_binary,
+    run_crane_command,
+)
+from yaml_support import safe_load, safe_load_all
 
 
 DB_TYPE_PATTERNS: Dict[str, Tuple[str, ...]] = {
@@ -87,6 +102,13 @@ EXPLICIT_VERSION_TAG_RE = re.compile(
 )
 FLOATING_NUMERIC_TAG_RE = re.compile(r"^v?\d+(?:\.\d+)?$")
 FLOATING_ALIAS_TAGS = {"latest", "stable", "main", "master", "edge", "nightly", "dev"}
+# Concurrent `crane digest` lookups per floating tag; each one is a registry round-trip.
+DIGEST_LOOKUP_WORKERS = 8
+IMAGE_CACHE_DIR_ENV = "DOCKER_TO_SEALOS_IMAGE_CACHE_DIR"
+IMAGE_CACHE_FILE_NAME = "image-resolution.jsonl"
+# Digests of explicit version tags never expire; floating tags move and repositories gain tags.
+FLOATING_DIGEST_TTL_SECONDS = 6 * 3600
+TAG_LIST_TTL_SECONDS = 24 * 3600
 COMPOSE_BRACED_VAR_RE = re.compile(r"\$\{([^}]+)\}")
 COMPOSE_SIMPLE_VAR_RE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
 DB_COMPONENT_RESOURCE_LIMITS = {"cpu": "500m", "memory": "512Mi"}
@@ -292,28 +314,237 @@ def select_best_version_tag(tags: Sequence[str]) -> str:
     return max(explicit_tags, key=_version_sort_key)
 
 
-def require_crane_binary() -> str:
-    crane_bin = shutil.which("crane")
-    if not crane_bin:
-        raise ValueError("crane is required to resolve floating image tags but was not found in PATH")
-    return crane_bin
+class ImageResolutionCache:
+    """`crane digest` and `crane ls` results, optionally persisted as JSON lines under a cache dir.
+
+    Every store appends one {"kind", "key", "value", "stored_at"} line; the last line per key wins
+    on load and malformed lines are ignored. Entries past their TTL count as misses, except in
+    offline mode, where resolution uses whatever the cache holds and never calls crane.
+    Loading keeps only the latest entry per key (and, outside offline mode, only unexpired ones)
+    in memory; once superseded and malformed lines outnumber the latest entries, the file is
+    rewritten atomically with one line per key. Expired entries stay on disk for offline runs.
+    One cache may be shared by concurrent conversions (see compose_to_template_batch.py).
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        offline: bool = False,
+        floating_digest_ttl: float = FLOATING_DIGEST_TTL_SECONDS,
+        tag_list_ttl: float = TAG_LIST_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.offline = offline
+        self.floating_digest_ttl = floating_digest_ttl
+        self.tag_list_ttl = tag_list_ttl
+        self.clock = clock
+        self._entries: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            self._load(path)
+        self.digests = ImageCacheView(self, "digest")
+        self.tags = ImageCacheView(self, "tags")
+
+    @classmethod
+    def in_dir(cls, cache_dir: Path, **kwargs: Any) -> "ImageResolutionCache":
+        return cls(cache_dir / IMAGE_CACHE_FILE_NAME, **kwargs)
+
+    def _load(self, path: Path) -> None:
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        latest: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+                key = (str(record["kind"]), str(record["key"]))
+                latest[key] = (record["value"], float(record["stored_at"]))
+            except (ValueError, TypeError, KeyError):
+                continue
+        if len(lines) - len(latest) > len(latest):
+            self._compact(path, latest)
+        self._entries = latest
+        for kind, key in list(latest):
+            if not self.is_fresh(kind, key):
+                del self._entries[(kind, key)]
+
+    @staticmethod
+    def _compact(path: Path, latest: Mapping[Tuple[str, str], Tuple[Any, float]]) -> None:
+        """Replace path with one line per key via a temp file + os.replace, so readers never see half a file."""
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                for (kind, key), (value, stored_at) in latest.items():
+                    record = {"kind": kind, "key": key, "value": value, "stored_at": stored_at}
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(temp_name, path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+
+    def ttl(self, kind: str, key: str) -> Optional[float]:
+        """Lifetime in seconds of an entry, None when it never expires."""
+        if kind == "digest":
+            _, tag, _ = split_image_reference(key)
+            if tag and is_explicit_version_tag(tag):
+                return None
+            return self.floating_digest_ttl
+        return self.tag_list_ttl
+
+    def is_fresh(self, kind: str, key: str) -> bool:
+        entry = self._entries.get((kind, key))
+        if entry is None:
+            return False
+        ttl = self.ttl(kind, key)
+        return self.offline or ttl is None or self.clock() - entry[1] <= ttl
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        return self._entries[(kind, key)][0] if self.is_fresh(kind, key) else None
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        stored_at = self.clock()
+        record = {"kind": kind, "key": key, "value": value, "stored_at": stored_at}
+        with self._lock:
+            self._entries[(kind, key)] = (value, stored_at)
+            if self.path is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError:
+                # An unwritable cache directory must never fail the conversion itself.
+                pass
 
+    def discard(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((kind, key), None)
+
+    def keys_of(self, kind: str) -> List[str]:
+        with self._lock:
+            entries = list(self._entries)
+        return [key for entry_kind, key in entries if entry_kind == kind and self.is_fresh(kind, key)]
+
+
+class ImageCacheView(MutableMapping[str, Any]):
+    """Dict-like view of one kind of ImageResolutionCache entry, as resolve_image_reference expects."""
+
+    def __init__(self, cache: ImageResolutionCache, kind: str) -> None:
+        self._cache = cache
+        self._kind = kind
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._cache.get(self._kind, key)
+        if value is None:
+            raise KeyError(key)
+        return value
 
-def run_crane_command(crane_bin: str, args: Sequence[str]) -> str:
-    command = [crane_bin, *args]
-    result = subprocess.run(command, capture_output=True, text=True)
-    if result.returncode != 0:
-        detail = result.stderr.strip() or result.stdout.strip() or "unknown error"
-        raise ValueError(f"crane command failed ({' '.join(command)}): {detail}")
-    return result.stdout.strip()
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._cache.put(self._kind, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._cache.discard(self._kind, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cache.keys_of(self._kind))
+
+    def __len__(self) -> int:
+        return len(self._cache.keys_of(self._kind))
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._cache.is_fresh(self._kind, key)
+
+
+def lookup_candidate_digest(client: RegistryClient, repository: str, tag: str) -> Optional[str]:
+    try:
+        return client.digest(repository, tag)
+    except ValueError:
+        return None
+
+
+def candidate_version_tags(floating_tag: str, tags: Sequence[str]) -> List[str]:
+    """Explicit version tags that floating_tag may point to, most likely first.
+
+    A numeric floating tag only matches its own prefix (`v2` -> 2.x.y, `2.1` -> 2.1.x); candidates
+    are ordered newest first, and for `stable` releases come before pre-release/build tags.
+    """
+    candidates = [tag for tag in tags if is_explicit_version_tag(tag)]
+    normalized = floating_tag.strip().lower()
+    if FLOATING_NUMERIC_TAG_RE.fullmatch(normalized) is not None:
+        prefix = tuple(int(part) for part in normalized.lstrip("v").split("."))
+        candidates = [tag for tag in candidates if _version_sort_key(tag)[: len(prefix)] == prefix]
+    ordered = sorted(candidates, key=_version_sort_key, reverse=True)
+    if normalized == "stable":
+        ordered.sort(key=lambda tag: _version_sort_key(tag)[3], reverse=True)
+    return ordered
+
+
+def find_matching_version_tag(
+    client: RegistryClient,
+    repository: str,
+    ordered_tags: Sequence[str],
+    source_digest: str,
+    digest_cache: MutableMapping[str, str],
+    workers: int = DIGEST_LOOKUP_WORKERS,
+) -> Optional[str]:
+    """Return the first of ordered_tags whose digest equals source_digest, or None.
+
+    Uncached digests are fetched by a thread pool that keeps at most `workers` lookups in flight
+    ahead of the candidate being checked, so results are consumed in the given order and at most
+    `workers` lookups are spent past the match. With tags from candidate_version_tags the first
+    match is the best one.
+    """
+    ordered = list(ordered_tags)
+    cached = {tag: digest_cache.get(f"{repository}:{tag}") for tag in ordered}
+    pending = deque(tag for tag in ordered if cached[tag] is None)
+    if not pending:
+        return next((tag for tag in ordered if cached[tag] == source_digest), None)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending))))
+    futures: Dict[str, Future[Optional[str]]] = {}
+
+    def submit_ahead() -> None:
+        while pending and len(futures) < workers:
+            tag = pending.popleft()
+            futures[tag] = executor.submit(lookup_candidate_digest, client, repository, tag)
+
+    try:
+        for tag in ordered:
+            candidate_image = f"{repository}:{tag}"
+            candidate_digest = cached[tag]
+            if candidate_digest is None:
+                submit_ahead()
+                candidate_digest = futures.pop(tag).result()
+                if candidate_digest is None:
+                    continue
+                digest_cache[candidate_image] = candidate_digest
+            if candidate_digest == source_digest:
+                return tag
+        return None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 def resolve_image_reference(
     image: str,
     *,
-    digest_cache: Optional[Dict[str, str]] = None,
-    tag_cache: Optional[Dict[str, List[str]]] = None,
+    digest_cache: Optional[MutableMapping[str, str]] = None,
+    tag_cache: Optional[MutableMapping[str, List[str]]] = None,
+    workers: int = DIGEST_LOOKUP_WORKERS,
+    offline: bool = False,
+    client: Optional[RegistryClient] = None,
 ) -> str:
+    """Pin a floating tag to the highest explicit version tag sharing its digest, else to the digest.
+
+    Lookups go through client (a crane subprocess client when None). offline resolves from
+    digest_cache/tag_cache only: a missing source digest or tag list is an error and uncached
+    candidates are skipped, like candidates whose lookup fails.
+    """
     repository, tag, digest = split_image_reference(image)
     if digest:
         return image.strip()
@@ -328,36 +559,32 @@ def resolve_image_reference(
 
     digest_cache = digest_cache if digest_cache is not None else {}
     tag_cache = tag_cache if tag_cache is not None else {}
-    crane_bin = require_crane_binary()
+    if offline:
+        client = OfflineRegistryClient()
+    elif client is None:
+        client = CraneRegistryClient()
 
     source_image = f"{repository}:{tag}"
     source_digest = digest_cache.get(source_image)
     if source_digest is None:
-        source_digest = run_crane_command(crane_bin, ["digest", source_image])
+        source_digest = client.digest(repository, tag)
         digest_cache[source_image] = source_digest
 
     tags = tag_cache.get(repository)
     if tags is None:
-        tags_output = run_crane_command(crane_bin, ["ls", repository])
-        tags = [line.strip() for line in tags_output.splitlines() if line.strip()]
+        tags = client.list_tags(repository)
         tag_cache[repository] = tags
 
-    candidate_tags = [candidate for candidate in tags if is_explicit_version_tag(candidate)]
-    matched_tags: List[str] = []
-    for candidate_tag in candidate_tags:
-        candidate_image = f"{repository}:{candidate_tag}"
-        candidate_digest = digest_cache.get(candidate_image)
-        if candidate_digest is None:
-            try:
-                candidate_digest = run_crane_command(crane_bin, ["digest", candidate_image])
-            except ValueError:
-                continue
-            digest_cache[candidate_image] = candidate_digest
-        if candidate_digest == source_digest:
-            matched_tags.append(candidate_tag)
-
-    if matched_tags:
-        best_tag = select_best_version_tag(matched_tags)
+    candidate_tags = candidate_version_tags(tag, tags)
+    best_tag = find_matching_version_tag(
+        client,
+        repository,
+        candidate_tags,
+        source_digest,
+        digest_cache,
+        workers=workers,
+    )
+    if best_tag is not None:
         return f"{repository}:{best_tag}"
 
     return f"{repository}@{source_digest}"
@@ -470,7 +697,7 @@ def normalize_image_reference(raw_image: str, service_name: str) -> str:
 
 
 def parse_compose(compose_path: Path) -> Mapping[str, Any]:
-    data = yaml.safe_load(compose_path.read_text(encoding="utf-8"))
+    data = safe_load(compose_path.read_text(encoding="utf-8"))
     if not isinstance(data, dict):
         raise ValueError("compose file must be a YAML object")
     services = data.get("services")
@@ -1036,7 +1263,7 @@ def load_service_shapes_with_kompose(compose_path: Path, required: bool) -> Opti
         shapes: Dict[str, ServiceShape] = {}
         for path in sorted([*workdir.glob("*.yaml"), *workdir.glob("*.yml")]):
             text = path.read_text(encoding="utf-8")
-            for doc in yaml.safe_load_all(text):
+            for doc in safe_load_all(text):
                 if not isinstance(doc, dict):
                     continue
                 extracted = _extract_shape_from_kompose_doc(doc)
@@ -2097,14 +2324,15 @@ def build_documents(
     compose_data: Mapping[str, Any],
     meta: MetadataOptions,
     kompose_shapes: Optional[Mapping[str, ServiceShape]] = None,
+    image_cache: Optional[ImageResolutionCache] = None,
+    registry_client: Optional[RegistryClient] = None,
 ) -> List[Dict[str, Any]]:
     normalized_images = validate_images(compose_data)
     service_items = list(iter_services(compose_data))
     if not service_items:
         raise ValueError("compose file has no services")
 
-    digest_cache: Dict[str, str] = {}
-    tag_cache: Dict[str, List[str]] = {}
+    image_cache = image_cache if image_cache is not None else ImageResolutionCache()
     resolved_images: Dict[str, str] = {}
     for service_name, service in service_items:
         source_image = normalized_images.get(service_name, str(service.get("image", "")).strip())
@@ -2115,8 +2343,10 @@ def build_documents(
             continue
         resolved_images[service_name] = resolve_image_reference(
             source_image,
-            digest_cache=digest_cache,
-            tag_cache=tag_cache,
+            digest_cache=image_cache.digests,
+            tag_cache=image_cache.tags,
+            offline=image_cache.offline,
+            client=registry_client,
         )
 
     db_services: Dict[str, str] = {}
@@ -2218,9 +2448,17 @@ def convert_compose_to_template(
     meta: MetadataOptions,
     kompose_shapes: Optional[Mapping[str, ServiceShape]] = None,
     write_files: bool = True,
+    image_cache: Optional[ImageResolutionCache] = None,
+    registry_client: Optional[RegistryClient] = None,
 ) -> Tuple[Path, str]:
     compose_data = parse_compose(compose_path)
-    documents = build_documents(compose_data, meta, kompose_shapes=kompose_shapes)
+    documents = build_documents(
+        compose_data,
+        meta,
+        kompose_shapes=kompose_shapes,
+        image_cache=image_cache,
+        registry_client=registry_client,
+    )
     app_dir = output_root / meta.app_name
     index_path = app_dir / "index.yaml"
     rendered = render_index_yaml(documents)
@@ -2232,7 +2470,18 @@ def convert_compose_to_template(
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Convert Docker Compose to Sealos template deterministically")
-    parser.add_argument("--compose", required=True, help="Path to docker-compose YAML")
+    parser.add_argument("--compose", default="", help="Path to docker-compose YAML")
+    parser.add_argument(
+        "--batch",
+        default="",
+        help="Convert every compose project under a directory, or the entries of a YAML manifest, instead of --compose",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Parallel conversions for --batch (0 = default of 4)")
+    parser.add_argument(
+        "--batch-report",
+        default="",
+        help="Write a JSON report (per-file timing and errors) for --batch",
+    )
     parser.add_argument("--output-dir", default="template", help="Output template root directory")
     parser.add_argument("--app-name", default="", help="Template app name (lowercase k8s format)")
     parser.add_argument("--title", default="", help="Template title")
@@ -2252,12 +2501,80 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default="always",
         help="Use kompose-generated workload shapes: always (required, default), auto (best effort), never (disable)",
     )
+    parser.add_argument(
+        "--registry-client",
+        choices=REGISTRY_CLIENT_NAMES,
+        default="crane",
+        help="Image lookups via the crane binary (default) or native OCI distribution HTTP with pooled connections",
+    )
+    parser.add_argument(
+        "--insecure-registry",
+        action="append",
+        default=[],
+        help="Registry host[:port] reached over plain HTTP by --registry-client http (repeatable)",
+    )
+    parser.add_argument(
+        "--image-cache-dir",
+        default=os.environ.get(IMAGE_CACHE_DIR_ENV, ""),
+        help=f"Persist registry digest/tag lookups here across runs (default: ${IMAGE_CACHE_DIR_ENV})",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Resolve floating image tags only from --image-cache-dir, ignoring TTLs and never contacting a registry",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Print index.yaml content without writing files")
     return parser.parse_args(argv)
 
 
+def open_image_cache(cache_dir: str, offline: bool) -> ImageResolutionCache:
+    if offline and not cache_dir:
+        raise ValueError(f"--offline requires --image-cache-dir (or ${IMAGE_CACHE_DIR_ENV})")
+    if not cache_dir:
+        return ImageResolutionCache(offline=offline)
+    return ImageResolutionCache.in_dir(Path(cache_dir).resolve(), offline=offline)
+
+
+def main_batch(args: argparse.Namespace) -> int:
+    import compose_to_template_batch as batch
+
+    if args.app_name:
+        raise SystemExit("ERROR: --app-name cannot be combined with --batch (set app_name per manifest entry)")
+    if args.jobs < 0:
+        raise SystemExit("ERROR: --jobs must be >= 0")
+    registry_client = create_registry_client(args.registry_client, args.insecure_registry)
+    started = time.perf_counter()
+    try:
+        jobs = batch.load_batch_jobs(Path(args.batch).resolve())
+        results = batch.run_batch(
+            jobs,
+            args,
+            Path(args.output_dir).resolve(),
+            image_cache=open_image_cache(args.image_cache_dir, args.offline),
+            registry_client=registry_client,
+            workers=args.jobs or None,
+            write_files=not args.dry_run,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"ERROR: {exc}") from exc
+    finally:
+        registry_client.close()
+    wall_seconds = time.perf_counter() - started
+
+    print(batch.format_batch_summary(results, wall_seconds, Path.cwd()), end="")
+    if args.batch_report:
+        batch.write_batch_report(batch.batch_report(results, wall_seconds), Path(args.batch_report))
+    return 1 if any(result.error is not None for result in results) else 0
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
+    if bool(args.compose) == bool(args.batch):
+        raise SystemExit("ERROR: pass exactly one of --compose or --batch")
+    if args.batch:
+        return main_batch(args)
+    if args.batch_report:
+        raise SystemExit("ERROR: --batch-report requires --batch")
     compose_path = Path(args.compose).resolve()
     if not compose_path.exists():
         raise SystemExit(f"ERROR: compose file not found: {compose_path}")
@@ -2266,7 +2583,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     meta = infer_metadata(args, compose_data, compose_path)
     output_root = Path(args.output_dir).resolve()
 
+    registry_client = create_registry_client(args.registry_client, args.insecure_registry)
     try:
+        image_cache = open_image_cache(args.image_cache_dir, args.offline)
         kompose_shapes = resolve_kompose_shapes(compose_path, args.kompose_mode)
         index_path, rendered = convert_compose_to_template(
             compose_path=compose_path,
@@ -2274,9 +2593,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             meta=meta,
             kompose_shapes=kompose_shapes,
             write_files=not args.dry_run,
+            image_cache=image_cache,
+            registry_client=registry_client,
         )
     except ValueError as exc:
         raise SystemExit(f"ERROR: {exc}") from exc
+    finally:
+        registry_client.close()
 
     if args.dry_run:
         print(rendered)
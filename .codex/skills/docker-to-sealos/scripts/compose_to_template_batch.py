@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Batch compose -> template conversion over a directory or manifest, with shared image-resolution state."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from compose_to_template import (
+    ImageResolutionCache,
+    MetadataOptions,
+    convert_compose_to_template,
+    infer_metadata,
+    normalize_k8s_name,
+    parse_compose,
+    resolve_kompose_shapes,
+)
+from registry_client import RegistryClient
+from yaml_support import safe_load
+
+
+COMPOSE_FILE_NAMES = ("docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml")
+# Manifest entry key -> compose_to_template.py argument it overrides.
+MANIFEST_FIELDS = {
+    "app_name": "app_name",
+    "title": "title",
+    "description": "description",
+    "url": "url",
+    "git_repo": "git_repo",
+    "author": "author",
+    "categories": "category",
+    "kompose_mode": "kompose_mode",
+}
+# Conversions are dominated by kompose subprocesses and registry round-trips, not Python work.
+DEFAULT_BATCH_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    compose_path: Path
+    overrides: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    compose_path: Path
+    seconds: float
+    app_name: Optional[str] = None
+    index_path: Optional[Path] = None
+    error: Optional[str] = None
+
+
+def discover_compose_files(root: Path) -> List[Path]:
+    """Compose files below root, one per directory (docker-compose.yml preferred), in path order."""
+    found: Dict[Path, Path] = {}
+    for name in COMPOSE_FILE_NAMES:
+        for path in sorted(root.rglob(name)):
+            found.setdefault(path.parent, path)
+    return sorted(found.values())
+
+
+def load_manifest(manifest_path: Path) -> List[BatchJob]:
+    """Jobs from a YAML list (or {templates: [...]}) of {compose, app_name, title, ..., categories} entries.
+
+    compose paths are relative to the manifest; other keys override the matching CLI options.
+    """
+    data = safe_load(manifest_path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("templates")
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"batch manifest must be a non-empty list of entries: {manifest_path}")
+
+    jobs: List[BatchJob] = []
+    for index, entry in enumerate(data, start=1):
+        if not isinstance(entry, dict) or not isinstance(entry.get("compose"), str):
+            raise ValueError(f"batch manifest entry #{index} must be an object with a compose path")
+        unknown = sorted(set(entry) - {"compose", *MANIFEST_FIELDS})
+        if unknown:
+            raise ValueError(f"batch manifest entry #{index} has unknown field(s): {', '.join(unknown)}")
+        overrides: Dict[str, Any] = {}
+        for key, option in MANIFEST_FIELDS.items():
+            if key not in entry:
+                continue
+            value = entry[key]
+            if key == "categories":
+                if isinstance(value, str):
+                    value = [value]
+                if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                    raise ValueError(f"batch manifest entry #{index} categories must be a list of strings")
+            elif not isinstance(value, str):
+                raise ValueError(f"batch manifest entry #{index} {key} must be a string")
+            overrides[option] = value
+        jobs.append(BatchJob((manifest_path.parent / entry["compose"]).resolve(), overrides))
+    return jobs
+
+
+def load_batch_jobs(source: Path) -> List[BatchJob]:
+    """Jobs for a directory of compose projects or a manifest file."""
+    if source.is_dir():
+        paths = discover_compose_files(source)
+        if not paths:
+            raise ValueError(f"no compose files found under: {source}")
+        return [BatchJob(path.resolve()) for path in paths]
+    if source.is_file():
+        return load_manifest(source)
+    raise ValueError(f"batch source not found: {source}")
+
+
+def _default_app_name(compose_data: Mapping[str, Any], compose_path: Path) -> str:
+    """Compose `name`, else the project directory for conventional compose file names, else the file stem."""
+    compose_name = compose_data.get("name")
+    if isinstance(compose_name, str) and compose_name.strip():
+        return normalize_k8s_name(compose_name)
+    if compose_path.name in COMPOSE_FILE_NAMES:
+        return normalize_k8s_name(compose_path.parent.name)
+    return normalize_k8s_name(compose_path.stem)
+
+
+def prepare_job(job: BatchJob, defaults: argparse.Namespace) -> Tuple[argparse.Namespace, MetadataOptions]:
+    """Options (CLI defaults plus manifest overrides) and metadata for one job; raises on invalid input."""
+    compose_data = parse_compose(job.compose_path)
+    opts = argparse.Namespace(**{**vars(defaults), **job.overrides})
+    if not opts.app_name:
+        opts.app_name = _default_app_name(compose_data, job.compose_path)
+    return opts, infer_metadata(opts, compose_data, job.compose_path)
+
+
+def convert_job(
+    job: BatchJob,
+    opts: argparse.Namespace,
+    meta: MetadataOptions,
+    output_root: Path,
+    image_cache: ImageResolutionCache,
+    registry_client: Optional[RegistryClient],
+    write_files: bool,
+) -> BatchResult:
+    started = time.perf_counter()
+    try:
+        index_path, _ = convert_compose_to_template(
+            compose_path=job.compose_path,
+            output_root=output_root,
+            meta=meta,
+            kompose_shapes=resolve_kompose_shapes(job.compose_path, opts.kompose_mode),
+            write_files=write_files,
+            image_cache=image_cache,
+            registry_client=registry_client,
+        )
+    except (ValueError, OSError, yaml.YAMLError) as exc:
+        return BatchResult(job.compose_path, time.perf_counter() - started, meta.app_name, error=str(exc))
+    return BatchResult(job.compose_path, time.perf_counter() - started, meta.app_name, index_path)
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    defaults: argparse.Namespace,
+    output_root: Path,
+    image_cache: Optional[ImageResolutionCache] = None,
+    registry_client: Optional[RegistryClient] = None,
+    workers: Optional[int] = None,
+    write_files: bool = True,
+) -> List[BatchResult]:
+    """Convert every job in a thread pool; results keep job order and failures do not stop the batch.
+
+    Metadata is resolved up front, so a job whose app name an earlier job already uses fails
+    instead of overwriting that output. All conversions share image_cache and registry_client,
+    so a repository is resolved once per batch (or once per TTL with a persistent cache).
+    """
+    image_cache = image_cache if image_cache is not None else ImageResolutionCache()
+    results: List[Optional[BatchResult]] = [None] * len(jobs)
+    owners: Dict[str, Path] = {}
+    pending: List[Tuple[int, BatchJob, argparse.Namespace, MetadataOptions]] = []
+    for position, job in enumerate(jobs):
+        started = time.perf_counter()
+        try:
+            opts, meta = prepare_job(job, defaults)
+        except (ValueError, OSError, yaml.YAMLError) as exc:
+            results[position] = BatchResult(job.compose_path, time.perf_counter() - started, error=str(exc))
+            continue
+        owner = owners.setdefault(meta.app_name, job.compose_path)
+        if owner != job.compose_path:
+            error = f"app name {meta.app_name} is already generated from {owner}"
+            seconds = time.perf_counter() - started
+            results[position] = BatchResult(job.compose_path, seconds, meta.app_name, error=error)
+            continue
+        pending.append((position, job, opts, meta))
+
+    def convert(task: Tuple[int, BatchJob, argparse.Namespace, MetadataOptions]) -> BatchResult:
+        _, job, opts, meta = task
+        return convert_job(job, opts, meta, output_root, image_cache, registry_client, write_files)
+
+    workers = max(1, min(workers or DEFAULT_BATCH_WORKERS, len(pending) or 1))
+    if workers == 1:
+        converted = [convert(task) for task in pending]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            converted = list(pool.map(convert, pending))
+    for (position, *_), result in zip(pending, converted):
+        results[position] = result
+    return [result for result in results if result is not None]
+
+
+def batch_report(results: Sequence[BatchResult], wall_seconds: float) -> Dict[str, Any]:
+    return {
+        "converted": sum(1 for result in results if result.error is None),
+        "failed": sum(1 for result in results if result.error is not None),
+        "wall_seconds": round(wall_seconds, 3),
+        "results": [
+            {
+                "compose": str(result.compose_path),
+                "app_name": result.app_name,
+                "index": str(result.index_path) if result.index_path is not None else None,
+                "seconds": round(result.seconds, 3),
+                "error": result.error,
+            }
+            for result in results
+        ],
+    }
+
+
+def write_batch_report(report: Mapping[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def format_batch_summary(results: Sequence[BatchResult], wall_seconds: float, base: Path) -> str:
+    """One line per compose file (status, time, output or error) and a totals line."""
+    lines: List[str] = []
+    for result in results:
+        try:
+            label = result.compose_path.relative_to(base).as_posix()
+        except ValueError:
+            label = str(result.compose_path)
+        detail = f"ERROR: {result.error}" if result.error is not None else f"-> {result.index_path}"
+        status = "FAIL" if result.error is not None else "OK"
+        lines.append(f"[{status}] {label} ({result.seconds * 1000:.0f} ms) {detail}")
+    failed = sum(1 for result in results if result.error is not None)
+    lines.append(f"{len(results) - failed} converted, {failed} failed in {wall_seconds:.2f}s")
+    return "\n".join(lines) + "\n"
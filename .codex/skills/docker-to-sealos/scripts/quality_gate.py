@@ -3,11 +3,15 @@
 
 from __future__ import annotations
 
+import argparse
 import os
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
-from typing import List, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+from check_consistency_cache import CACHE_DIR_ENV, default_cache_dir
 
 
 def _resolve_artifact_targets(root: Path) -> str:
@@ -44,9 +48,10 @@ def validate_artifact_targets(artifacts: str, allow_empty: bool) -> Tuple[bool,
     )
 
 
-def build_commands(root: Path, artifacts: str) -> List[Tuple[str, Sequence[str]]]:
+def build_commands(root: Path, artifacts: str, cache_dir: Optional[Path] = None) -> List[Tuple[str, Sequence[str]]]:
     scripts_dir = root / "scripts"
     python = sys.executable
+    cache_args = ["--cache-dir", str(cache_dir)] if cache_dir is not None else []
     consistency_command = [
         python,
         str(scripts_dir / "check_consistency.py"),
@@ -59,6 +64,7 @@ def build_commands(root: Path, artifacts: str) -> List[Tuple[str, Sequence[str]]
     ]
     if artifacts:
         consistency_command.extend(["--artifacts", artifacts])
+    consistency_command.extend(cache_args)
 
     return [
         (
@@ -73,10 +79,22 @@ def build_commands(root: Path, artifacts: str) -> List[Tuple[str, Sequence[str]]
             "compose converter tests",
             (python, str(scripts_dir / "test_compose_to_template.py")),
         ),
+        (
+            "registry client tests",
+            (python, str(scripts_dir / "test_registry_client.py")),
+        ),
         (
             "must coverage validator tests",
             (python, str(scripts_dir / "test_check_must_coverage.py")),
         ),
+        (
+            "yaml loader parity tests",
+            (python, str(scripts_dir / "test_yaml_support.py")),
+        ),
+        (
+            "consistency benchmark tests",
+            (python, str(scripts_dir / "test_benchmark_check_consistency.py")),
+        ),
         (
             "rules consistency check",
             tuple(consistency_command),
@@ -92,23 +110,31 @@ def build_commands(root: Path, artifacts: str) -> List[Tuple[str, Sequence[str]]
                 str(root / "references" / "must-rules-map.yaml"),
                 "--rules-file",
                 str(root / "references" / "rules-registry.yaml"),
+                *cache_args,
             ),
         ),
     ]
 
 
-def main() -> int:
-    root = Path(__file__).resolve().parent.parent
-    artifacts = _resolve_artifact_targets(root)
-    ok, message = validate_artifact_targets(artifacts, _allow_empty_artifacts())
-    if message:
-        print(message)
-    if not ok:
-        return 2
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run every docker-to-sealos skill check")
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help=(
+            f"Parse cache shared by all steps (default: ${CACHE_DIR_ENV}, "
+            "else a temporary directory for this run)"
+        ),
+    )
+    return parser.parse_args(argv)
 
-    for title, command in build_commands(root, artifacts):
+
+def run_steps(root: Path, artifacts: str, cache_dir: Path) -> int:
+    """Run every step with one shared cache so SKILL.md, references and the registry are parsed once."""
+    env = {**os.environ, CACHE_DIR_ENV: str(cache_dir)}
+    for title, command in build_commands(root, artifacts, cache_dir):
         print(f"[RUN] {title}")
-        result = subprocess.run(command, cwd=root)
+        result = subprocess.run(command, cwd=root, env=env)
         if result.returncode != 0:
             print(f"[FAIL] {title}")
             return result.returncode
@@ -117,5 +143,22 @@ def main() -> int:
     return 0
 
 
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    root = Path(__file__).resolve().parent.parent
+    artifacts = _resolve_artifact_targets(root)
+    ok, message = validate_artifact_targets(artifacts, _allow_empty_artifacts())
+    if message:
+        print(message)
+    if not ok:
+        return 2
+
+    cache_dir = Path(args.cache_dir).resolve() if args.cache_dir else default_cache_dir()
+    if cache_dir is not None:
+        return run_steps(root, artifacts, cache_dir)
+    with tempfile.TemporaryDirectory(prefix="docker-to-sealos-cache-") as temp_dir:
+        return run_steps(root, artifacts, Path(temp_dir))
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
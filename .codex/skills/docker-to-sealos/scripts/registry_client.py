@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Registry client backends (crane subprocess, OCI distribution HTTP, in-process fake) for image resolution."""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import re
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+
+REGISTRY_CLIENT_NAMES = ("crane", "http")
+DOCKER_HUB_REGISTRY = "registry-1.docker.io"
+DOCKER_HUB_ALIASES = {"docker.io", "index.docker.io", DOCKER_HUB_REGISTRY}
+# Same preference order as crane: multi-arch indexes first, so digests match `crane digest`.
+MANIFEST_ACCEPT = ", ".join(
+    (
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    )
+)
+TAG_PAGE_SIZE = 1000
+HTTP_TIMEOUT_SECONDS = 30.0
+LINK_NEXT_RE = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+CHALLENGE_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+
+
+def require_crane_binary() -> str:
+    crane_bin = shutil.which("crane")
+    if not crane_bin:
+        raise ValueError("crane is required to resolve floating image tags but was not found in PATH")
+    return crane_bin
+
+
+def run_crane_command(crane_bin: str, args: Sequence[str]) -> str:
+    command = [crane_bin, *args]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        detail = result.stderr.strip() or result.stdout.strip() or "unknown error"
+        raise ValueError(f"crane command failed ({' '.join(command)}): {detail}")
+    return result.stdout.strip()
+
+
+class RegistryClient(ABC):
+    """Digest and tag-list lookups for image repositories; failures raise ValueError.
+
+    Implementations must be safe to call from several threads at once (candidate digests are
+    looked up concurrently).
+    """
+
+    name = ""
+
+    @abstractmethod
+    def digest(self, repository: str, tag: str) -> str:
+        """Manifest digest (sha256:...) that repository:tag currently points to."""
+
+    @abstractmethod
+    def list_tags(self, repository: str) -> List[str]:
+        """Every tag of repository, in registry order."""
+
+    def close(self) -> None:
+        """Release pooled resources; the client must not be used afterwards."""
+
+
+class CraneRegistryClient(RegistryClient):
+    """One `crane digest` / `crane ls` subprocess per lookup; crane is located on first use."""
+
+    name = "crane"
+
+    def __init__(self, crane_bin: Optional[str] = None) -> None:
+        self._crane_bin = crane_bin
+
+    @property
+    def crane_bin(self) -> str:
+        if self._crane_bin is None:
+            self._crane_bin = require_crane_binary()
+        return self._crane_bin
+
+    def digest(self, repository: str, tag: str) -> str:
+        return run_crane_command(self.crane_bin, ["digest", f"{repository}:{tag}"])
+
+    def list_tags(self, repository: str) -> List[str]:
+        output = run_crane_command(self.crane_bin, ["ls", repository])
+        return [line.strip() for line in output.splitlines() if line.strip()]
+
+
+def split_repository(repository: str) -> Tuple[str, str]:
+    """(registry host, repository name) with Docker Hub defaults: `nginx` -> registry-1.docker.io, library/nginx."""
+    first, separator, rest = repository.partition("/")
+    if separator and ("." in first or ":" in first or first == "localhost"):
+        host, name = first, rest
+    else:
+        host, name = DOCKER_HUB_REGISTRY, repository
+    if host in DOCKER_HUB_ALIASES:
+        host = DOCKER_HUB_REGISTRY
+        if "/" not in name:
+            name = f"library/{name}"
+    return host, name
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host); a connection serves one request at a time."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme: str, netloc: str) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+            self.opened += 1
+        factory = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return factory(netloc, timeout=self.timeout), False
+
+    def _release(self, scheme: str, netloc: str, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+
+    def request(self, method: str, url: str, headers: Mapping[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        while True:
+            connection, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                connection.request(method, target, headers=dict(headers))
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                connection.close()
+                if reused:
+                    # The server may have dropped an idle keep-alive connection; retry on a fresh one.
+                    continue
+                raise ValueError(f"registry request failed ({method} {url}): {exc}") from exc
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(parts.scheme, parts.netloc, connection)
+            return response.status, {key.lower(): value for key, value in response.getheaders()}, body
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+class HttpRegistryClient(RegistryClient):
+    """OCI distribution API client with pooled keep-alive connections and anonymous bearer tokens.
+
+    Digests come from a HEAD on the manifest (Docker-Content-Digest), falling back to hashing a
+    GET body for registries that omit the header; tag lists follow `Link: rel="next"` pages.
+    Hosts in insecure_hosts (and localhost) are reached over plain HTTP.
+    """
+
+    name = "http"
+
+    def __init__(self, insecure_hosts: Sequence[str] = (), timeout: float = HTTP_TIMEOUT_SECONDS) -> None:
+        self.insecure_hosts = set(insecure_hosts)
+        self._pool = _ConnectionPool(timeout)
+        self._tokens: Dict[Tuple[str, str], str] = {}
+
+    @property
+    def connections_opened(self) -> int:
+        return self._pool.opened
+
+    def _base_url(self, host: str) -> str:
+        hostname = host.rsplit(":", 1)[0]
+        plain = host in self.insecure_hosts or hostname in ("localhost", "127.0.0.1")
+        return f"{'http' if plain else 'https'}://{host}"
+
+    def _fetch_token(self, challenge: str, name: str) -> str:
+        scheme, _, params_text = challenge.partition(" ")
+        params = dict(CHALLENGE_PARAM_RE.findall(params_text))
+        if scheme.lower() != "bearer" or "realm" not in params:
+            raise ValueError(f"unsupported registry auth challenge: {challenge}")
+        query = {"scope": params.get("scope") or f"repository:{name}:pull"}
+        if params.get("service"):
+            query["service"] = params["service"]
+        url = f"{params['realm']}?{urlencode(query)}"
+        status, _, body = self._pool.request("GET", url, {"Accept": "application/json"})
+        if status != 200:
+            raise ValueError(f"registry token request failed ({url}): HTTP {status}")
+        try:
+            payload = json.loads(body)
+            return str(payload.get("token") or payload["access_token"])
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"registry token response is not valid ({url})") from exc
+
+    def _request(
+        self,
+        method: str,
+        host: str,
+        name: str,
+        url: str,
+        headers: Mapping[str, str],
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send with the cached token for (host, name); on 401 fetch a token once and retry."""
+
+        def send() -> Tuple[int, Dict[str, str], bytes]:
+            token = self._tokens.get((host, name))
+            auth = {"Authorization": f"Bearer {token}"} if token else {}
+            return self._pool.request(method, url, {**headers, **auth})
+
+        status, response_headers, body = send()
+        if status == 401:
+            self._tokens[(host, name)] = self._fetch_token(response_headers.get("www-authenticate", ""), name)
+            status, response_headers, body = send()
+        return status, response_headers, body
+
+    def digest(self, repository: str, tag: str) -> str:
+        host, name = split_repository(repository)
+        url = f"{self._base_url(host)}/v2/{name}/manifests/{tag}"
+        headers = {"Accept": MANIFEST_ACCEPT}
+        status, response_headers, _ = self._request("HEAD", host, name, url, headers)
+        if status == 200 and response_headers.get("docker-content-digest"):
+            return response_headers["docker-content-digest"]
+        if status == 200:
+            status, response_headers, body = self._request("GET", host, name, url, headers)
+            if status == 200:
+                return response_headers.get("docker-content-digest") or f"sha256:{hashlib.sha256(body).hexdigest()}"
+        raise ValueError(f"registry manifest lookup failed ({repository}:{tag}): HTTP {status}")
+
+    def list_tags(self, repository: str) -> List[str]:
+        host, name = split_repository(repository)
+        url: Optional[str] = f"{self._base_url(host)}/v2/{name}/tags/list?n={TAG_PAGE_SIZE}"
+        tags: List[str] = []
+        while url:
+            status, response_headers, body = self._request("GET", host, name, url, {"Accept": "application/json"})
+            if status != 200:
+                raise ValueError(f"registry tag list failed ({repository}): HTTP {status}")
+            try:
+                page = json.loads(body).get("tags") or []
+            except (ValueError, AttributeError) as exc:
+                raise ValueError(f"registry tag list is not valid JSON ({repository})") from exc
+            tags.extend(str(tag) for tag in page)
+            match = LINK_NEXT_RE.search(response_headers.get("link", ""))
+            url = urljoin(url, match.group(1)) if match else None
+        return tags
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+class FakeRegistryClient(RegistryClient):
+    """In-process registry: repository -> {tag: digest}, with optional per-lookup latency.
+
+    Every lookup is recorded in calls as ("digest", "repo:tag") or ("ls", "repo"), so tests and
+    benchmarks can count round-trips without network access.
+    """
+
+    name = "fake"
+
+    def __init__(self, repositories: Mapping[str, Mapping[str, str]], latency: float = 0.0) -> None:
+        self.repositories = {repository: dict(tags) for repository, tags in repositories.items()}
+        self.latency = latency
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def _record(self, call: Tuple[str, str]) -> None:
+        with self._lock:
+            self.calls.append(call)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def digest(self, repository: str, tag: str) -> str:
+        self._record(("digest", f"{repository}:{tag}"))
+        digest = self.repositories.get(repository, {}).get(tag)
+        if digest is None:
+            raise ValueError(f"manifest unknown: {repository}:{tag}")
+        return digest
+
+    def list_tags(self, repository: str) -> List[str]:
+        self._record(("ls", repository))
+        if repository not in self.repositories:
+            raise ValueError(f"repository unknown: {repository}")
+        return list(self.repositories[repository])
+
+
+class OfflineRegistryClient(RegistryClient):
+    """Answers nothing, so image resolution can only use previously cached lookups."""
+
+    name = "offline"
+
+    def digest(self, repository: str, tag: str) -> str:
+        raise ValueError(f"offline image resolution: no cached digest for {repository}:{tag}")
+
+    def list_tags(self, repository: str) -> List[str]:
+        raise ValueError(f"offline image resolution: no cached tag list for {repository}")
+
+
+def create_registry_client(name: str, insecure_hosts: Sequence[str] = ()) -> RegistryClient:
+    if name == "crane":
+        return CraneRegistryClient()
+    if name == "http":
+        return HttpRegistryClient(insecure_hosts=insecure_hosts)
+    raise ValueError(f"unknown registry client: {name} (expected one of {', '.join(REGISTRY_CLIENT_NAMES)})")
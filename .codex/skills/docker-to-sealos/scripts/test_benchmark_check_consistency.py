@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import tempfile
+import unittest
+from pathlib import Path
+
+import benchmark_check_consistency as BENCH
+from check_consistency_parser import build_context
+from check_consistency_rule_registry import REGISTERED_RULES
+
+
+SKILL_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_report(build_seconds: float, rule_seconds: float) -> dict:
+    return {
+        "format": BENCH.BASELINE_FORMAT_VERSION,
+        "results": {
+            "100": {
+                "files": 100,
+                "documents": 500,
+                "build_context": build_seconds,
+                "run_checks": build_seconds * 2,
+                "rules": {"R001": rule_seconds},
+            }
+        },
+    }
+
+
+class CatalogGenerationTests(unittest.TestCase):
+    def test_generated_catalog_mixes_workload_shapes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = BENCH.generate_catalog(Path(temp_dir), len(BENCH.CATALOG_SHAPES))
+            index_files = sorted(template_dir.glob("*/index.yaml"))
+            self.assertEqual(len(BENCH.CATALOG_SHAPES), len(index_files))
+
+            context, parse_violations = build_context(SKILL_ROOT / "SKILL.md", SKILL_ROOT / "references", [str(template_dir)])
+            self.assertEqual([], parse_violations)
+            kinds = set(context.document_index.by_kind)
+            self.assertTrue({"Template", "Deployment", "StatefulSet", "Cluster", "Ingress"} <= kinds)
+
+    def test_run_benchmarks_times_every_rule(self):
+        report = BENCH.run_benchmarks(SKILL_ROOT, [2])
+        entry = report["results"]["2"]
+        self.assertEqual(sorted(REGISTERED_RULES), sorted(entry["rules"]))
+        self.assertGreater(entry["build_context"], 0)
+        self.assertGreater(entry["run_checks"], 0)
+        self.assertNotIn("peak_rss_kib", entry)
+
+    def test_memory_mode_records_peak_rss(self):
+        report = BENCH.run_benchmarks(SKILL_ROOT, [2], memory=True)
+        self.assertGreater(report["results"]["2"]["peak_rss_kib"], 0)
+        self.assertIn("peak RSS", BENCH.format_report(report))
+
+
+class StartupBenchmarkTests(unittest.TestCase):
+    IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       200 |        300 | io
+import time:       400 |        900 | check_consistency_rules_app
+unrelated line
+"""
+
+    def test_parses_importtime_totals_without_double_counting(self):
+        modules = BENCH.parse_importtime(self.IMPORTTIME)
+        self.assertEqual(1200, modules[""])
+        self.assertEqual(100, modules["_io"])
+        self.assertEqual(900, modules["check_consistency_rules_app"])
+
+    def test_startup_probe_loads_only_the_selected_rule_module(self):
+        startup = BENCH.measure_startup(SKILL_ROOT, "R006")
+        self.assertEqual(["check_consistency_rules_storage"], startup["rule_modules"])
+        self.assertGreater(startup["imports"], 0)
+        self.assertGreaterEqual(startup["wall"], startup["imports"])
+        report = {"results": {}, "startup": startup}
+        self.assertIn("startup (--only R006)", BENCH.format_report(report))
+        self.assertEqual(["startup/wall", "startup/imports"], [name for name, _ in BENCH.iter_metrics(report)])
+
+
+class BaselineComparisonTests(unittest.TestCase):
+    def test_reports_slowdown_beyond_tolerance(self):
+        regressions = BENCH.compare_reports(make_report(1.0, 0.1), make_report(1.5, 0.1), tolerance=0.25)
+        self.assertEqual(["100/build_context", "100/run_checks"], [item.split(":")[0] for item in regressions])
+
+    def test_ignores_noise_below_min_delta(self):
+        regressions = BENCH.compare_reports(make_report(1.0, 0.001), make_report(1.0, 0.003), tolerance=0.25)
+        self.assertEqual([], regressions)
+
+    def test_rejects_unknown_baseline_format(self):
+        baseline = make_report(1.0, 0.1)
+        baseline["format"] = 999
+        with self.assertRaisesRegex(ValueError, "unsupported baseline format"):
+            BENCH.compare_reports(baseline, make_report(1.0, 0.1), tolerance=0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
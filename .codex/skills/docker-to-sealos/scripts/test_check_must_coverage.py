@@ -4,7 +4,9 @@ import tempfile
 import textwrap
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from check_consistency_cache import ContentCache
 from check_must_coverage import main, validate_must_coverage
 
 
@@ -146,6 +148,49 @@ class CheckMustCoverageTests(unittest.TestCase):
             errors = validate_must_coverage(skill_file, mapping_file, rules_file)
             self.assertTrue(any("undefined rule id: R999" in item for item in errors))
 
+    def test_cache_reuses_parsed_inputs_until_content_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            skill_file = root / "SKILL.md"
+            mapping_file = root / "must-rules-map.yaml"
+            rules_file = root / "rules-registry.yaml"
+            write_file(
+                skill_file,
+                """
+                ## MUST Rules (Condensed)
+                - Do not use `:latest`.
+                ## Validation Commands
+                """,
+            )
+            write_file(
+                mapping_file,
+                """
+                version: 1
+                must_rules:
+                  - must: "Do not use `:latest`."
+                    enforcement:
+                      type: rule
+                      target: R001
+                """,
+            )
+            write_file(
+                rules_file,
+                """
+                version: 1
+                rules:
+                  - id: R001
+                    description: test
+                    severity: error
+                """,
+            )
+            cache = ContentCache(root / ".cache")
+            self.assertEqual([], validate_must_coverage(skill_file, mapping_file, rules_file, cache))
+
+            with mock.patch("check_consistency_cache.safe_load", side_effect=AssertionError("re-parsed")), mock.patch(
+                "check_must_coverage.extract_must_bullets", side_effect=AssertionError("re-extracted")
+            ):
+                self.assertEqual([], validate_must_coverage(skill_file, mapping_file, rules_file, cache))
+
     def test_main_resolves_default_paths_relative_to_skill_file(self):
         with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as cwd_dir:
             root = Path(temp_dir)
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
+import json
 import re
 import tempfile
 import textwrap
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -10,16 +13,21 @@ from subprocess import CompletedProcess
 import yaml
 
 from check_consistency_runner import run_checks
+from compose_to_template_batch import load_batch_jobs, run_batch
 from compose_to_template import (
+    ImageResolutionCache,
     MetadataOptions,
     ServiceShape,
     build_zh_description,
+    candidate_version_tags,
     convert_compose_to_template,
     infer_metadata,
+    main,
     parse_args,
     resolve_image_reference,
     resolve_kompose_shapes,
 )
+from registry_client import FakeRegistryClient
 
 
 def write_file(path: Path, content: str) -> None:
@@ -995,6 +1003,265 @@ class ComposeToTemplateTests(unittest.TestCase):
 
         self.assertEqual("ghcr.io/example/demo@sha256:abc", resolved)
 
+    def test_resolve_image_reference_stops_at_newest_matching_version(self):
+        image = "ghcr.io/example/demo:v2"
+        tags = ["v2", "v2.3.0", *[f"v2.2.{patch}" for patch in range(20)]]
+        digests = {"v2": "sha256:abc", "v2.3.0": "sha256:new", "v2.2.19": "sha256:abc", "v2.2.18": "sha256:abc"}
+        requested = []
+
+        def fake_run(command, capture_output=True, text=True):  # noqa: ANN001
+            if command[-2] == "ls":
+                return CompletedProcess(command, 0, stdout="\n".join(tags), stderr="")
+            tag = command[-1].rsplit(":", 1)[-1]
+            requested.append(tag)
+            return CompletedProcess(command, 0, stdout=digests.get(tag, "sha256:old"), stderr="")
+
+        with mock.patch("compose_to_template.shutil.which", return_value="/usr/local/bin/crane"):
+            with mock.patch("compose_to_template.subprocess.run", side_effect=fake_run):
+                resolved = resolve_image_reference(image, workers=1)
+
+        self.assertEqual("ghcr.io/example/demo:v2.2.19", resolved)
+        self.assertEqual(["v2", "v2.3.0", "v2.2.19"], requested)
+
+    def test_resolve_image_reference_looks_up_candidate_digests_concurrently(self):
+        image = "ghcr.io/example/demo:v2"
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def fake_run(command, capture_output=True, text=True):  # noqa: ANN001
+            if command[-2] == "ls":
+                return CompletedProcess(command, 0, stdout="v2.0.0\nv2.0.1\nv2.0.2\nv2.0.3\n", stderr="")
+            if command[-1].endswith(":v2"):
+                return CompletedProcess(command, 0, stdout="sha256:abc", stderr="")
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            if command[-1].endswith(":v2.0.3"):
+                return CompletedProcess(command, 1, stdout="", stderr="manifest unknown")
+            return CompletedProcess(command, 0, stdout="sha256:abc" if command[-1].endswith(":v2.0.2") else "x", stderr="")
+
+        digest_cache = {}
+        with mock.patch("compose_to_template.shutil.which", return_value="/usr/local/bin/crane"):
+            with mock.patch("compose_to_template.subprocess.run", side_effect=fake_run):
+                resolved = resolve_image_reference(image, digest_cache=digest_cache, workers=4)
+
+        self.assertEqual("ghcr.io/example/demo:v2.0.2", resolved)
+        self.assertGreater(in_flight[1], 1)
+        self.assertNotIn("ghcr.io/example/demo:v2.0.3", digest_cache)
+
+    def test_candidate_version_tags_follow_floating_tag_prefix(self):
+        tags = ["v1.9.9", "v2", "v2.0.1", "2.10.0", "v2.1.0-rc1", "v2.1.0", "v3.0.0", "2.1.5", "latest"]
+        self.assertEqual(["2.10.0", "2.1.5", "v2.1.0", "v2.1.0-rc1", "v2.0.1"], candidate_version_tags("v2", tags))
+        self.assertEqual(["2.1.5", "v2.1.0", "v2.1.0-rc1"], candidate_version_tags("2.1", tags))
+        self.assertEqual(
+            ["v3.0.0", "2.10.0", "2.1.5", "v2.1.0", "v2.0.1", "v1.9.9", "v2.1.0-rc1"],
+            candidate_version_tags("stable", tags),
+        )
+        self.assertEqual("v2.1.0-rc1", candidate_version_tags("edge", tags)[4])
+
+    def test_resolve_image_reference_skips_tags_outside_floating_prefix(self):
+        image = "ghcr.io/example/demo:v2"
+        tags = ["v2", *[f"v{major}.{minor}.0" for major in (1, 2, 3) for minor in range(10)]]
+        requested = []
+
+        def fake_run(command, capture_output=True, text=True):  # noqa: ANN001
+            if command[-2] == "ls":
+                return CompletedProcess(command, 0, stdout="\n".join(tags), stderr="")
+            tag = command[-1].rsplit(":", 1)[-1]
+            requested.append(tag)
+            return CompletedProcess(command, 0, stdout="sha256:abc" if tag in ("v2", "v2.9.0") else "x", stderr="")
+
+        with mock.patch("compose_to_template.shutil.which", return_value="/usr/local/bin/crane"):
+            with mock.patch("compose_to_template.subprocess.run", side_effect=fake_run):
+                resolved = resolve_image_reference(image, workers=1)
+
+        self.assertEqual("ghcr.io/example/demo:v2.9.0", resolved)
+        self.assertEqual(["v2", "v2.9.0"], requested)
+
+    def test_image_cache_persists_lookups_with_ttls(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            clock = mock.Mock(return_value=1000.0)
+            cache = ImageResolutionCache.in_dir(Path(temp_dir), clock=clock)
+            cache.digests["ghcr.io/example/demo:v2"] = "sha256:abc"
+            cache.digests["ghcr.io/example/demo:v2.2.0"] = "sha256:abc"
+            cache.tags["ghcr.io/example/demo"] = ["v2", "v2.2.0"]
+            with (Path(temp_dir) / "image-resolution.jsonl").open("a", encoding="utf-8") as handle:
+                handle.write("not json\n")
+
+            clock.return_value = 1000.0 + 7 * 24 * 3600
+            reloaded = ImageResolutionCache.in_dir(Path(temp_dir), clock=clock)
+            self.assertEqual("sha256:abc", reloaded.digests.get("ghcr.io/example/demo:v2.2.0"))
+            self.assertIsNone(reloaded.digests.get("ghcr.io/example/demo:v2"))
+            self.assertIsNone(reloaded.tags.get("ghcr.io/example/demo"))
+
+            offline = ImageResolutionCache.in_dir(Path(temp_dir), clock=clock, offline=True)
+            self.assertEqual("sha256:abc", offline.digests.get("ghcr.io/example/demo:v2"))
+            self.assertEqual(["v2", "v2.2.0"], offline.tags.get("ghcr.io/example/demo"))
+
+    def test_image_cache_compacts_superseded_lines_on_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file = Path(temp_dir) / "image-resolution.jsonl"
+            clock = mock.Mock(return_value=1000.0)
+            cache = ImageResolutionCache(cache_file, clock=clock)
+            cache.tags["ghcr.io/example/demo"] = ["v1"]
+            cache.digests["ghcr.io/example/demo:v1.0.0"] = "sha256:old"
+            for minute in range(1, 5):
+                clock.return_value = 1000.0 + minute * 60
+                cache.digests["ghcr.io/example/demo:v1"] = f"sha256:{minute}"
+            with cache_file.open("a", encoding="utf-8") as handle:
+                handle.write("not json\n")
+            self.assertEqual(7, len(cache_file.read_text(encoding="utf-8").splitlines()))
+
+            clock.return_value = 1000.0 + 7 * 24 * 3600
+            reloaded = ImageResolutionCache(cache_file, clock=clock)
+
+            records = [json.loads(line) for line in cache_file.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(
+                [
+                    ("tags", "ghcr.io/example/demo", ["v1"]),
+                    ("digest", "ghcr.io/example/demo:v1.0.0", "sha256:old"),
+                    ("digest", "ghcr.io/example/demo:v1", "sha256:4"),
+                ],
+                [(record["kind"], record["key"], record["value"]) for record in records],
+            )
+            self.assertEqual(["ghcr.io/example/demo:v1.0.0"], list(reloaded.digests))
+            self.assertEqual([cache_file], list(Path(temp_dir).iterdir()))
+            offline = ImageResolutionCache(cache_file, clock=clock, offline=True)
+            self.assertEqual("sha256:4", offline.digests.get("ghcr.io/example/demo:v1"))
+
+    def test_resolve_image_reference_offline_uses_cache_only(self):
+        cache = ImageResolutionCache(offline=True)
+        cache.digests["ghcr.io/example/demo:v2"] = "sha256:abc"
+        cache.digests["ghcr.io/example/demo:v2.1.0"] = "sha256:abc"
+        cache.tags["ghcr.io/example/demo"] = ["v2", "v2.2.0", "v2.1.0"]
+
+        with mock.patch("compose_to_template.shutil.which", return_value=None):
+            with mock.patch("compose_to_template.subprocess.run", side_effect=AssertionError("crane called")):
+                resolved = resolve_image_reference(
+                    "ghcr.io/example/demo:v2", digest_cache=cache.digests, tag_cache=cache.tags, offline=True
+                )
+                self.assertEqual("ghcr.io/example/demo:v2.1.0", resolved)
+                with self.assertRaisesRegex(ValueError, "no cached digest for ghcr.io/example/other:v1"):
+                    resolve_image_reference(
+                        "ghcr.io/example/other:v1", digest_cache=cache.digests, tag_cache=cache.tags, offline=True
+                    )
+
+    def test_main_rejects_offline_without_image_cache_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            compose = Path(temp_dir) / "docker-compose.yml"
+            write_file(
+                compose,
+                """
+                services:
+                  app:
+                    image: ghcr.io/example/demo:1.0.0
+                """,
+            )
+            with mock.patch.dict("os.environ", {"DOCKER_TO_SEALOS_IMAGE_CACHE_DIR": ""}):
+                with self.assertRaisesRegex(SystemExit, "--offline requires --image-cache-dir"):
+                    main(["--compose", str(compose), "--offline", "--dry-run", "--kompose-mode", "never"])
+
+
+class BatchConversionTests(unittest.TestCase):
+    def _write_project(self, root: Path, relative: str, image: str) -> Path:
+        path = root / relative
+        write_file(
+            path,
+            f"""
+            services:
+              app:
+                image: {image}
+                ports:
+                  - "8080:80"
+            """,
+        )
+        return path
+
+    def test_directory_batch_shares_image_resolution_and_keeps_going_after_errors(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            self._write_project(root / "apps", "alpha/docker-compose.yml", "ghcr.io/example/demo:v2")
+            self._write_project(root / "apps", "beta/compose.yaml", "ghcr.io/example/demo:v2")
+            write_file(root / "apps" / "gamma" / "docker-compose.yml", "services: {}\n")
+            client = FakeRegistryClient({"ghcr.io/example/demo": {"v2": "sha256:abc", "v2.1.0": "sha256:abc"}})
+
+            jobs = load_batch_jobs(root / "apps")
+            defaults = parse_args(["--batch", str(root / "apps"), "--kompose-mode", "never"])
+            results = run_batch(jobs, defaults, root / "template", registry_client=client, workers=3)
+
+            self.assertEqual(["alpha", "beta", "gamma"], [result.compose_path.parent.name for result in results])
+            self.assertEqual([None, None], [result.error for result in results[:2]])
+            self.assertIn("non-empty services map", results[2].error)
+            self.assertEqual(1, client.calls.count(("ls", "ghcr.io/example/demo")))
+            for app_name in ("alpha", "beta"):
+                index = (root / "template" / app_name / "index.yaml").read_text(encoding="utf-8")
+                self.assertIn("ghcr.io/example/demo:v2.1.0", index)
+
+    def test_manifest_batch_applies_metadata_and_rejects_duplicate_app_names(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            self._write_project(root, "one/docker-compose.yml", "nginx:1.27.2")
+            self._write_project(root, "two/docker-compose.yml", "nginx:1.27.2")
+            manifest = root / "batch.yaml"
+            write_file(
+                manifest,
+                """
+                templates:
+                  - compose: one/docker-compose.yml
+                    app_name: web
+                    title: Web Server
+                    categories: [tool]
+                  - compose: two/docker-compose.yml
+                    app_name: web
+                """,
+            )
+
+            defaults = parse_args(["--batch", str(manifest), "--kompose-mode", "never"])
+            results = run_batch(load_batch_jobs(manifest), defaults, root / "template")
+
+            self.assertIsNone(results[0].error)
+            self.assertIn("app name web is already generated from", results[1].error)
+            docs = parse_yaml_documents(root / "template" / "web" / "index.yaml")
+            template = next(doc for doc in docs if doc.get("kind") == "Template")
+            self.assertEqual("Web Server", template["spec"]["title"])
+
+            write_file(manifest, "- compose: one/docker-compose.yml\n  icon: x.png\n")
+            with self.assertRaisesRegex(ValueError, "unknown field\\(s\\): icon"):
+                load_batch_jobs(manifest)
+
+    def test_main_batch_writes_report_and_fails_when_any_conversion_fails(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            self._write_project(root / "apps", "alpha/docker-compose.yml", "nginx:1.27.2")
+            write_file(root / "apps" / "broken" / "docker-compose.yml", "- not a mapping\n")
+            report_path = root / "report.json"
+
+            with mock.patch("builtins.print"):
+                exit_code = main(
+                    [
+                        "--batch",
+                        str(root / "apps"),
+                        "--output-dir",
+                        str(root / "template"),
+                        "--kompose-mode",
+                        "never",
+                        "--batch-report",
+                        str(report_path),
+                    ]
+                )
+
+            self.assertEqual(1, exit_code)
+            report = json.loads(report_path.read_text(encoding="utf-8"))
+            self.assertEqual((1, 1), (report["converted"], report["failed"]))
+            self.assertEqual(["alpha", None], [item["app_name"] for item in report["results"]])
+            self.assertIn("YAML object", report["results"][1]["error"])
+            self.assertTrue((root / "template" / "alpha" / "index.yaml").exists())
+            with self.assertRaisesRegex(SystemExit, "exactly one of --compose or --batch"):
+                main(["--batch", str(root / "apps"), "--compose", "docker-compose.yml"])
+
 
 if __name__ == "__main__":
     unittest.main()
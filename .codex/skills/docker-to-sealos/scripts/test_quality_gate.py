@@ -61,6 +61,15 @@ class QualityGateArtifactTests(unittest.TestCase):
             command_args = [list(item[1]) for item in commands]
             self.assertTrue(all("--artifacts" not in args for args in command_args))
 
+    def test_build_commands_shares_cache_dir_between_checkers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            cache_dir = root / "cache"
+            commands = dict(quality_gate.build_commands(root, "", cache_dir))
+            for title in ("rules consistency check", "must coverage check"):
+                args = list(commands[title])
+                self.assertEqual(str(cache_dir), args[args.index("--cache-dir") + 1])
+
 
 if __name__ == "__main__":
     unittest.main()
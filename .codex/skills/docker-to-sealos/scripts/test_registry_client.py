@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from compose_to_template import resolve_image_reference
+from registry_client import (
+    CraneRegistryClient,
+    FakeRegistryClient,
+    HttpRegistryClient,
+    create_registry_client,
+    split_repository,
+)
+
+
+TOKEN = "test-token"
+MANIFESTS = {
+    "v2": b'{"schemaVersion": 2, "tag": "v2"}',
+    "v2.1.0": b'{"schemaVersion": 2, "tag": "v2"}',
+    "v2.0.0": b'{"schemaVersion": 2, "tag": "v2.0.0"}',
+}
+TAGS = ["v2", "v2.0.0", "v2.1.0"]
+
+
+def manifest_digest(tag: str) -> str:
+    return f"sha256:{hashlib.sha256(MANIFESTS[tag]).hexdigest()}"
+
+
+class FakeRegistryHandler(BaseHTTPRequestHandler):
+    """Minimal OCI distribution registry for example/demo: bearer auth, paged tags, HEAD digests."""
+
+    protocol_version = "HTTP/1.1"
+    omit_digest_header = False
+
+    def log_message(self, format, *args):  # noqa: A002, ANN001
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers=None, head: bool = False) -> None:  # noqa: ANN001
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _authorized(self, head: bool = False) -> bool:
+        if self.headers.get("Authorization") == f"Bearer {TOKEN}":
+            return True
+        host = self.headers["Host"]
+        challenge = f'Bearer realm="http://{host}/token",service="fake",scope="repository:example/demo:pull"'
+        self._send(401, b"{}", {"WWW-Authenticate": challenge}, head=head)
+        return False
+
+    def _route(self, head: bool) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if parts.path == "/token":
+            assert query["scope"] == ["repository:example/demo:pull"], query
+            self._send(200, json.dumps({"token": TOKEN}).encode())
+        elif parts.path == "/v2/example/demo/tags/list":
+            if not self._authorized():
+                return
+            start = int(query.get("last_index", ["0"])[0])
+            page = TAGS[start : start + 2]
+            headers = {}
+            if start + 2 < len(TAGS):
+                headers["Link"] = f'</v2/example/demo/tags/list?n=2&last_index={start + 2}>; rel="next"'
+            self._send(200, json.dumps({"name": "example/demo", "tags": page}).encode(), headers)
+        elif parts.path.startswith("/v2/example/demo/manifests/"):
+            if not self._authorized(head):
+                return
+            tag = parts.path.rsplit("/", 1)[-1]
+            if tag not in MANIFESTS:
+                self._send(404, b'{"errors": []}', head=head)
+                return
+            headers = {} if self.omit_digest_header else {"Docker-Content-Digest": manifest_digest(tag)}
+            self._send(200, MANIFESTS[tag], headers, head=head)
+        else:
+            self._send(404, head=head)
+
+    def do_GET(self):  # noqa: N802
+        self._route(head=False)
+
+    def do_HEAD(self):  # noqa: N802
+        self._route(head=True)
+
+
+class HttpRegistryClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRegistryHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.repository = f"127.0.0.1:{self.server.server_port}/example/demo"
+        self.client = HttpRegistryClient()
+        self.addCleanup(self.client.close)
+
+    def test_lists_paged_tags_and_reads_digests_over_pooled_connections(self):
+        self.assertEqual(TAGS, self.client.list_tags(self.repository))
+        self.assertEqual(manifest_digest("v2.1.0"), self.client.digest(self.repository, "v2.1.0"))
+        self.assertEqual(manifest_digest("v2.0.0"), self.client.digest(self.repository, "v2.0.0"))
+        self.assertEqual(1, self.client.connections_opened)
+
+    def test_hashes_manifest_when_digest_header_is_missing(self):
+        with mock.patch.object(FakeRegistryHandler, "omit_digest_header", True):
+            self.assertEqual(manifest_digest("v2"), self.client.digest(self.repository, "v2"))
+
+    def test_unknown_manifest_raises_value_error(self):
+        with self.assertRaisesRegex(ValueError, "HTTP 404"):
+            self.client.digest(self.repository, "v9.9.9")
+
+    def test_resolves_floating_tag_end_to_end(self):
+        resolved = resolve_image_reference(f"{self.repository}:v2", client=self.client)
+        self.assertEqual(f"{self.repository}:v2.1.0", resolved)
+
+
+class RegistryClientBackendTests(unittest.TestCase):
+    def test_split_repository_applies_docker_hub_defaults(self):
+        self.assertEqual(("registry-1.docker.io", "library/nginx"), split_repository("nginx"))
+        self.assertEqual(("registry-1.docker.io", "library/nginx"), split_repository("docker.io/nginx"))
+        self.assertEqual(("registry-1.docker.io", "bitnami/redis"), split_repository("bitnami/redis"))
+        self.assertEqual(("ghcr.io", "example/demo"), split_repository("ghcr.io/example/demo"))
+        self.assertEqual(("localhost:5000", "demo"), split_repository("localhost:5000/demo"))
+
+    def test_fake_registry_records_lookups(self):
+        client = FakeRegistryClient({"ghcr.io/example/demo": {"v2": "sha256:abc", "v2.1.0": "sha256:abc"}})
+        resolved = resolve_image_reference("ghcr.io/example/demo:v2", client=client)
+        self.assertEqual("ghcr.io/example/demo:v2.1.0", resolved)
+        self.assertEqual(
+            [
+                ("digest", "ghcr.io/example/demo:v2"),
+                ("ls", "ghcr.io/example/demo"),
+                ("digest", "ghcr.io/example/demo:v2.1.0"),
+            ],
+            client.calls,
+        )
+        with self.assertRaisesRegex(ValueError, "repository unknown"):
+            client.list_tags("ghcr.io/example/other")
+
+    def test_crane_client_requires_binary_only_when_used(self):
+        with mock.patch("registry_client.shutil.which", return_value=None):
+            client = create_registry_client("crane")
+            self.assertIsInstance(client, CraneRegistryClient)
+            with self.assertRaisesRegex(ValueError, "crane is required"):
+                client.list_tags("ghcr.io/example/demo")
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaisesRegex(ValueError, "unknown registry client"):
+            create_registry_client("docker")
+
+
+if __name__ == "__main__":
+    unittest.main()
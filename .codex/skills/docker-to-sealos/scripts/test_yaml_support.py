@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+import yaml_support
+from check_consistency_line_locator import build_node_line_map
+from check_consistency_parser import extract_file_blocks, iter_supported_files, split_yaml_documents
+
+
+SKILL_ROOT = Path(__file__).resolve().parent.parent
+BROKEN_SNIPPETS = (
+    "a:\n  b: |\n    x\n  c: d: e\n",
+    "a: 'unterminated\nb: 2\n",
+    "a: b\n\tc: d\n",
+    "a: [1, 2\nb: 3\n",
+    "a: {b\n",
+    "kind: Job\nspec:\n  backoffLimit: 0\n${{ endif() }}\n",
+    "${{ if(inputs.enableIngress === 'true') }}\nkind: Ingress\n",
+)
+# Unclosed flow collection at end of input: libyaml marks the line after the last one.
+MISMARKED_SNIPPET = "kind: Service\nports: [80, 443"
+
+
+def iter_reference_documents():
+    for path in [SKILL_ROOT / "SKILL.md", *iter_supported_files(SKILL_ROOT / "references")]:
+        for block in extract_file_blocks(path, path.read_text(encoding="utf-8")):
+            for start_line, doc_text in split_yaml_documents(block):
+                yield path, start_line, doc_text
+
+
+def load_outcome(text: str, loader: type, load=yaml_support.safe_load):
+    try:
+        return "ok", load(text, loader), None
+    except yaml.YAMLError as exc:
+        mark = getattr(exc, "problem_mark", None)
+        return "error", exc.__class__.__name__, mark.line if mark is not None else None
+
+
+def raw_load(text: str, loader: type):
+    """yaml.load without yaml_support's pure-loader fallback."""
+    return yaml.load(text, Loader=loader)
+
+
+@unittest.skipUnless(yaml_support.libyaml_available(), "PyYAML built without libyaml")
+class LoaderParityTests(unittest.TestCase):
+    def test_reference_documents_parse_identically(self):
+        checked = 0
+        for path, start_line, doc_text in iter_reference_documents():
+            with self.subTest(path=path.name, line=start_line):
+                self.assertEqual(
+                    load_outcome(doc_text, yaml.SafeLoader),
+                    load_outcome(doc_text, yaml.CSafeLoader),
+                )
+            checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_problem_mark_lines_match_for_broken_snippets(self):
+        for snippet in BROKEN_SNIPPETS:
+            with self.subTest(snippet=snippet):
+                pure = load_outcome(snippet, yaml.SafeLoader, raw_load)
+                fast = load_outcome(snippet, yaml.CSafeLoader, raw_load)
+                self.assertEqual("error", pure[0])
+                self.assertEqual(pure, fast)
+
+    def test_fallback_reports_pure_loader_mark_when_libyaml_differs(self):
+        pure = load_outcome(MISMARKED_SNIPPET, yaml.SafeLoader, raw_load)
+        fast = load_outcome(MISMARKED_SNIPPET, yaml.CSafeLoader, raw_load)
+        self.assertEqual(("error", "ParserError", 1), pure)
+        self.assertNotEqual(pure, fast)
+        self.assertEqual(pure, load_outcome(MISMARKED_SNIPPET, yaml.CSafeLoader))
+        with self.assertRaises(yaml.YAMLError) as raised:
+            yaml_support.safe_load_with_node(MISMARKED_SNIPPET, loader=yaml.CSafeLoader)
+        self.assertEqual(1, raised.exception.problem_mark.line)
+
+    def test_node_line_maps_match_for_reference_documents(self):
+        for path, start_line, doc_text in iter_reference_documents():
+            with self.subTest(path=path.name, line=start_line):
+                try:
+                    _, pure = yaml_support.safe_load_with_node(doc_text, loader=yaml.SafeLoader)
+                except yaml.YAMLError:
+                    continue
+                _, fast = yaml_support.safe_load_with_node(doc_text, loader=yaml.CSafeLoader)
+                self.assertEqual(
+                    build_node_line_map(pure, start_line),
+                    build_node_line_map(fast, start_line),
+                )
+
+    def test_safe_load_all_matches_pure_loader(self):
+        text = "kind: A\n---\nkind: B\nitems: [1, 2]\n---\n"
+        self.assertEqual(
+            yaml_support.safe_load_all(text, loader=yaml.SafeLoader),
+            yaml_support.safe_load_all(text, loader=yaml.CSafeLoader),
+        )
+
+
+class LoaderSelectionTests(unittest.TestCase):
+    def test_env_override_forces_pure_loader(self):
+        with mock.patch.dict(os.environ, {yaml_support.PURE_YAML_ENV: "1"}):
+            self.assertIs(yaml.SafeLoader, yaml_support.select_safe_loader())
+
+    def test_falls_back_when_libyaml_missing(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with mock.patch("yaml_support.libyaml_available", return_value=False):
+                self.assertIs(yaml.SafeLoader, yaml_support.select_safe_loader())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Shared PyYAML loader selection with a libyaml fast path."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, List, Optional, Tuple
+
+import yaml
+
+
+PURE_YAML_ENV = "DOCKER_TO_SEALOS_PURE_YAML"
+
+
+def libyaml_available() -> bool:
+    return bool(getattr(yaml, "__with_libyaml__", False)) and hasattr(yaml, "CSafeLoader")
+
+
+def _pure_yaml_forced() -> bool:
+    value = os.environ.get(PURE_YAML_ENV, "").strip().lower()
+    return value in {"1", "true", "yes", "on"}
+
+
+def select_safe_loader() -> type:
+    if libyaml_available() and not _pure_yaml_forced():
+        return yaml.CSafeLoader
+    return yaml.SafeLoader
+
+
+SafeLoader = select_safe_loader()
+LOADER_NAME = "libyaml" if SafeLoader is not yaml.SafeLoader else "pure"
+
+
+def safe_load(text: str, loader: Optional[type] = None) -> Any:
+    """Parse one YAML document from a string, like yaml.safe_load.
+
+    libyaml reports some scanner problem marks one line later than the
+    pure-Python scanner, so errors are re-raised from the pure loader to keep
+    reported line numbers independent of the installed PyYAML build.
+    """
+    loader = loader or SafeLoader
+    try:
+        return yaml.load(text, Loader=loader)
+    except yaml.YAMLError:
+        if loader is yaml.SafeLoader:
+            raise
+    return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def safe_load_all(text: str, loader: Optional[type] = None) -> List[Any]:
+    """Parse every YAML document in a string, like list(yaml.safe_load_all(...))."""
+    loader = loader or SafeLoader
+    try:
+        return list(yaml.load_all(text, Loader=loader))
+    except yaml.YAMLError:
+        if loader is yaml.SafeLoader:
+            raise
+    return list(yaml.load_all(text, Loader=yaml.SafeLoader))
+
+
+def _compose_and_construct(text: str, loader_class: type) -> Tuple[Any, Optional[yaml.Node]]:
+    loader = loader_class(text)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+        return data, node
+    finally:
+        loader.dispose()
+
+
+def safe_load_with_node(text: str, loader: Optional[type] = None) -> Tuple[Any, Optional[yaml.Node]]:
+    """Like safe_load, but also return the composed node tree the data was constructed from."""
+    loader = loader or SafeLoader
+    try:
+        return _compose_and_construct(text, loader)
+    except yaml.YAMLError:
+        if loader is yaml.SafeLoader:
+            raise
+    return _compose_and_construct(text, yaml.SafeLoader)